@@ -50,6 +50,7 @@ from gi.repository import Gtk, Adw, Gio, GLib
 from biglinux_hardware_info.hardware_info_page import HardwareInfoPage
 from kernel_mesa_updater.kernel_mesa_page import KernelMesaPage
 from driver_installer.driver_installer_page import DriverInstallerPage
+from common.command_runner import get_command_runner
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -143,6 +144,81 @@ class DriverManagerApp(Adw.Application):
         
         # Connect to window size events to show/hide the bottom switcher bar
         self.window.connect("notify::default-width", self._on_window_size_changed)
+        
+        # Command statistics panel, for debugging slow pages
+        stats_action = Gio.SimpleAction.new("command-stats", None)
+        stats_action.connect("activate", self._on_command_stats_activated)
+        self.add_action(stats_action)
+        self.set_accels_for_action("app.command-stats", ["<Control><Shift>d"])
+    
+    def _on_command_stats_activated(self, action, param) -> None:
+        """
+        Show the latency and exit statistics of the external commands.
+        
+        Args:
+            action: The activated action
+            param: Unused action parameter
+        """
+        stats_window = Adw.Window(transient_for=self.window, modal=True)
+        stats_window.set_title("Command Statistics")
+        stats_window.set_default_size(640, 520)
+        
+        toolbar_view = Adw.ToolbarView()
+        header_bar = Adw.HeaderBar()
+        toolbar_view.add_top_bar(header_bar)
+        
+        refresh_button = Gtk.Button.new_from_icon_name("view-refresh-symbolic")
+        refresh_button.set_tooltip_text("Refresh")
+        header_bar.pack_start(refresh_button)
+        
+        reset_button = Gtk.Button.new_from_icon_name("edit-clear-all-symbolic")
+        reset_button.set_tooltip_text("Reset statistics")
+        header_bar.pack_start(reset_button)
+        
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scrolled.set_vexpand(True)
+        toolbar_view.set_content(scrolled)
+        stats_window.set_content(toolbar_view)
+        
+        def fill() -> None:
+            runner = get_command_runner()
+            page = Adw.PreferencesPage()
+            group = Adw.PreferencesGroup()
+            group.set_title("External Commands")
+            group.set_description(f"Up to {runner.max_concurrent} commands run at the same time")
+            page.add(group)
+            
+            stats = runner.stats()
+            if not stats:
+                row = Adw.ActionRow()
+                row.set_title("No commands run yet")
+                group.add(row)
+            
+            # Slowest commands first
+            for command, entry in sorted(stats.items(), key=lambda item: item[1]["total_time"], reverse=True):
+                row = Adw.ActionRow()
+                row.set_title(GLib.markup_escape_text(command))
+                row.set_subtitle(
+                    f"{entry['runs']} runs, {entry['shared']} shared - "
+                    f"avg {entry['avg_time'] * 1000:.0f} ms, max {entry['max_time'] * 1000:.0f} ms - "
+                    f"{entry['failures']} failed, {entry['timeouts']} timed out"
+                )
+                exit_label = Gtk.Label(label=f"exit {entry['last_returncode']}")
+                exit_label.add_css_class("dim-label")
+                row.add_suffix(exit_label)
+                group.add(row)
+            
+            scrolled.set_child(page)
+        
+        def on_reset(button) -> None:
+            get_command_runner().reset_stats()
+            fill()
+        
+        refresh_button.connect("clicked", lambda button: fill())
+        reset_button.connect("clicked", on_reset)
+        fill()
+        stats_window.present()
     
     def _on_window_size_changed(self, window, param):
         """
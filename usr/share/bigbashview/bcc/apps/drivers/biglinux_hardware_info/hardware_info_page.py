@@ -6,13 +6,15 @@ import subprocess
 import threading
 import re
 import os
-import tempfile
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 gi.require_version('PangoCairo', '1.0') # Para text metrics se usarmos Cairo
 from gi.repository import Gtk, Adw, GLib, Pango, Gdk, PangoCairo
 
+from biglinux_hardware_info.src.inxi_snapshot import EAGER_SECTIONS, LAZY_SECTIONS, get_inxi_snapshot
+from biglinux_hardware_info.src import install_date, native_probe, snapshot_store
+
 # Stub classes
 # ... (stubs como antes) ...
 logger_stub = logging.getLogger(__name__ + "_stub")
@@ -34,6 +36,23 @@ class CategoryRow(Gtk.ListBoxRow):
         box.append(label)
         self.set_child(box)
 
+# Nome de exibição (em inglês) de cada seção do inxi
+SECTION_DISPLAY_NAMES = {
+    "System": "System Information", "CPU": "Processor (CPU)", "Graphics": "Graphics / GPU",
+    "Audio": "Audio Devices", "Network": "Network Interfaces", "Drives": "Storage Devices",
+    "Partition": "Partitions", "Usb": "USB Devices", "Sensors": "Sensors",
+    "Memory": "Memory Details", "Machine": "Machine Info", "Info": "Processes & System Load",
+    "Battery": "Battery Status", "RAID": "RAID Arrays", "Swap": "Swap Details", # Added Swap
+    "Bluetooth": "Bluetooth Devices", "Repos": "Software Repositories",
+}
+SECTION_RAW_NAMES = {display: raw for raw, display in SECTION_DISPLAY_NAMES.items()}
+
+# Categoria com as diferenças em relação ao snapshot do boot anterior
+CHANGES_CATEGORY = "Alterações desde o Último Boot"
+
+# Seções do inxi lidas pelo "Resumo do Sistema"
+SUMMARY_SECTIONS = frozenset(("System", "CPU", "Memory", "Info", "Graphics", "Partition"))
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -86,7 +105,12 @@ class HardwareInfoPage(Gtk.Box):
         self.system_info = SystemInfo()
         self.hardware_data: Dict[str, Any] = {} 
         self.raw_inxi_data: Dict[str, List[Dict[str, Any]]] = {}
+        self.native_summary: Dict[str, Any] = {}  # Valores do resumo lidos de /proc e /sys
+        self.hardware_changes: Dict[str, Any] = {}  # Diferenças para o boot anterior, por seção
+        self._section_hashes: Dict[str, str] = {}  # Hash do conteúdo exibido de cada seção
         self.pulse_id: int = 0 
+        self._load_generation: int = 0  # Descarta seções de uma carga anterior
+        self._loading_sections: set = set()  # Seções sob demanda sendo coletadas
         self._create_ui()
         self._load_hardware_info()
 
@@ -145,6 +169,8 @@ class HardwareInfoPage(Gtk.Box):
         if self.pulse_id == 0: 
             self.pulse_id = GLib.timeout_add(150, self._pulse_progress_bar) 
         self.split_view.set_visible(False)
+        self._load_generation += 1
+        self._loading_sections.clear()
         thread = threading.Thread(target=self._fetch_inxi_data)
         thread.daemon = True
         thread.start()
@@ -277,9 +303,9 @@ class HardwareInfoPage(Gtk.Box):
         system_group.set_description("Informações básicas do sistema")
         
         # OS Name
-        os_name_str = "Desconhecido"
+        os_name_str = self.native_summary.get("os_name") or "Desconhecido"
         system_section = self.raw_inxi_data.get("System")
-        if system_section and isinstance(system_section, list):
+        if os_name_str == "Desconhecido" and system_section and isinstance(system_section, list):
             for item in system_section:
                 if isinstance(item, dict) and "Distro" in item:
                     os_name_str = item.get("Distro", "Desconhecido")
@@ -287,8 +313,8 @@ class HardwareInfoPage(Gtk.Box):
         self._add_summary_row(system_group, "Sistema Operacional", os_name_str, "computer-symbolic")
         
         # Kernel Version
-        kernel_ver_str = "Desconhecido"
-        if system_section and isinstance(system_section, list):
+        kernel_ver_str = self.native_summary.get("kernel") or "Desconhecido"
+        if kernel_ver_str == "Desconhecido" and system_section and isinstance(system_section, list):
             for item in system_section:
                 if isinstance(item, dict) and "Kernel" in item:
                     kernel_ver_str = item.get("Kernel", "Desconhecido")
@@ -308,8 +334,11 @@ class HardwareInfoPage(Gtk.Box):
         
         # CPU
         cpu_model_str = "Desconhecido"
+        native_cpu = self.native_summary.get("cpu") or {}
         cpu_section = self.raw_inxi_data.get("CPU")
-        if cpu_section and isinstance(cpu_section, list) and len(cpu_section) > 0:
+        if native_cpu.get("model"):
+            cpu_model_str = f"{native_cpu['model']} ({native_cpu.get('cores') or 'N/A'} cores)"
+        elif cpu_section and isinstance(cpu_section, list) and len(cpu_section) > 0:
             model = cpu_section[0].get("model", "CPU Desconhecido")
             cores = "N/A"
             if len(cpu_section) > 1 and isinstance(cpu_section[1], dict):
@@ -318,7 +347,8 @@ class HardwareInfoPage(Gtk.Box):
         self._add_summary_row(hardware_group, "Processador", cpu_model_str, "cpu-symbolic")
 
         # Memory with usage bar
-        total_mem_bytes, used_mem_bytes = None, None
+        native_memory = self.native_summary.get("memory") or {}
+        total_mem_bytes, used_mem_bytes = native_memory.get("total"), native_memory.get("used")
         mem_label_override = None
         
         # Debug: Log toda a estrutura de dados relacionada à memória
@@ -330,7 +360,7 @@ class HardwareInfoPage(Gtk.Box):
         # Primeiro, tentar obter dados da seção Memory dedicada
         memory_section_dedicated = self.raw_inxi_data.get("Memory")
         logger.debug(f"Memory section: {memory_section_dedicated}")
-        if memory_section_dedicated and isinstance(memory_section_dedicated, list):
+        if (total_mem_bytes is None or used_mem_bytes is None) and memory_section_dedicated and isinstance(memory_section_dedicated, list):
             ram_info_list = [item.get("ram") for item in memory_section_dedicated if isinstance(item, dict) and "ram" in item]
             logger.debug(f"RAM info list: {ram_info_list}")
             if ram_info_list and isinstance(ram_info_list[0], dict):
@@ -417,36 +447,15 @@ class HardwareInfoPage(Gtk.Box):
                             
                             break
         
-        # Fallback: tentar /proc/meminfo se ainda não temos dados
-        if total_mem_bytes is None or used_mem_bytes is None:
-            logger.debug("Trying /proc/meminfo fallback")
-            try:
-                with open('/proc/meminfo', 'r') as f:
-                    meminfo = f.read()
-                    
-                for line in meminfo.split('\n'):
-                    if line.startswith('MemTotal:') and total_mem_bytes is None:
-                        total_kb = int(line.split()[1])
-                        total_mem_bytes = total_kb * 1024
-                        logger.debug(f"Got total from /proc/meminfo: {total_mem_bytes}")
-                    elif line.startswith('MemAvailable:') and used_mem_bytes is None and total_mem_bytes is not None:
-                        avail_kb = int(line.split()[1])
-                        available_mem_bytes = avail_kb * 1024
-                        used_mem_bytes = total_mem_bytes - available_mem_bytes
-                        logger.debug(f"Calculated used from /proc/meminfo: {used_mem_bytes}")
-                        break
-            except Exception as e:
-                logger.debug(f"Failed to read /proc/meminfo: {e}")
-        
         logger.debug(f"Final memory values - total: {total_mem_bytes}, used: {used_mem_bytes}")
         logger.debug("=== END DEBUG MEMORY PARSING ===")
         
         self._add_usage_bar_row(hardware_group, "Memória RAM", used_mem_bytes, total_mem_bytes, label_override=mem_label_override, icon_name="memory-symbolic")
 
         # Graphics
-        graphics_str = "Desconhecido"
+        graphics_str = ", ".join(self.native_summary.get("gpus") or []) or "Desconhecido"
         graphics_section = self.raw_inxi_data.get("Graphics")
-        if graphics_section and isinstance(graphics_section, list):
+        if graphics_str == "Desconhecido" and graphics_section and isinstance(graphics_section, list):
             for device_info in graphics_section:
                 if isinstance(device_info, dict) and device_info.get("class-ID") == "0300" and "Device" in device_info:
                     vendor = device_info.get("vendor", "")
@@ -486,8 +495,11 @@ class HardwareInfoPage(Gtk.Box):
             self.content_box.append(label)
 
     def _get_storage_summary(self) -> Dict[str, Any]:
-        # ... (como antes) ...
-        storage_info: Dict[str, Any] = {}; partition_section = self.raw_inxi_data.get("Partition"); root_part_data = None
+        # statvfs('/') responde na hora; a seção Partition do inxi fica como reserva
+        storage_info = self._get_native_storage_summary()
+        if all(k in storage_info for k in ['partition_total_bytes', 'partition_used_bytes', 'partition_free_bytes']):
+            return storage_info
+        partition_section = self.raw_inxi_data.get("Partition"); root_part_data = None
         if partition_section and isinstance(partition_section, list):
             for part_data_item in partition_section:
                 if isinstance(part_data_item, dict) and part_data_item.get("ID") == "/":
@@ -513,143 +525,28 @@ class HardwareInfoPage(Gtk.Box):
                 storage_info['partition_free_str'] = GLib.format_size(int(free_bytes))
                 if 'partition_usage_percent' not in storage_info and total_bytes > 0:
                     storage_info['partition_usage_percent'] = f"{(used_bytes / total_bytes * 100):.1f}%"
-        if not all(k in storage_info for k in ['partition_total_bytes', 'partition_used_bytes', 'partition_free_bytes']):
-            logger.debug("Inxi storage data incomplete for root, trying df fallback.")
-            df_fallback_info = self._get_storage_fallback()
-            for key, value in df_fallback_info.items():
-                if key not in storage_info or storage_info[key] is None: storage_info[key] = value
         return storage_info
 
 
-    def _get_storage_fallback(self) -> Dict[str, Any]:
-        # ... (como antes) ...
-        storage_info_fallback: Dict[str, Any] = {}
-        try:
-            df_output = subprocess.check_output(['df', '--output=source,size,used,avail', '--block-size=1', '/'], text=True, timeout=5)
-            lines = df_output.strip().split('\n')
-            if len(lines) >= 2:
-                parts = lines[1].split()
-                if len(parts) >= 4:
-                    storage_info_fallback['partition_device'] = parts[0]
-                    try:
-                        total_b = float(parts[1]); used_b = float(parts[2]); avail_b = float(parts[3])
-                        storage_info_fallback['partition_total_bytes'] = total_b; storage_info_fallback['partition_used_bytes'] = used_b
-                        storage_info_fallback['partition_free_bytes'] = avail_b
-                        storage_info_fallback['partition_total_str'] = GLib.format_size(int(total_b))
-                        storage_info_fallback['partition_used_str'] = GLib.format_size(int(used_b))
-                        storage_info_fallback['partition_free_str'] = GLib.format_size(int(avail_b))
-                        if total_b > 0: storage_info_fallback['partition_usage_percent'] = f"{(used_b / total_b * 100):.1f}%"
-                    except ValueError: logger.debug("Could not parse df numeric output during fallback.")
-        except Exception as e: logger.debug(f"Failed to get storage info from df fallback: {e}")
-        return storage_info_fallback
-
+    def _get_native_storage_summary(self) -> Dict[str, Any]:
+        """Root filesystem usage from the native probe (statvfs)."""
+        storage_info: Dict[str, Any] = {}
+        disk = self.native_summary.get("root_disk") or native_probe.get_disk_usage("/")
+        if not disk:
+            return storage_info
+        total_b, used_b, avail_b = disk["total"], disk["used"], disk["free"]
+        storage_info['partition_device'] = disk.get("device") or "N/A"
+        storage_info['partition_total_bytes'] = total_b; storage_info['partition_used_bytes'] = used_b
+        storage_info['partition_free_bytes'] = avail_b
+        storage_info['partition_total_str'] = GLib.format_size(int(total_b))
+        storage_info['partition_used_str'] = GLib.format_size(int(used_b))
+        storage_info['partition_free_str'] = GLib.format_size(int(avail_b))
+        if total_b > 0: storage_info['partition_usage_percent'] = f"{(used_b / total_b * 100):.1f}%"
+        return storage_info
 
     def _get_installation_date(self) -> Optional[str]:
-        # ...existing code...
-        
-        # Método 1: Verificar /etc/hostname ou /etc/machine-id (mais confiável)
-        try:
-            # machine-id é criado durante a instalação
-            if os.path.exists('/etc/machine-id'):
-                stat_info = os.stat('/etc/machine-id')
-                install_timestamp = stat_info.st_mtime  # Usar mtime ao invés de ctime
-                install_date = subprocess.check_output(['date', '-d', f'@{int(install_timestamp)}', '+%d/%m/%Y'], text=True, timeout=2).strip()
-                logger.debug(f"Install date from /etc/machine-id: {install_date}")
-                return install_date
-        except Exception as e: 
-            logger.debug(f"Could not determine installation date from /etc/machine-id: {e}")
-        
-        # Método 2: Verificar logs de instalação se existirem
-        install_log_paths = [
-            '/var/log/installer/syslog',
-            '/var/log/calamares.log',
-            '/var/log/ubiquity/syslog',
-            '/var/log/anaconda/anaconda.log'
-        ]
-        
-        for log_path in install_log_paths:
-            try:
-                if os.path.exists(log_path):
-                    stat_info = os.stat(log_path)
-                    install_timestamp = stat_info.st_mtime
-                    install_date = subprocess.check_output(['date', '-d', f'@{int(install_timestamp)}', '+%d/%m/%Y'], text=True, timeout=2).strip()
-                    logger.debug(f"Install date from {log_path}: {install_date}")
-                    return install_date
-            except Exception as e:
-                logger.debug(f"Could not get date from {log_path}: {e}")
-                continue
-        
-        # Método 3: Verificar diretórios do sistema criados na instalação
-        system_dirs = [
-            '/etc',
-            '/var/lib/dpkg',  # Para sistemas Debian/Ubuntu
-            '/var/lib/rpm',   # Para sistemas Red Hat/Fedora
-            '/usr/share/doc'
-        ]
-        
-        for dir_path in system_dirs:
-            try:
-                if os.path.exists(dir_path):
-                    stat_info = os.stat(dir_path)
-                    install_timestamp = stat_info.st_ctime
-                    install_date = subprocess.check_output(['date', '-d', f'@{int(install_timestamp)}', '+%d/%m/%Y'], text=True, timeout=2).strip()
-                    logger.debug(f"Install date from {dir_path}: {install_date}")
-                    return install_date
-            except Exception as e:
-                logger.debug(f"Could not get date from {dir_path}: {e}")
-                continue
-        
-        # Método 4: Tentar dpkg log (para sistemas Debian/Ubuntu)
-        try:
-            if os.path.exists('/var/log/dpkg.log'):
-                with open('/var/log/dpkg.log', 'r') as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        # Formato: 2023-01-15 10:30:25 startup archives ...
-                        date_part = first_line.split()[0]
-                        if len(date_part) == 10:  # YYYY-MM-DD
-                            year, month, day = date_part.split('-')
-                            install_date = f"{day}/{month}/{year}"
-                            logger.debug(f"Install date from dpkg.log: {install_date}")
-                            return install_date
-        except Exception as e:
-            logger.debug(f"Could not read dpkg.log: {e}")
-        
-        # Método 5: Verificar filesystem timestamp da partição root (fallback)
-        try:
-            # Usar tune2fs para ext2/3/4 filesystems
-            df_output = subprocess.check_output(['df', '/'], text=True, timeout=2).strip().split('\n')
-            if len(df_output) > 1:
-                root_device = df_output[1].split()[0]
-                logger.debug(f"Root device: {root_device}")
-                
-                # Tentar tune2fs para filesystems ext*
-                try:
-                    tune2fs_output = subprocess.check_output(['tune2fs', '-l', root_device], text=True, timeout=5)
-                    for line in tune2fs_output.split('\n'):
-                        if 'Filesystem created:' in line:
-                            # Formato: Filesystem created:       Sun Jan 15 10:30:25 2023
-                            date_str = line.split(':', 1)[1].strip()
-                            timestamp = subprocess.check_output(['date', '-d', f'{date_str}', '+%d/%m/%Y'], text=True, timeout=2).strip()
-                            logger.debug(f"Install date from tune2fs: {timestamp}")
-                            return timestamp
-                except subprocess.CalledProcessError:
-                    logger.debug("tune2fs not available or filesystem not ext*")
-                
-        except Exception as e:
-            logger.debug(f"Could not determine installation date from filesystem: {e}")
-        
-        # Método 6: Como último recurso, usar stat do diretório raiz
-        try:
-            stat_info = os.stat('/')
-            install_timestamp = stat_info.st_ctime
-            install_date = subprocess.check_output(['date', '-d', f'@{int(install_timestamp)}', '+%d/%m/%Y'], text=True, timeout=2).strip()
-            logger.debug(f"Install date from root directory (fallback): {install_date}")
-            return install_date
-        except Exception as e: 
-            logger.debug(f"Could not determine installation date from root directory: {e}")
-        
-        return None
+        # Resolvida uma vez e guardada em cache: a data de instalação não muda
+        return install_date.get_installation_date()
 
     def _add_summary_row(self, group: Adw.PreferencesGroup, title: str, 
                         value: str, icon_name: Optional[str] = None) -> None:
@@ -664,57 +561,140 @@ class HardwareInfoPage(Gtk.Box):
 
 
     def _fetch_inxi_data(self) -> None:
-        # ... (como antes, com a transformação do JSON) ...
+        # Cada seção roda em paralelo e aparece na barra lateral assim que termina;
+        # o snapshot é compartilhado com as outras views
+        generation = self._load_generation
+        
+        # O resumo vem de /proc e /sys e aparece antes do primeiro inxi terminar
         try:
-            with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.json', encoding='utf-8') as temp_file: temp_path = temp_file.name
-            logger.debug(f"Writing inxi JSON data to temporary file: {temp_path}")
-            inxi_cmd = ["inxi", "-FxxxzamP", "--output", "json", "--output-file", temp_path, "--no-host", "-z"]
-            result = subprocess.run(inxi_cmd, capture_output=True, text=True, check=False, timeout=90)
-            if result.returncode != 0:
-                logger.error(f"inxi command finished with exit code {result.returncode}. Stderr: {result.stderr.strip()}")
-                if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
-                    raise subprocess.SubprocessError(f"inxi failed (code {result.returncode}) and produced no/empty output file. Stderr: {result.stderr.strip()}")
-                logger.warning("inxi returned non-zero but an output file was found. Attempting to process.")
-            with open(temp_path, 'r', encoding='utf-8') as f: content = f.read()
-            content = re.sub(r'\x1b\[[0-9;]*m', '', content) 
-            content = re.sub(r'"[^"]*#([^"]*)"', r'"\1"', content)
-            try:
-                raw_data_list_from_json = json.loads(content)
-                transformed_data: Dict[str, List[Dict[str, Any]]] = {}
-                if isinstance(raw_data_list_from_json, list):
-                    for item_dict_wrapper in raw_data_list_from_json:
-                        if isinstance(item_dict_wrapper, dict): transformed_data.update(item_dict_wrapper)
-                self.raw_inxi_data = transformed_data 
-                self.hardware_data = self._map_raw_to_display_categories(self.raw_inxi_data)
-            except json.JSONDecodeError as json_err:
-                error_position = json_err.pos; context_start = max(0, error_position - 30)
-                context_end = min(len(content), error_position + 30); context_snippet = content[context_start:context_end]
-                logger.error(f"JSON parsing error: {json_err.msg} at pos {error_position}. Context: ...'{context_snippet}'...")
-                problem_file_path = os.path.join(tempfile.gettempdir(), "inxi_problematic.json")
-                with open(problem_file_path, "w", encoding='utf-8') as pf: pf.write(content)
-                logger.error(f"Problematic JSON content saved to {problem_file_path}"); raise 
-            GLib.idle_add(self._update_ui_with_data)
+            summary = native_probe.get_summary()
+            GLib.idle_add(self._on_native_summary_loaded, generation, summary)
+        except Exception as e:
+            logger.warning(f"Native hardware probe failed, summary will use inxi: {e}")
+        
+        try:
+            sections = get_inxi_snapshot().sections(
+                EAGER_SECTIONS,
+                on_section=lambda name, entries: GLib.idle_add(self._on_section_loaded, generation, name, entries)
+            )
         except (subprocess.SubprocessError, subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError, IOError) as e:
             logger.error(f"Error fetching or processing hardware info: {e}", exc_info=True)
             GLib.idle_add(self._show_error_message, f"Erro ao buscar informações de hardware: {str(e)}")
-        finally:
-            if 'temp_path' in locals() and os.path.exists(temp_path):
-                try: os.unlink(temp_path); logger.debug(f"Temporary file {temp_path} deleted.")
-                except Exception as e_unlink: logger.warning(f"Failed to delete temporary file {temp_path}: {e_unlink}")
+            return
+        
+        # Guarda o snapshot e compara com o último do boot anterior; seções que
+        # falharam vêm do snapshot anterior em vez de aparecerem como removidas
+        try:
+            previous = snapshot_store.load_previous_boot()
+            snapshot_store.save(sections, failed=[name for name in EAGER_SECTIONS if name not in sections])
+            changes = snapshot_store.diff(previous["sections"], sections) if previous else {}
+            GLib.idle_add(self._on_hardware_changes, generation, changes)
+        except Exception as e:
+            logger.warning(f"Could not compare hardware snapshots: {e}")
+
+    def _on_native_summary_loaded(self, generation: int, summary: Dict[str, Any]) -> bool:
+        """Show the summary built from the native probes."""
+        if generation != self._load_generation:
+            return False
+        if not self.category_list.get_first_child():
+            self.native_summary = summary
+            self._update_ui_with_data()
+        elif summary != self.native_summary:
+            # Numa atualização, só o resumo é redesenhado, se estiver aberto
+            self.native_summary = summary
+            self._redraw_if_open("Resumo do Sistema")
+        return False
+
+    def _on_section_loaded(self, generation: int, name: str, entries: List[Dict[str, Any]]) -> bool:
+        """Add a collected inxi section to the page."""
+        if generation != self._load_generation:
+            return False
+        # Numa atualização, seções sem mudança além de leituras voláteis
+        # (velocidade da CPU, memória em uso) mantêm os widgets atuais
+        digest = snapshot_store.stable_hash(entries)
+        previous = self.raw_inxi_data.get(name)
+        if previous is not None and self._section_hashes.get(name) == digest:
+            return False
+        self._section_hashes[name] = digest
+        self.raw_inxi_data[name] = entries
+        self.hardware_data = self._map_raw_to_display_categories(self.raw_inxi_data)
+        
+        # A barra lateral só é refeita quando a categoria aparece ou some
+        if previous is None or bool(previous) != bool(entries):
+            self._update_ui_with_data()
+            return False
+        categories = [self._translate_category_name(SECTION_DISPLAY_NAMES.get(name, name))]
+        if name in SUMMARY_SECTIONS:
+            categories.append("Resumo do Sistema")
+        self._redraw_if_open(*categories)
+        return False
+
+    def _on_hardware_changes(self, generation: int, changes: Dict[str, Any]) -> bool:
+        """Show the changes since the previous boot in the sidebar."""
+        if generation != self._load_generation or changes == self.hardware_changes:
+            return False
+        had_changes = bool(self.hardware_changes)
+        self.hardware_changes = changes
+        if had_changes != bool(changes):
+            self._update_ui_with_data()
+        else:
+            self._redraw_if_open(CHANGES_CATEGORY)
+        return False
+    
+    def _redraw_if_open(self, *category_ids: str) -> None:
+        """Re-render the open category if it is one of category_ids."""
+        selected = self.category_list.get_selected_row()
+        if isinstance(selected, CategoryRow) and selected.category_id in category_ids:
+            self._display_category_details(selected.category_id)
+
+    def _fetch_lazy_section(self, name: str) -> None:
+        """Collect an expensive section (Sensors, Repos) in the background."""
+        if name in self._loading_sections:
+            return
+        self._loading_sections.add(name)
+        generation = self._load_generation
+        
+        def worker():
+            try:
+                entries = get_inxi_snapshot().section(name)
+            except (subprocess.SubprocessError, json.JSONDecodeError, OSError) as e:
+                logger.error(f"Error fetching inxi section {name}: {e}")
+                entries = []
+            GLib.idle_add(self._on_lazy_section_loaded, generation, name, entries)
+        
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_lazy_section_loaded(self, generation: int, name: str, entries: List[Dict[str, Any]]) -> bool:
+        """Show a lazily collected section if its category is still open."""
+        if generation != self._load_generation:
+            return False
+        self._loading_sections.discard(name)
+        self.raw_inxi_data[name] = entries
+        self.hardware_data = self._map_raw_to_display_categories(self.raw_inxi_data)
+        
+        self._redraw_if_open(self._translate_category_name(SECTION_DISPLAY_NAMES.get(name, name)))
+        return False
+
+    def _show_section_loading(self, category_name: str) -> None:
+        """Show a placeholder while a category is being collected."""
+        loading_group = Adw.PreferencesGroup()
+        loading_group.set_title(category_name)
+        loading_group.set_description("Coletando informações...")
+        
+        loading_row = Adw.ActionRow()
+        loading_row.set_title("Carregando")
+        spinner = Gtk.Spinner()
+        spinner.start()
+        loading_row.add_suffix(spinner)
+        loading_group.add(loading_row)
+        
+        self.content_box.append(loading_group)
 
     def _map_raw_to_display_categories(self, raw_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
         # ... (como antes) ...
-        category_mapping_keys = { 
-            "System": "System Information", "CPU": "Processor (CPU)", "Graphics": "Graphics / GPU",
-            "Audio": "Audio Devices", "Network": "Network Interfaces", "Drives": "Storage Devices",
-            "Partition": "Partitions", "Usb": "USB Devices", "Sensors": "Sensors",
-            "Memory": "Memory Details", "Machine": "Machine Info", "Info": "Processes & System Load",
-            "Battery": "Battery Status", "RAID": "RAID Arrays", "Swap": "Swap Details", # Added Swap
-            "Bluetooth": "Bluetooth Devices", "Repos": "Software Repositories",
-        }
         processed_data = {}
         for raw_key, raw_value_list in raw_data.items():
-            display_name = category_mapping_keys.get(raw_key, raw_key.replace('_', ' ').title())
+            display_name = SECTION_DISPLAY_NAMES.get(raw_key, raw_key.replace('_', ' ').title())
             processed_data[display_name] = raw_value_list 
         return processed_data
 
@@ -751,11 +731,16 @@ class HardwareInfoPage(Gtk.Box):
         self.progress_bar.set_fraction(1.0)
         self.progress_bar.set_visible(False)
         self.split_view.set_visible(True)
+        
+        # Mantém a categoria aberta enquanto as seções chegam
+        selected = self.category_list.get_selected_row()
+        selected_id = selected.category_id if isinstance(selected, CategoryRow) else None
         while child := self.category_list.get_first_child():
             self.category_list.remove(child)
         
         category_icon_mapping = {
             "Resumo do Sistema": "document-properties-symbolic",
+            CHANGES_CATEGORY: "emblem-synchronizing-symbolic",
             "Informações do Sistema": "computer-symbolic",
             "Processador (CPU)": "cpu-symbolic",
             "Detalhes da Memória": "memory-symbolic",
@@ -779,6 +764,7 @@ class HardwareInfoPage(Gtk.Box):
         # Ordem de importância das categorias
         category_order = {
             "Resumo do Sistema": -10,
+            CHANGES_CATEGORY: -5,
             "Informações do Sistema": 0,
             "Processador (CPU)": 10,
             "Detalhes da Memória": 20,
@@ -800,6 +786,8 @@ class HardwareInfoPage(Gtk.Box):
         
         # Adicionar "Resumo do Sistema" primeiro
         all_display_categories_for_sidebar = {"Resumo do Sistema": None}
+        if self.hardware_changes:
+            all_display_categories_for_sidebar[CHANGES_CATEGORY] = self.hardware_changes
         
         # Mapear categorias para nomes em português
         translated_categories = {}
@@ -809,18 +797,28 @@ class HardwareInfoPage(Gtk.Box):
         
         all_display_categories_for_sidebar.update(translated_categories)
         
+        # Seções caras ficam na lista e só são coletadas quando abertas
+        lazy_categories = {self._translate_category_name(SECTION_DISPLAY_NAMES[name]) for name in LAZY_SECTIONS}
+        for category_display_name in lazy_categories:
+            all_display_categories_for_sidebar.setdefault(category_display_name, None)
+        
         sorted_categories = sorted(all_display_categories_for_sidebar.keys(), 
                                  key=lambda x: (category_order.get(x, 1000), x))
         
-        has_selected_row = False
+        rows = []
         for category_display_name in sorted_categories:
-            if category_display_name == "Resumo do Sistema" or translated_categories.get(category_display_name):
+            if (category_display_name in ("Resumo do Sistema", CHANGES_CATEGORY) or category_display_name in lazy_categories
+                    or translated_categories.get(category_display_name)):
                 icon_name = category_icon_mapping.get(category_display_name, default_icon)
                 row = CategoryRow(category_display_name, category_display_name, icon_name)
                 self.category_list.append(row)
-                if not has_selected_row:
-                    self.category_list.select_row(row)
-                    has_selected_row = True
+                rows.append(row)
+        
+        has_selected_row = False
+        if rows:
+            row_to_select = next((row for row in rows if row.category_id == selected_id), rows[0])
+            self.category_list.select_row(row_to_select)
+            has_selected_row = True
         
         if not has_selected_row and self.category_list.get_first_child():
             self.category_list.select_row(self.category_list.get_first_child())
@@ -868,6 +866,10 @@ class HardwareInfoPage(Gtk.Box):
             self._create_system_summary()
             return
         
+        if category_id_display_name == CHANGES_CATEGORY:
+            self._create_changes_view()
+            return
+        
         # Buscar dados da categoria usando o nome traduzido reverso
         reverse_translation_map = {
             "Informações do Sistema": "System Information",
@@ -892,6 +894,12 @@ class HardwareInfoPage(Gtk.Box):
         original_category_name = reverse_translation_map.get(category_id_display_name, category_id_display_name)
         category_data_list = self.hardware_data.get(original_category_name)
         
+        raw_section = SECTION_RAW_NAMES.get(original_category_name)
+        if raw_section in LAZY_SECTIONS and raw_section not in self.raw_inxi_data:
+            self._show_section_loading(category_id_display_name)
+            self._fetch_lazy_section(raw_section)
+            return
+        
         if not category_data_list:
             # Create empty state with PreferencesGroup
             empty_group = Adw.PreferencesGroup()
@@ -909,6 +917,24 @@ class HardwareInfoPage(Gtk.Box):
         
         self._process_category_data_with_groups(category_data_list, category_id_display_name)
 
+    def _create_changes_view(self) -> None:
+        """List the devices added or removed since the previous boot."""
+        for section_name, change in self.hardware_changes.items():
+            group = Adw.PreferencesGroup()
+            group.set_title(self._translate_category_name(SECTION_DISPLAY_NAMES.get(section_name, section_name)))
+            
+            for title, entries, icon_name in (("Novo", change.get("added", []), "list-add-symbolic"),
+                                              ("Removido", change.get("removed", []), "list-remove-symbolic")):
+                for entry in entries:
+                    row = Adw.ActionRow()
+                    row.set_title(title)
+                    row.set_subtitle(GLib.markup_escape_text(snapshot_store.describe_entry(entry)))
+                    row.set_subtitle_selectable(True)
+                    row.add_prefix(Gtk.Image.new_from_icon_name(icon_name))
+                    group.add(row)
+            
+            self.content_box.append(group)
+
     def _process_category_data_with_groups(self, data_list: List[Dict], category_name: str) -> None:
         """Process category data and organize it into PreferencesGroup containers."""
         if not isinstance(data_list, list):
@@ -1719,9 +1745,21 @@ class HardwareInfoPage(Gtk.Box):
     def _on_refresh_clicked(self, button: Optional[Gtk.Button]=None) -> None:
         # ... (como antes) ...
         if hasattr(self, 'error_box_container') and self.error_box_container.get_parent(): self.remove(self.error_box_container)
+        get_inxi_snapshot().invalidate()
+        
+        if self.raw_inxi_data:
+            # Mantém a tela: só a categoria aberta é redesenhada, e só se sua seção mudou
+            for name in LAZY_SECTIONS:
+                self.raw_inxi_data.pop(name, None)
+            self._load_generation += 1
+            self._loading_sections.clear()
+            threading.Thread(target=self._fetch_inxi_data, daemon=True).start()
+            return
+        
         while child := self.content_box.get_first_child(): self.content_box.remove(child)
         while child := self.category_list.get_first_child(): self.category_list.remove(child)
-        self.hardware_data = {}; self.raw_inxi_data = {}
+        self.hardware_data = {}; self.raw_inxi_data = {}; self.native_summary = {}
+        self.hardware_changes = {}; self._section_hashes = {}
         self._load_hardware_info()
 
 # Exemplo de uso
@@ -0,0 +1,189 @@
+"""
+Installation Date Resolver
+
+This module finds when the system was installed. The sources are tried in
+order of reliability (machine-id, installer logs, the first pacman or dpkg
+log entry, the root filesystem birth time, system directory timestamps)
+using only os.stat and file reads, no subprocesses.
+
+The installation date never changes, so the first result is memoized in
+memory. Results of the reliable sources are also stored in the cache
+directory; the directory timestamps, which a recent system change may have
+moved, are not.
+"""
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from common.cache_paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = os.path.join(CACHE_DIR, "install-date.json")
+
+MACHINE_ID = "/etc/machine-id"
+INSTALLER_LOGS = (
+    "/var/log/installer/syslog",
+    "/var/log/calamares.log",
+    "/var/log/ubiquity/syslog",
+    "/var/log/anaconda/anaconda.log"
+)
+PACMAN_LOG = "/var/log/pacman.log"
+DPKG_LOG = "/var/log/dpkg.log"
+SYSTEM_DIRS = ("/etc", "/var/lib/dpkg", "/var/lib/rpm", "/usr/share/doc")
+
+DATE_FORMAT = "%d/%m/%Y"
+
+_lock = threading.Lock()
+_resolved: Optional[Dict[str, Any]] = None
+
+
+def _mtime(path: str) -> Optional[float]:
+    """Return the mtime of a path, or None when it does not exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _ctime(path: str) -> Optional[float]:
+    """Return the ctime of a path, or None when it does not exist."""
+    try:
+        return os.stat(path).st_ctime
+    except OSError:
+        return None
+
+
+def _birth_time(path: str) -> Optional[float]:
+    """Creation time of a file through statx, when the platform exposes it."""
+    statx = getattr(os, "statx", None)
+    try:
+        if statx is not None:
+            birth = getattr(statx(path, getattr(os, "STATX_BTIME", 0x800)), "stx_btime", None)
+        else:
+            birth = getattr(os.stat(path), "st_birthtime", None)
+    except (OSError, TypeError):
+        return None
+    return float(birth) if birth else None
+
+
+def _first_line(path: str) -> str:
+    """Read the first line of a file, empty when unavailable."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.readline().strip()
+    except OSError:
+        return ""
+
+
+def _pacman_log_time() -> Optional[float]:
+    """Time of the first pacman log entry, "[2023-01-15T10:30:25-0300] ..." or "[2023-01-15 10:30] ..."."""
+    line = _first_line(PACMAN_LOG)
+    if not line.startswith("["):
+        return None
+    stamp = line[1:line.find("]")]
+    for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(stamp, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _dpkg_log_time() -> Optional[float]:
+    """Time of the first dpkg log entry, "2023-01-15 10:30:25 startup ..."."""
+    try:
+        return datetime.strptime(_first_line(DPKG_LOG)[:19], "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+def _sources() -> Iterable[Tuple[str, Callable[[], Optional[float]], bool]]:
+    """Yield (name, probe, reliable) tuples in order of reliability."""
+    # machine-id is written once, during installation
+    yield MACHINE_ID, lambda: _mtime(MACHINE_ID), True
+    for path in INSTALLER_LOGS:
+        yield path, lambda path=path: _mtime(path), True
+    yield PACMAN_LOG, _pacman_log_time, True
+    yield DPKG_LOG, _dpkg_log_time, True
+    yield "root filesystem", lambda: _birth_time("/"), True
+    # Fallbacks: the ctime moves whenever the directory is changed
+    for path in SYSTEM_DIRS:
+        yield path, lambda path=path: _ctime(path), False
+    yield "/", lambda: _ctime("/"), False
+
+
+def _load_cache() -> Optional[Dict[str, Any]]:
+    """Read the memoized installation time, if it came from a reliable source."""
+    reliable = {name for name, _probe, is_reliable in _sources() if is_reliable}
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if (isinstance(data, dict) and isinstance(data.get("timestamp"), (int, float))
+                and data.get("source") in reliable):
+            return data
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _store_cache(data: Dict[str, Any]) -> None:
+    """Write the installation time atomically to the cache directory."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, CACHE_FILE)
+    except OSError as e:
+        logger.debug(f"Could not store installation date: {e}")
+
+
+def resolve_installation_time() -> Optional[Dict[str, Any]]:
+    """
+    Find the installation time.
+
+    Returns:
+        Dictionary with "timestamp" (seconds since the epoch) and "source"
+        (the file it was read from), or None when no source is available.
+    """
+    global _resolved
+
+    with _lock:
+        if _resolved is not None:
+            return _resolved
+
+        cached = _load_cache()
+        if cached is not None:
+            _resolved = cached
+            return cached
+
+        for name, probe, reliable in _sources():
+            timestamp = probe()
+            if timestamp:
+                logger.debug(f"Install date from {name}: {timestamp}")
+                _resolved = {"timestamp": timestamp, "source": name}
+                if reliable:
+                    _store_cache(_resolved)
+                return _resolved
+
+        return None
+
+
+def get_installation_date(date_format: str = DATE_FORMAT) -> Optional[str]:
+    """
+    Get the installation date formatted for display.
+
+    Args:
+        date_format: strftime format, "dd/mm/yyyy" by default.
+
+    Returns:
+        The formatted date, or None when it cannot be determined.
+    """
+    resolved = resolve_installation_time()
+    if resolved is None:
+        return None
+    return datetime.fromtimestamp(resolved["timestamp"]).strftime(date_format)
@@ -0,0 +1,400 @@
+"""
+Inxi Snapshot Provider
+
+This module runs inxi once and shares the parsed result with every hardware
+view (the hardware info page, the summary view and SystemInfo). The snapshot
+is kept for a TTL and rebuilt on an explicit refresh; the sections handed out
+are read-only, so one consumer cannot change what the others see.
+
+inxi JSON is decoded straight from its stdout: the "NNN#" sort prefixes of
+the keys are stripped and the containers frozen by the decoder hook, in a
+single pass with no temporary file or whole-document regular expressions.
+
+Each report section is collected by its own inxi call, several at a time,
+so a view can show the fast sections before the slow ones finish. Sections
+that probe hardware slowly (Sensors) or the network (Repos) are not part of
+the default report and are only collected when asked for.
+"""
+import os
+import re
+import sys
+import json
+import time
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Options shared by every section call: extra detail, admin fields, filters
+INXI_COMMAND = ["inxi", "-xxxza", "--output", "json", "--no-host"]
+INXI_TIMEOUT = 90
+
+# inxi option of each section, in collection order (summary sections first)
+SECTION_OPTIONS = {
+    "System": "-S",
+    "CPU": "-C",
+    "Memory": "-m",
+    "Graphics": "-G",
+    "Info": "-I",
+    "Partition": "-P",
+    "Drives": "-D",
+    "Network": "-N",
+    "Audio": "-A",
+    "Machine": "-M",
+    "Swap": "-j",
+    "Usb": "-J",
+    "Bluetooth": "-E",
+    "Battery": "-B",
+    "RAID": "-R",
+    "Sensors": "-s",
+    "Repos": "-r",
+}
+
+# Slow sections, collected only when a view opens them
+LAZY_SECTIONS = ("Sensors", "Repos")
+EAGER_SECTIONS = tuple(name for name in SECTION_OPTIONS if name not in LAZY_SECTIONS)
+
+# inxi calls running at the same time
+MAX_PARALLEL_SECTIONS = 6
+
+# Seconds a snapshot is reused before inxi runs again
+DEFAULT_TTL = 300
+
+_ANSI_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("inxi snapshot data is read-only")
+
+
+class FrozenDict(dict):
+    """Dictionary that rejects modification."""
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+
+class FrozenList(list):
+    """List that rejects modification."""
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert parsed JSON into read-only containers.
+
+    Args:
+        value: Parsed JSON value.
+
+    Returns:
+        The same data with FrozenDict and FrozenList containers.
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def _clean_value(value: Any) -> Any:
+    """Freeze nested arrays and drop color codes from strings."""
+    if isinstance(value, str):
+        return _ANSI_PATTERN.sub('', value) if '\x1b' in value else value
+    if isinstance(value, list) and not isinstance(value, FrozenList):
+        # Objects inside were already frozen by the hook; only arrays nest here
+        return FrozenList(_clean_value(item) for item in value)
+    return value
+
+
+def _decode_object(pairs: List[Tuple[str, Any]]) -> FrozenDict:
+    """
+    json object_pairs_hook for inxi output.
+
+    inxi prefixes every key with sort counters, e.g. "001#002#0#Kernel";
+    only the part after the last "#" is kept.
+    """
+    return FrozenDict((key.rpartition('#')[2], _clean_value(value)) for key, value in pairs)
+
+
+def parse_sections(content: Union[str, bytes]) -> FrozenDict:
+    """
+    Parse inxi JSON output into sections.
+
+    Args:
+        content: Raw output of "inxi --output json", as read from the pipe.
+
+    Returns:
+        Read-only mapping of section name ("System", "CPU", ...) to its list
+        of entries.
+
+    Raises:
+        json.JSONDecodeError: If the output is not valid JSON.
+    """
+    try:
+        # strict=False: color codes are raw control characters inside strings
+        data = json.loads(content, object_pairs_hook=_decode_object, strict=False)
+    except json.JSONDecodeError as json_err:
+        text = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+        context_start = max(0, json_err.pos - 30)
+        context_snippet = text[context_start:json_err.pos + 30]
+        logger.error(f"JSON parsing error: {json_err.msg} at pos {json_err.pos}. Context: ...'{context_snippet}'...")
+        problem_file_path = os.path.join(tempfile.gettempdir(), "inxi_problematic.json")
+        with open(problem_file_path, "w", encoding='utf-8') as pf:
+            pf.write(text)
+        logger.error(f"Problematic JSON content saved to {problem_file_path}")
+        raise
+
+    # inxi prints a list of single-section objects
+    if isinstance(data, FrozenDict):
+        return data
+    sections: Dict[str, Any] = {}
+    if isinstance(data, list):
+        for wrapper in data:
+            if isinstance(wrapper, dict):
+                sections.update(wrapper)
+    return FrozenDict(sections)
+
+
+def _legacy_parse(content: str) -> Dict[str, Any]:
+    """Previous pipeline (whole-text regexes, then json.loads), kept for the benchmark."""
+    content = _ANSI_PATTERN.sub('', content)
+    content = re.sub(r'"[^"]*#([^"]*)"', r'"\1"', content)
+    sections: Dict[str, Any] = {}
+    for wrapper in json.loads(content):
+        if isinstance(wrapper, dict):
+            sections.update(wrapper)
+    return freeze(sections)
+
+
+class InxiSnapshot:
+    """
+    Parsed inxi report shared by the hardware views.
+
+    Every section is kept for the TTL on its own; concurrent callers asking
+    for the same section wait for the inxi call in progress instead of
+    starting their own.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        """
+        Initialize the snapshot.
+
+        Args:
+            ttl: Seconds a collected section stays current.
+        """
+        self.ttl = ttl
+        self._sections: Dict[str, Tuple[float, FrozenList]] = {}
+        self._section_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _section_lock(self, name: str) -> threading.Lock:
+        """Return the lock serializing the collection of one section."""
+        with self._lock:
+            return self._section_locks.setdefault(name, threading.Lock())
+
+    def _run_inxi(self, options: Iterable[str]) -> bytes:
+        """
+        Run inxi and return its JSON output, read from the pipe.
+
+        Args:
+            options: Section options, e.g. ["-C"].
+
+        Raises:
+            subprocess.SubprocessError: If inxi fails without output or times out.
+            FileNotFoundError: If inxi is not installed.
+        """
+        # Imported here so the benchmark runs without the app on sys.path
+        from common.command_runner import get_command_runner
+
+        cmd = INXI_COMMAND + list(options) + ["--output-file", "print"]
+        result = get_command_runner().run_sync(cmd, timeout=INXI_TIMEOUT)
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8', errors='replace').strip()
+            logger.error(f"inxi command finished with exit code {result.returncode}. Stderr: {stderr}")
+            if not result.stdout.strip():
+                raise subprocess.SubprocessError(
+                    f"inxi failed (code {result.returncode}) and produced no output. Stderr: {stderr}"
+                )
+            logger.warning("inxi returned non-zero but produced output. Attempting to process.")
+        return result.stdout
+
+    def is_stale(self, name: str) -> bool:
+        """Check whether the next request for a section will run inxi."""
+        cached = self._sections.get(name)
+        return cached is None or time.monotonic() - cached[0] > self.ttl
+
+    def section(self, name: str) -> FrozenList:
+        """
+        Get one section, running inxi for it only when it is stale.
+
+        Args:
+            name: Section name as printed by inxi, e.g. "CPU" or "Graphics".
+
+        Returns:
+            The entries of the section, empty when inxi did not report it.
+
+        Raises:
+            KeyError: If the section is unknown.
+            subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError:
+                If inxi could not produce the section; failures are not cached.
+        """
+        option = SECTION_OPTIONS[name]
+        with self._section_lock(name):
+            if not self.is_stale(name):
+                return self._sections[name][1]
+
+            start = time.monotonic()
+            parsed = parse_sections(self._run_inxi([option]))
+            entries = parsed.get(name)
+            if entries is None and len(parsed) == 1:
+                # Tolerate inxi versions that title the section differently
+                entries = next(iter(parsed.values()))
+            if entries is None:
+                entries = FrozenList()
+
+            self._sections[name] = (time.monotonic(), entries)
+            logger.debug(f"inxi section {name} collected in {time.monotonic() - start:.2f}s")
+            return entries
+
+    def sections(self, names: Iterable[str] = EAGER_SECTIONS,
+                 on_section: Optional[Callable[[str, FrozenList], Any]] = None) -> FrozenDict:
+        """
+        Collect several sections concurrently.
+
+        Args:
+            names: Sections to collect, the eager ones by default.
+            on_section: Called from a worker thread with (name, entries) as
+                each section completes, so a view can show it right away.
+
+        Returns:
+            Read-only mapping of section name to its entries, in the order
+            requested. Sections that failed are left out.
+
+        Raises:
+            subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError:
+                If every section failed.
+        """
+        names = list(names)
+        results: Dict[str, FrozenList] = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL_SECTIONS, len(names))),
+                                thread_name_prefix="inxi") as executor:
+            futures = {executor.submit(self.section, name): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    entries = future.result()
+                except (subprocess.SubprocessError, json.JSONDecodeError, OSError) as e:
+                    logger.error(f"Error collecting inxi section {name}: {e}")
+                    errors.append(e)
+                    continue
+                results[name] = entries
+                if on_section is not None:
+                    on_section(name, entries)
+
+        if errors and not results:
+            raise errors[0]
+        return FrozenDict((name, results[name]) for name in names if name in results)
+
+    def get(self) -> FrozenDict:
+        """
+        Get the default report (every section except the lazy ones).
+
+        Returns:
+            Read-only mapping of section name to its list of entries.
+        """
+        return self.sections(EAGER_SECTIONS)
+
+    def refresh(self) -> FrozenDict:
+        """
+        Run inxi again regardless of the TTL.
+
+        Returns:
+            The new default report.
+        """
+        self.invalidate()
+        return self.get()
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Mark sections stale so the next request runs inxi.
+
+        Args:
+            name: Section to invalidate, or None for every section.
+        """
+        with self._lock:
+            if name is None:
+                self._sections.clear()
+            else:
+                self._sections.pop(name, None)
+
+
+_shared_snapshot: Optional[InxiSnapshot] = None
+_shared_lock = threading.Lock()
+
+
+def get_inxi_snapshot() -> InxiSnapshot:
+    """
+    Get the process-wide inxi snapshot.
+
+    Returns:
+        The shared InxiSnapshot instance.
+    """
+    global _shared_snapshot
+    with _shared_lock:
+        if _shared_snapshot is None:
+            _shared_snapshot = InxiSnapshot()
+        return _shared_snapshot
+
+
+def benchmark(path: str, rounds: int = 20) -> Dict[str, float]:
+    """
+    Compare the decoder with the previous regex pipeline on a captured dump.
+
+    Args:
+        path: File with the output of "inxi -FxxxzamP --output json".
+        rounds: Times each parser runs.
+
+    Returns:
+        Mean seconds per parse for "legacy" and "streaming".
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    legacy_input = raw.decode('utf-8', errors='replace')
+    if _legacy_parse(legacy_input).keys() != parse_sections(raw).keys():
+        logger.warning("Parsers disagree on the sections of this dump")
+
+    results = {}
+    for name, func, data in (("legacy", _legacy_parse, legacy_input),
+                             ("streaming", parse_sections, raw)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func(data)
+        results[name] = (time.perf_counter() - start) / rounds
+    return results
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: benchmark the parsers on captured dumps."""
+    if len(argv) < 3 or argv[1] != "benchmark":
+        print(f"Usage: {os.path.basename(argv[0])} benchmark DUMP.json [DUMP.json...]", file=sys.stderr)
+        return 2
+
+    for path in argv[2:]:
+        results = benchmark(path)
+        speedup = results["legacy"] / results["streaming"] if results["streaming"] else 0.0
+        print(f"{path}: {os.path.getsize(path) / 1024:.0f} KiB, "
+              f"legacy {results['legacy'] * 1000:.2f} ms, "
+              f"streaming {results['streaming'] * 1000:.2f} ms ({speedup:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
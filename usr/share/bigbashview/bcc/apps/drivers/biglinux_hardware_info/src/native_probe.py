@@ -0,0 +1,249 @@
+"""
+Native Hardware Probe
+
+This module reads the few values the summary cards need straight from
+/proc, /sys and /etc, without running inxi: distro, kernel, CPU model and
+core count, RAM usage, GPU names and root filesystem usage. Every probe
+takes milliseconds, so the summary can be shown before the full inxi
+report is collected.
+"""
+import os
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROC_CPUINFO = "/proc/cpuinfo"
+PROC_MEMINFO = "/proc/meminfo"
+PROC_MOUNTS = "/proc/self/mounts"
+SYS_DRM_DIR = "/sys/class/drm"
+OS_RELEASE_FILES = ("/etc/os-release", "/usr/lib/os-release")
+HWDATA_PCI_IDS = "/usr/share/hwdata/pci.ids"
+
+# PCI display controller classes (VGA, XGA, 3D, other)
+DISPLAY_CLASS_PREFIX = "0x03"
+
+
+def _read_text(path: str) -> str:
+    """Read a small text file, returning an empty string when unavailable."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def read_os_release() -> Dict[str, str]:
+    """
+    Read the os-release fields.
+
+    Returns:
+        Mapping such as {"NAME": "BigLinux", "PRETTY_NAME": "BigLinux 2024"}.
+    """
+    for path in OS_RELEASE_FILES:
+        content = _read_text(path)
+        if not content:
+            continue
+        fields = {}
+        for line in content.splitlines():
+            key, sep, value = line.partition("=")
+            if sep and not key.startswith("#"):
+                fields[key.strip()] = value.strip().strip('"\'')
+        return fields
+    return {}
+
+
+def get_cpu_info() -> Dict[str, Any]:
+    """
+    Read the CPU model and topology from /proc/cpuinfo.
+
+    Returns:
+        Dictionary with "model", "cores" (physical) and "threads" (logical);
+        values are None when /proc/cpuinfo does not report them.
+    """
+    model = None
+    threads = 0
+    cores: Set[Tuple[str, str]] = set()
+    physical_id = core_id = None
+
+    for line in _read_text(PROC_CPUINFO).splitlines():
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        key, value = key.strip(), value.strip()
+        if key == "processor":
+            threads += 1
+            physical_id = core_id = None
+        elif key in ("model name", "Model", "cpu model") and model is None:
+            model = " ".join(value.split())
+        elif key == "physical id":
+            physical_id = value
+        elif key == "core id":
+            core_id = value
+        if physical_id is not None and core_id is not None:
+            cores.add((physical_id, core_id))
+
+    return {
+        "model": model,
+        "cores": len(cores) or threads or None,
+        "threads": threads or None
+    }
+
+
+def get_memory_info() -> Dict[str, Optional[int]]:
+    """
+    Read RAM and swap usage from /proc/meminfo.
+
+    Returns:
+        Dictionary with "total", "available", "used", "swap_total" and
+        "swap_used" in bytes; values are None when unavailable.
+    """
+    fields = {}
+    for line in _read_text(PROC_MEMINFO).splitlines():
+        key, sep, value = line.partition(":")
+        parts = value.split()
+        if sep and parts and parts[0].isdigit():
+            fields[key] = int(parts[0]) * 1024
+
+    total = fields.get("MemTotal")
+    available = fields.get("MemAvailable", fields.get("MemFree"))
+    swap_total = fields.get("SwapTotal")
+    swap_free = fields.get("SwapFree")
+    return {
+        "total": total,
+        "available": available,
+        "used": total - available if total is not None and available is not None else None,
+        "swap_total": swap_total,
+        "swap_used": swap_total - swap_free if swap_total is not None and swap_free is not None else None
+    }
+
+
+def _read_pci_names(wanted: Set[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """Resolve (vendor, device) pairs to (vendor name, device name) from hwdata."""
+    names: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    if not wanted:
+        return names
+
+    wanted_vendors = {vendor for vendor, _ in wanted}
+    vendor = vendor_name = None
+    try:
+        with open(HWDATA_PCI_IDS, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.startswith('#') or not line.strip():
+                    continue
+                if line.startswith('C '):
+                    # Class list at the end of the file, no vendors after it
+                    break
+                if not line.startswith('\t'):
+                    vendor = line[:4].lower()
+                    vendor_name = line[4:].strip() if vendor in wanted_vendors else None
+                    continue
+                if vendor_name and not line.startswith('\t\t'):
+                    key = (vendor, line[1:5].lower())
+                    if key in wanted:
+                        names[key] = (vendor_name, line[5:].strip())
+                        if len(names) == len(wanted):
+                            break
+    except OSError:
+        logger.debug(f"hwdata PCI database not available: {HWDATA_PCI_IDS}")
+    return names
+
+
+def get_gpu_names() -> List[str]:
+    """
+    List the display controllers behind the DRM cards.
+
+    Returns:
+        GPU names such as "NVIDIA Corporation TU117M", or "PCI Device
+        10de:1f99" when hwdata does not know the device.
+    """
+    devices: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+    try:
+        entries = sorted(os.listdir(SYS_DRM_DIR))
+    except OSError:
+        return []
+
+    for entry in entries:
+        # card0, card1... (connectors such as card0-HDMI-A-1 share the device)
+        if not entry.startswith("card") or "-" in entry:
+            continue
+        device_dir = os.path.realpath(os.path.join(SYS_DRM_DIR, entry, "device"))
+        if device_dir in seen:
+            continue
+        seen.add(device_dir)
+        pci_class = _read_text(os.path.join(device_dir, "class"))
+        if pci_class and not pci_class.startswith(DISPLAY_CLASS_PREFIX):
+            continue
+        vendor = _read_text(os.path.join(device_dir, "vendor")).lower().replace("0x", "")
+        device = _read_text(os.path.join(device_dir, "device")).lower().replace("0x", "")
+        if vendor and device:
+            devices.append((vendor, device))
+
+    names = _read_pci_names(set(devices))
+    gpus = []
+    for vendor, device in devices:
+        if (vendor, device) in names:
+            gpus.append(" ".join(names[(vendor, device)]))
+        else:
+            gpus.append(f"PCI Device {vendor}:{device}")
+    return gpus
+
+
+def _mount_source(mount_point: str) -> Optional[str]:
+    """Return the device mounted at a mount point."""
+    source = None
+    for line in _read_text(PROC_MOUNTS).splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[1] == mount_point:
+            # The last entry wins when mounts are stacked
+            source = parts[0]
+    return source
+
+
+def get_disk_usage(path: str = "/") -> Dict[str, Any]:
+    """
+    Read the usage of the filesystem holding a path.
+
+    Args:
+        path: Path on the filesystem, the root by default.
+
+    Returns:
+        Dictionary with "device", "total", "used" and "free" (bytes,
+        free as available to unprivileged users); empty on failure.
+    """
+    try:
+        stat = os.statvfs(path)
+    except OSError as e:
+        logger.debug(f"statvfs failed for {path}: {e}")
+        return {}
+
+    total = stat.f_blocks * stat.f_frsize
+    free = stat.f_bavail * stat.f_frsize
+    return {
+        "device": _mount_source(path),
+        "total": total,
+        "used": total - stat.f_bfree * stat.f_frsize,
+        "free": free
+    }
+
+
+def get_summary() -> Dict[str, Any]:
+    """
+    Collect every value shown by the summary cards.
+
+    Returns:
+        Dictionary with "os_name", "hostname", "kernel", "cpu", "memory",
+        "gpus" and "root_disk".
+    """
+    os_release = read_os_release()
+    uname = os.uname()
+    return {
+        "os_name": os_release.get("PRETTY_NAME") or os_release.get("NAME"),
+        "hostname": uname.nodename,
+        "kernel": uname.release,
+        "cpu": get_cpu_info(),
+        "memory": get_memory_info(),
+        "gpus": get_gpu_names(),
+        "root_disk": get_disk_usage("/")
+    }
@@ -0,0 +1,334 @@
+"""
+Hardware Snapshot Store
+
+This module keeps the last inxi report of each boot as gzip compressed JSON
+under ~/.cache, with a content hash per section, and compares them:
+
+- the hardware page re-renders only the sections whose hash changed;
+- the "changes since last boot" view lists the devices that appeared,
+  disappeared or changed (a new USB device, a RAM or kernel change);
+- support reports can attach the delta instead of the full dump:
+
+    python3 src/snapshot_store.py diff > hardware-delta.json
+"""
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+if __name__ == "__main__":
+    # Allow running as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.cache_paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the stored snapshots changes
+SNAPSHOT_FORMAT = 1
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "hardware-snapshots")
+
+# Snapshots kept on disk, newest first
+MAX_SNAPSHOTS = 10
+
+BOOT_ID_FILE = "/proc/sys/kernel/random/boot_id"
+
+# Readings that change between runs without any hardware change; left out
+# of the stored hashes and ignored when listing changes
+VOLATILE_SECTIONS = frozenset(("Info", "Sensors"))
+VOLATILE_KEYS = frozenset((
+    "uptime", "used", "available", "speed", "cur", "min/max", "avg", "temp",
+    "charge", "condition", "processes", "load", "rx", "tx", "bogomips"
+))
+
+
+def _canonical(value: Any) -> str:
+    """Serialize a value the same way regardless of key order."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def section_hash(entries: Any) -> str:
+    """
+    Hash the content of a section.
+
+    Args:
+        entries: Section entries as parsed from inxi.
+
+    Returns:
+        Hex digest that changes whenever any value of the section changes.
+    """
+    return hashlib.sha256(_canonical(entries).encode('utf-8')).hexdigest()
+
+
+def stable_hash(entries: Any) -> str:
+    """
+    Hash the content of a section without its volatile readings.
+
+    Args:
+        entries: Section entries as parsed from inxi.
+
+    Returns:
+        Hex digest that only changes when the hardware or configuration does.
+    """
+    return section_hash(_stable(entries))
+
+
+def current_boot_id() -> str:
+    """Return the kernel boot id, empty when unavailable."""
+    try:
+        with open(BOOT_ID_FILE, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _snapshot_paths() -> List[str]:
+    """Stored snapshot files, newest first."""
+    return sorted(glob.glob(os.path.join(SNAPSHOT_DIR, "snapshot-*.json.gz")), reverse=True)
+
+
+def _read(path: str) -> Optional[Dict[str, Any]]:
+    """Read a stored snapshot, None when missing, corrupt or outdated."""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, EOFError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable hardware snapshot {path}: {e}")
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def _latest_with_path() -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Return the path and content of the newest readable snapshot."""
+    for path in _snapshot_paths():
+        snapshot = _read(path)
+        if snapshot is not None:
+            return path, snapshot
+    return None, None
+
+
+def _prune(boot_id: str) -> None:
+    """
+    Delete the snapshots beyond MAX_SNAPSHOTS.
+
+    The newest snapshot of an earlier boot is always kept, as it is the
+    baseline of the "changes since last boot" view.
+    """
+    paths = _snapshot_paths()
+    keep = set(paths[:MAX_SNAPSHOTS])
+    for path in paths:
+        snapshot = _read(path)
+        if snapshot is not None and snapshot.get("boot_id") != boot_id:
+            keep.add(path)
+            break
+    for old_path in paths:
+        if old_path not in keep:
+            try:
+                os.unlink(old_path)
+            except OSError:
+                pass
+
+
+def save(sections: Dict[str, Any], failed: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+    """
+    Store a report as the snapshot of the current boot.
+
+    Only one snapshot is kept per boot: a newer report of the same boot
+    replaces it, and nothing is written when its hashes, taken without the
+    volatile readings, are unchanged.
+
+    Args:
+        sections: Mapping of section name to its entries.
+        failed: Sections that could not be collected; their entries are
+            taken from the newest snapshot, so a partial report does not
+            become the baseline of the next boot.
+
+    Returns:
+        The stored snapshot, or None if it could not be written.
+    """
+    latest_path, latest = _latest_with_path()
+    sections = dict(sections)
+    if latest is not None:
+        for name in failed:
+            if name not in sections and name in latest.get("sections", {}):
+                sections[name] = latest["sections"][name]
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "taken_at": time.time(),
+        "boot_id": current_boot_id(),
+        "hashes": {name: stable_hash(entries) for name, entries in sections.items()},
+        "sections": sections
+    }
+
+    same_boot = latest is not None and latest.get("boot_id") == snapshot["boot_id"]
+    if same_boot and latest.get("hashes") == snapshot["hashes"]:
+        return latest
+
+    path = os.path.join(SNAPSHOT_DIR, f"snapshot-{int(snapshot['taken_at'] * 1000):015d}.json.gz")
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(_canonical(snapshot))
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not store hardware snapshot: {e}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        return None
+
+    if same_boot and latest_path != path:
+        try:
+            os.unlink(latest_path)
+        except OSError:
+            pass
+    _prune(snapshot["boot_id"])
+    return snapshot
+
+
+def load_latest() -> Optional[Dict[str, Any]]:
+    """Return the newest stored snapshot."""
+    return _latest_with_path()[1]
+
+
+def load_previous_boot(boot_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return the newest snapshot taken during an earlier boot.
+
+    Args:
+        boot_id: Current boot id, read from the kernel by default.
+
+    Returns:
+        The snapshot, or None when every stored snapshot is from this boot.
+    """
+    boot_id = current_boot_id() if boot_id is None else boot_id
+    for path in _snapshot_paths():
+        snapshot = _read(path)
+        if snapshot is not None and snapshot.get("boot_id") != boot_id:
+            return snapshot
+    return None
+
+
+def _stable(entry: Any) -> Any:
+    """Drop volatile readings from an entry before comparing it."""
+    if isinstance(entry, dict):
+        return {key: _stable(value) for key, value in entry.items() if key not in VOLATILE_KEYS}
+    if isinstance(entry, list):
+        return [_stable(item) for item in entry]
+    return entry
+
+
+def diff(old: Dict[str, Any], new: Dict[str, Any],
+         ignore_sections: Iterable[str] = VOLATILE_SECTIONS) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Compare the sections of two reports entry by entry.
+
+    Only sections present in both reports are compared: a section missing
+    from one of them failed to be collected, its devices did not go away.
+
+    Args:
+        old: Sections of the earlier report.
+        new: Sections of the later report.
+        ignore_sections: Sections whose changes are not reported.
+
+    Returns:
+        Mapping of changed section name to {"added": [...], "removed": [...]}
+        entries; empty when nothing but volatile readings changed.
+    """
+    ignored = set(ignore_sections)
+    changes: Dict[str, Dict[str, List[Any]]] = {}
+    for name in old:
+        if name in ignored or name not in new:
+            continue
+        old_entries = old[name] or []
+        new_entries = new[name] or []
+        if stable_hash(old_entries) == stable_hash(new_entries):
+            continue
+
+        old_keys = [_canonical(_stable(entry)) for entry in old_entries]
+        new_keys = [_canonical(_stable(entry)) for entry in new_entries]
+        remaining = list(old_keys)
+        added = []
+        for key, entry in zip(new_keys, new_entries):
+            if key in remaining:
+                remaining.remove(key)
+            else:
+                added.append(entry)
+        new_remaining = list(new_keys)
+        removed = []
+        for key, entry in zip(old_keys, old_entries):
+            if key in new_remaining:
+                new_remaining.remove(key)
+            else:
+                removed.append(entry)
+
+        if added or removed:
+            changes[name] = {"added": added, "removed": removed}
+    return changes
+
+
+def describe_entry(entry: Any) -> str:
+    """
+    Build a short label for a section entry, e.g. for the changes view.
+
+    Args:
+        entry: One entry of a section.
+
+    Returns:
+        The most descriptive values of the entry joined by " - ".
+    """
+    if not isinstance(entry, dict):
+        return str(entry)
+    for keys in (("Device", "vendor"), ("model", "size"), ("Type", "model"), ("ID", "dev"),
+                 ("Kernel", "Distro"), ("total",)):
+        values = [str(entry[key]) for key in keys if entry.get(key) not in (None, "")]
+        if values:
+            return " - ".join(values)
+    return ", ".join(f"{key}: {value}" for key, value in list(entry.items())[:3])
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: list snapshots or print the delta since last boot."""
+    command = argv[1] if len(argv) > 1 else "diff"
+
+    if command == "list":
+        for path in _snapshot_paths():
+            snapshot = _read(path)
+            if snapshot is not None:
+                taken_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot["taken_at"]))
+                print(f"{taken_at}\t{snapshot.get('boot_id', '')}\t{len(snapshot['sections'])} sections\t{path}")
+        return 0
+
+    if command == "diff":
+        latest = load_latest()
+        previous = load_previous_boot(latest.get("boot_id")) if latest is not None else None
+        if latest is None or previous is None:
+            print("No snapshot from an earlier boot to compare with", file=sys.stderr)
+            return 1
+        delta = {
+            "from": {"taken_at": previous["taken_at"], "boot_id": previous.get("boot_id")},
+            "to": {"taken_at": latest["taken_at"], "boot_id": latest.get("boot_id")},
+            "changes": diff(previous["sections"], latest["sections"])
+        }
+        json.dump(delta, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    print(f"Usage: {os.path.basename(argv[0])} [diff|list]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
@@ -7,6 +7,8 @@ import subprocess
 import json
 import logging
 
+from .inxi_snapshot import get_inxi_snapshot
+
 logger = logging.getLogger(__name__)
 
 class SystemInfo:
@@ -24,63 +26,64 @@ class SystemInfo:
         """
         Get comprehensive hardware information using inxi.
         
+        The report comes from the shared inxi snapshot, so the getters
+        below do not run inxi again.
+        
         Returns:
-            dict: A dictionary containing hardware information
+            dict: Read-only mapping of inxi section name to its entries
         """
         try:
-            # Run the inxi command to get hardware info in JSON format
-            cmd = ["inxi", "-Fxxxza", "--output", "json", "--output-file", "print"]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Clean up the output using sed to remove color codes and other artifacts
-            clean_cmd = ["sed", "-e", 's/".*#/"/g']
-            clean_process = subprocess.run(clean_cmd, input=result.stdout, 
-                                          capture_output=True, text=True)
-            
-            # Parse the JSON output
-            hardware_data = json.loads(clean_process.stdout)
-            return hardware_data
-            
-        except (subprocess.SubprocessError, json.JSONDecodeError, FileNotFoundError) as e:
+            return get_inxi_snapshot().get()
+        except (subprocess.SubprocessError, json.JSONDecodeError, OSError) as e:
             logger.error(f"Error fetching hardware info: {e}")
             return {}
     
+    def refresh(self):
+        """
+        Run inxi again and return the new hardware information.
+        
+        Returns:
+            dict: Read-only mapping of inxi section name to its entries
+        """
+        get_inxi_snapshot().invalidate()
+        return self.get_hardware_info()
+    
     def get_cpu_info(self):
         """
         Get CPU information.
         
         Returns:
-            dict: CPU information
+            list: CPU section entries
         """
         hardware_info = self.get_hardware_info()
-        return hardware_info.get('cpu', {})
+        return hardware_info.get('CPU', [])
     
     def get_gpu_info(self):
         """
         Get GPU information.
         
         Returns:
-            dict: GPU information
+            list: Graphics section entries
         """
         hardware_info = self.get_hardware_info()
-        return hardware_info.get('graphics', {})
+        return hardware_info.get('Graphics', [])
     
     def get_memory_info(self):
         """
         Get memory information.
         
         Returns:
-            dict: Memory information
+            list: Memory section entries
         """
         hardware_info = self.get_hardware_info()
-        return hardware_info.get('memory', {})
+        return hardware_info.get('Memory', [])
     
     def get_disk_info(self):
         """
         Get storage information.
         
         Returns:
-            dict: Storage information
+            list: Drives section entries
         """
         hardware_info = self.get_hardware_info()
-        return hardware_info.get('drives', {})
+        return hardware_info.get('Drives', [])
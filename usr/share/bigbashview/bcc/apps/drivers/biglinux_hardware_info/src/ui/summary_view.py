@@ -13,6 +13,9 @@ gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, Adw
 
+from ..inxi_snapshot import get_inxi_snapshot
+from .. import native_probe
+
 class SummaryView(Gtk.Box):
     """Summary view showing an overview of system hardware"""
     
@@ -337,33 +340,71 @@ class SummaryView(Gtk.Box):
 
         return parsed_data
 
+    def _parse_native_data(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transforms the native probe summary into the structure expected
+        by update_info.
+        
+        Args:
+            summary: The dictionary returned by native_probe.get_summary().
+        
+        Returns:
+            A dictionary with keys matching self.info_rows_config["data_key"].
+        """
+        parsed_data: Dict[str, Any] = {
+            "os_name": summary.get("os_name"),
+            "hostname": summary.get("hostname"),
+            "kernel_version": summary.get("kernel"),
+        }
+        
+        cpu_info = summary.get("cpu") or {}
+        if cpu_info.get("model"):
+            parsed_data["cpu_model"] = cpu_info["model"]
+            if cpu_info.get("cores") and cpu_info.get("threads"):
+                parsed_data["cpu_cores"] = f"{cpu_info['cores']} cores, {cpu_info['threads']} threads"
+        
+        mem_info = summary.get("memory") or {}
+        total, used = mem_info.get("total"), mem_info.get("used")
+        if total:
+            if used is not None:
+                parsed_data["total_memory_gb"] = (f"{GLib.format_size(total)} - {GLib.format_size(used)} "
+                                                  f"({used / total * 100:.1f}%)")
+            else:
+                parsed_data["total_memory_gb"] = GLib.format_size(total)
+        
+        if summary.get("gpus"):
+            parsed_data["gpu_models"] = summary["gpus"]
+        
+        root_disk = summary.get("root_disk") or {}
+        if root_disk.get("total"):
+            parsed_data["total_storage_gb"] = GLib.format_size(root_disk["total"])
+        
+        return parsed_data
+
     def _fetch_and_parse_data_thread(self) -> None:
         """
         Worker function to fetch and parse system data in a separate thread.
         Calls self.update_info via GLib.idle_add on completion or error.
         """
+        # The native probes answer in milliseconds; inxi is only needed
+        # when they cannot read the basics (e.g. /proc not mounted)
         try:
-            # Simplified command to get hardware information
-            # Some parameters might not be compatible with the installed inxi version
-            # Start with basic parameters
-            cmd = ["inxi", "-F", "-J"]  # -F for full output, -J for JSON format
-            
-            process = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
-            raw_data_list = json.loads(process.stdout)
+            parsed_data = self._parse_native_data(native_probe.get_summary())
+            if parsed_data.get("cpu_model") and parsed_data.get("total_memory_gb"):
+                GLib.idle_add(self.update_info, parsed_data)
+                return
+        except Exception as e:
+            print(f"Native hardware probe failed, falling back to inxi: {e}")
+        
+        try:
+            # Reuse the inxi report shared with the other hardware views
+            sections = get_inxi_snapshot().get()
+            raw_data_list = [{name: entries} for name, entries in sections.items()]
             parsed_data = self._parse_system_data(raw_data_list)
             GLib.idle_add(self.update_info, parsed_data)
-        except subprocess.CalledProcessError as e:
+        except subprocess.SubprocessError as e:
             print(f"Error running inxi: {e}")
-            # Try an even more basic command as fallback
-            try:
-                cmd = ["inxi", "-J"]
-                process = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
-                raw_data_list = json.loads(process.stdout)
-                parsed_data = self._parse_system_data(raw_data_list)
-                GLib.idle_add(self.update_info, parsed_data)
-            except Exception as inner_e:
-                print(f"Fallback inxi command also failed: {inner_e}")
-                GLib.idle_add(self.update_info, None)
+            GLib.idle_add(self.update_info, None)
         except json.JSONDecodeError as e:
             print(f"Error parsing inxi JSON output: {e}")
             GLib.idle_add(self.update_info, None)
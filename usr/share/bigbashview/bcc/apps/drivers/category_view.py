@@ -16,6 +16,7 @@ from typing import Dict, List, Any, Optional
 
 # Import driver lister module
 from driver_installer.driver_lister import list_all_drivers, CATEGORY_LABELS
+from driver_installer.driver_record import DriverStore
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -189,16 +190,11 @@ class DriverCategoryView(Adw.Application):
     
     def _load_drivers(self):
         """Load drivers and organize them by category."""
-        all_drivers = list_all_drivers()
+        store = DriverStore(list_all_drivers())
         
-        # Group by category
-        self.drivers_by_category = {"all": all_drivers}
-        
-        for driver in all_drivers:
-            category = driver.get("category", "unknown")
-            if category not in self.drivers_by_category:
-                self.drivers_by_category[category] = []
-            self.drivers_by_category[category].append(driver)
+        # Categories are views over the store, not copies of the records
+        self.drivers_by_category = {"all": store.records()}
+        self.drivers_by_category.update(store.items())
     
     def _get_icon_for_category(self, category: str) -> str:
         """Get an appropriate icon name for a category."""
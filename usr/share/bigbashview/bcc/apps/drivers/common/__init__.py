@@ -0,0 +1,6 @@
+"""
+Common Package
+
+This package provides services shared by the driver installer, hardware
+information and kernel manager components.
+"""
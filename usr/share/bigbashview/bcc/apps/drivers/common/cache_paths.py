@@ -0,0 +1,13 @@
+"""
+Cache Paths Module
+
+This module defines the per-user directory shared by the caches of the
+driver installer, hardware information and kernel manager components
+(driver scans, kernel lists, hardware snapshots, prefetched packages).
+"""
+import os
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "biglinux-driver-manager"
+)
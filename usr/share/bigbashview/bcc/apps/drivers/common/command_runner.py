@@ -0,0 +1,412 @@
+"""
+Command Runner Module
+
+This module runs every external command of the application on one
+long-lived asyncio loop, in a background thread shared by all pages,
+instead of a subprocess.run here and a fresh event loop per task there.
+
+The runner limits how many commands run at once, shares the result of
+identical commands already in flight, kills commands that exceed their
+timeout and records latency and exit statistics per command, which the
+command statistics panel shows.
+"""
+import os
+import time
+import asyncio
+import threading
+import subprocess
+import logging
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Commands running at the same time; the others wait for a free slot
+MAX_CONCURRENT_COMMANDS = 6
+
+# Returncode recorded when the program could not be started
+NOT_FOUND_RETURNCODE = 127
+
+
+class CommandStats:
+    """Latency and exit statistics of one command."""
+
+    __slots__ = ("runs", "failures", "timeouts", "shared", "total_time", "max_time",
+                 "last_returncode", "last_run")
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.shared = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_returncode: Optional[int] = None
+        self.last_run = 0.0
+
+    def record(self, duration: float, returncode: Optional[int], timed_out: bool = False) -> None:
+        """Account one finished run."""
+        self.runs += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.last_returncode = returncode
+        self.last_run = time.time()
+        if timed_out:
+            self.timeouts += 1
+        elif returncode != 0:
+            self.failures += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a plain dictionary."""
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "shared": self.shared,
+            "avg_time": self.total_time / self.runs if self.runs else 0.0,
+            "max_time": self.max_time,
+            "total_time": self.total_time,
+            "last_returncode": self.last_returncode,
+            "last_run": self.last_run
+        }
+
+
+def stats_key(args: Sequence[str]) -> str:
+    """Group runs by program and first argument, e.g. "pacman -Ss"."""
+    if not args:
+        return ""
+    program = os.path.basename(args[0])
+    if program in ("pkexec", "sudo") and len(args) > 1:
+        # Keep the program actually being run
+        return f"{program} {stats_key(args[1:])}"
+    # Scripts are listed by file name, not by their temporary directory
+    return " ".join([program] + [os.path.basename(arg) for arg in args[1:2]])
+
+
+def _decode(output: Optional[bytes]) -> str:
+    """Decode command output, replacing invalid bytes."""
+    return output.decode('utf-8', errors='replace') if output else ""
+
+
+class CommandRunner:
+    """Runs commands on a shared asyncio loop with pooling, timeouts and metrics."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_COMMANDS) -> None:
+        """
+        Initialize the runner. The loop thread starts with the first command.
+
+        Args:
+            max_concurrent: Number of commands allowed to run at once.
+        """
+        self.max_concurrent = max_concurrent
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Command key -> [shared task, number of callers waiting for it]
+        self._in_flight: Dict[Tuple[Any, ...], List[Any]] = {}
+        self._stats: Dict[str, CommandStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The shared event loop, started on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop, args=(self._loop, ready),
+                    name="command-runner", daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        """Body of the loop thread."""
+        asyncio.set_event_loop(loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def in_loop_thread(self) -> bool:
+        """Check whether the caller runs on the loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[Any], background: bool = False) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the shared loop, from any thread.
+
+        Args:
+            coro: Coroutine to run, e.g. a page's "populate" task.
+            background: Nobody waits for the result, so log its errors.
+
+        Returns:
+            Future with the result; cancelling it cancels the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if background:
+            future.add_done_callback(self._log_task_error)
+        return future
+
+    @staticmethod
+    def _log_task_error(future: concurrent.futures.Future) -> None:
+        """Log errors of background tasks."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Unhandled error in background task", exc_info=future.exception())
+
+    async def run(self, args: Sequence[str], timeout: Optional[float] = None,
+                  input: Optional[bytes] = None, text: bool = False, check: bool = False,
+                  env: Optional[Mapping[str, str]] = None, dedupe: bool = True) -> subprocess.CompletedProcess:
+        """
+        Run a command and collect its output.
+
+        Can be awaited from any event loop; the command itself always runs
+        on the shared loop.
+
+        Args:
+            args: Program and arguments.
+            timeout: Seconds before the command is killed, None for no limit.
+            input: Bytes written to the command's stdin.
+            text: Decode stdout and stderr as UTF-8.
+            check: Raise CalledProcessError on a non-zero exit code.
+            env: Environment of the command, the current one by default.
+            dedupe: Share the result with an identical command in flight.
+
+        Returns:
+            The finished process, as subprocess.run would return it.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeded its timeout.
+            subprocess.CalledProcessError: If check is set and the command failed.
+            FileNotFoundError: If the program does not exist.
+        """
+        args = [str(arg) for arg in args]
+        loop = self.loop
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            returncode, stdout, stderr = await self._run_shared(args, timeout, input, env, dedupe)
+        else:
+            returncode, stdout, stderr = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+                self._run_shared(args, timeout, input, env, dedupe), loop
+            ))
+
+        if text:
+            stdout, stderr = _decode(stdout), _decode(stderr)
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+        return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+    def run_sync(self, args: Sequence[str], **kwargs: Any) -> subprocess.CompletedProcess:
+        """
+        Run a command from a worker thread and wait for it.
+
+        Takes the same arguments as run().
+
+        Raises:
+            RuntimeError: If called from the loop thread, where it would block
+                the loop; await run() there instead.
+        """
+        if self.in_loop_thread():
+            raise RuntimeError("run_sync() called from the command runner loop; await run() instead")
+        return asyncio.run_coroutine_threadsafe(self.run(args, **kwargs), self.loop).result()
+
+    async def _run_shared(self, args: List[str], timeout: Optional[float], input: Optional[bytes],
+                          env: Optional[Mapping[str, str]], dedupe: bool) -> Tuple[int, bytes, bytes]:
+        """Run a command, joining an identical one already in flight."""
+        if not dedupe:
+            return await self._execute(args, timeout, input, env)
+
+        key = (tuple(args), timeout, input, tuple(sorted(env.items())) if env is not None else None)
+        entry = self._in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._execute(args, timeout, input, env))
+            entry = self._in_flight[key] = [task, 0]
+            task.add_done_callback(lambda _task: self._in_flight.pop(key, None))
+        else:
+            with self._lock:
+                self._stats.setdefault(stats_key(args), CommandStats()).shared += 1
+            logger.debug(f"Joining in-flight command: {' '.join(args)}")
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # A cancelled caller must not cancel the run the others are waiting for
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                # Nobody is waiting anymore: kill the command
+                task.cancel()
+
+    async def _execute(self, args: List[str], timeout: Optional[float], input: Optional[bytes],
+                       env: Optional[Mapping[str, str]]) -> Tuple[int, bytes, bytes]:
+        """Start a command once a slot is free and wait for it."""
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=dict(env) if env is not None else None
+                )
+            except OSError:
+                self._record(args, time.monotonic() - started, NOT_FOUND_RETURNCODE)
+                raise
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(input), timeout)
+            except asyncio.TimeoutError:
+                await self._kill(process)
+                self._record(args, time.monotonic() - started, process.returncode, timed_out=True)
+                logger.warning(f"Command timed out after {timeout}s: {' '.join(args)}")
+                raise subprocess.TimeoutExpired(args, timeout)
+            except asyncio.CancelledError:
+                await self._kill(process)
+                raise
+
+            self._record(args, time.monotonic() - started, process.returncode)
+            return process.returncode, stdout, stderr
+
+    async def stream(self, args: Sequence[str], on_stdout: Optional[Callable[[str], None]] = None,
+                     on_stderr: Optional[Callable[[str], None]] = None, timeout: Optional[float] = None,
+                     env: Optional[Mapping[str, str]] = None) -> int:
+        """
+        Run a long command and hand each output line to a callback.
+
+        Streamed commands (installs, removals) do not take a concurrency slot,
+        so a long operation never delays the probes, and are never shared.
+        Callbacks run on the loop thread.
+
+        Args:
+            args: Program and arguments.
+            on_stdout: Called with each stdout line, without the line break.
+            on_stderr: Called with each stderr line, without the line break.
+            timeout: Seconds before the command is killed, None for no limit.
+            env: Environment of the command, the current one by default.
+
+        Returns:
+            The exit code of the command.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeded its timeout.
+            FileNotFoundError: If the program does not exist.
+        """
+        args = [str(arg) for arg in args]
+        if asyncio.get_running_loop() is not self.loop:
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+                self.stream(args, on_stdout, on_stderr, timeout, env), self.loop
+            ))
+
+        started = time.monotonic()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=dict(env) if env is not None else None
+            )
+        except OSError:
+            self._record(args, time.monotonic() - started, NOT_FOUND_RETURNCODE)
+            raise
+
+        async def pump(reader: asyncio.StreamReader, callback: Optional[Callable[[str], None]]) -> None:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if callback is not None:
+                    try:
+                        callback(_decode(line).rstrip('\r\n'))
+                    except Exception as e:
+                        logger.error(f"Error in output callback of {args[0]}: {e}")
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(pump(process.stdout, on_stdout), pump(process.stderr, on_stderr), process.wait()),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            await self._kill(process)
+            self._record(args, time.monotonic() - started, process.returncode, timed_out=True)
+            logger.warning(f"Command timed out after {timeout}s: {' '.join(args)}")
+            raise subprocess.TimeoutExpired(args, timeout)
+        except asyncio.CancelledError:
+            await self._kill(process)
+            raise
+
+        self._record(args, time.monotonic() - started, process.returncode)
+        return process.returncode
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        """Kill a process and reap it."""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+    def _record(self, args: Sequence[str], duration: float, returncode: Optional[int],
+                timed_out: bool = False) -> None:
+        """Account a finished run in the statistics."""
+        logger.debug(f"Command finished in {duration * 1000:.0f} ms with code {returncode}: {' '.join(args)}")
+        with self._lock:
+            self._stats.setdefault(stats_key(args), CommandStats()).record(duration, returncode, timed_out)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the statistics of every command run so far.
+
+        Returns:
+            Mapping of command (program and first argument) to its runs,
+            failures, timeouts, shared runs and latencies in seconds.
+        """
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        """Forget the recorded statistics."""
+        with self._lock:
+            self._stats.clear()
+
+    def shutdown(self) -> None:
+        """Stop the loop thread; the next command starts a new one."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=5)
+
+
+_shared_runner: Optional[CommandRunner] = None
+_shared_lock = threading.Lock()
+
+
+def get_command_runner() -> CommandRunner:
+    """
+    Get the process-wide command runner.
+
+    Returns:
+        The shared CommandRunner instance.
+    """
+    global _shared_runner
+    with _shared_lock:
+        if _shared_runner is None:
+            _shared_runner = CommandRunner()
+        return _shared_runner
@@ -0,0 +1,259 @@
+"""
+Package Prefetch Module
+
+This module prepares a package installation before it is authorized: it
+resolves the dependency closure of the selected packages against the sync
+and local databases, then downloads the missing package files in parallel,
+without privileges, into a directory of the user cache. The privileged
+pacman call only has to verify and install files that are already present:
+
+    pacman -S --cachedir /var/cache/pacman/pkg/ --cachedir ~/.cache/biglinux-driver-manager/packages ...
+
+A local directory holding the package files can stand in for the mirrors,
+e.g. for tests:
+
+    BIGLINUX_PACKAGE_MIRROR=/tmp/mirror python3 common/package_prefetch.py nvidia
+"""
+import os
+import sys
+import hashlib
+import logging
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+if __name__ == "__main__":
+    # Allow running as a script from the bash pages
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.cache_paths import CACHE_DIR
+
+if TYPE_CHECKING:
+    from common.pacman_db import SyncPackage
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+PREFETCH_DIR = os.path.join(CACHE_DIR, "packages")
+
+# Directory with package files used instead of the configured mirrors
+MIRROR_ENV = "BIGLINUX_PACKAGE_MIRROR"
+
+MAX_PARALLEL_DOWNLOADS = 4
+DOWNLOAD_TIMEOUT = 60  # seconds without data before a mirror is abandoned
+CHUNK_SIZE = 256 * 1024
+
+
+class PrefetchResult(NamedTuple):
+    """Outcome of a prefetch."""
+    downloaded: Tuple[str, ...]
+    cached: Tuple[str, ...]
+    failed: Tuple[str, ...]
+    unresolved: Tuple[str, ...]
+
+    @property
+    def complete(self) -> bool:
+        """True when every package of the closure is available locally."""
+        return not self.failed and not self.unresolved
+
+
+def resolve_closure(names: Iterable[str]) -> Tuple[List["SyncPackage"], List[str]]:
+    """
+    Resolve the packages a "pacman -S --needed" of names would download.
+
+    Dependencies already satisfied by an installed package, or by a package
+    installed under another name that provides them, are not followed.
+
+    Args:
+        names: Package names to install.
+
+    Returns:
+        Tuple of (sync packages to download, names found in no repository).
+    """
+    # Imported here: the command line entry point sets up sys.path first
+    from common.package_state import get_package_state
+    from common.pacman_db import get_sync_database, strip_version
+
+    database = get_sync_database()
+    installed = get_package_state().installed_packages()
+
+    closure: Dict[str, "SyncPackage"] = {}
+    unresolved: List[str] = []
+    seen: Set[str] = set()
+    pending = [(name, True) for name in names]
+    while pending:
+        name, requested = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+
+        providers = database.providers(name)
+        if not requested and (name in installed or any(p.name in installed for p in providers)):
+            continue
+        if not providers:
+            unresolved.append(name)
+            continue
+        package = providers[0]
+        if installed.get(package.name) == package.version or package.name in closure:
+            continue
+        closure[package.name] = package
+        pending.extend((strip_version(dependency), False) for dependency in package.depends)
+    return list(closure.values()), unresolved
+
+
+def _servers(package: "SyncPackage", mirror: Optional[str]) -> List[str]:
+    """URLs the package file can be downloaded from, in order."""
+    # Imported here: the command line entry point sets up sys.path first
+    from common.pacman_db import configured_servers
+
+    if mirror:
+        return [f"file://{os.path.abspath(mirror)}/{package.filename}"]
+    return [f"{server.rstrip('/')}/{package.filename}" for server in configured_servers().get(package.repo, [])]
+
+
+def _is_valid(path: str, package: "SyncPackage") -> bool:
+    """Check a package file against the size and checksum of the database."""
+    try:
+        if package.size and os.path.getsize(path) != package.size:
+            return False
+        if not package.sha256:
+            return True
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest() == package.sha256
+    except OSError:
+        return False
+
+
+def _download(package: "SyncPackage", mirror: Optional[str]) -> str:
+    """
+    Download one package file into PREFETCH_DIR.
+
+    Raises:
+        OSError: If no mirror provided a valid file.
+    """
+    path = os.path.join(PREFETCH_DIR, package.filename)
+    temp_path = f"{path}.part"
+    errors = []
+    for url in _servers(package, mirror):
+        try:
+            with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response, open(temp_path, 'wb') as f:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    f.write(chunk)
+            if _is_valid(temp_path, package):
+                os.replace(temp_path, path)
+                return path
+            errors.append(f"{url}: checksum mismatch")
+        except OSError as e:
+            errors.append(f"{url}: {e}")
+    try:
+        os.unlink(temp_path)
+    except OSError:
+        pass
+    raise OSError(f"Could not download {package.filename} ({'; '.join(errors) or 'no mirror'})")
+
+
+def cachedir_args() -> List[str]:
+    """
+    pacman options that make it use the prefetched files.
+
+    The system cache directories come first, so anything pacman still has
+    to download goes there, as usual.
+    """
+    # Imported here: the command line entry point sets up sys.path first
+    from common.pacman_db import configured_cache_dirs
+
+    args = []
+    for directory in configured_cache_dirs() + [PREFETCH_DIR]:
+        args += ["--cachedir", directory]
+    return args
+
+
+def prefetch(names: Iterable[str], on_progress: Optional[Callable[[int, int, str], None]] = None,
+             mirror: Optional[str] = None) -> PrefetchResult:
+    """
+    Download the packages needed to install names, in parallel.
+
+    Args:
+        names: Package names to install.
+        on_progress: Called from the download threads with (files done,
+            files total, package name).
+        mirror: Directory with package files; $BIGLINUX_PACKAGE_MIRROR or
+            the mirrors of pacman.conf by default.
+
+    Returns:
+        Names downloaded, already cached, failed and not found.
+    """
+    # Imported here: the command line entry point sets up sys.path first
+    from common.pacman_db import configured_cache_dirs
+
+    mirror = mirror or os.environ.get(MIRROR_ENV)
+    packages, unresolved = resolve_closure(names)
+
+    cached, missing = [], []
+    for package in packages:
+        if not package.filename:
+            unresolved.append(package.name)
+        elif any(_is_valid(os.path.join(directory, package.filename), package)
+                 for directory in configured_cache_dirs() + [PREFETCH_DIR]):
+            cached.append(package.name)
+        else:
+            missing.append(package)
+
+    downloaded, failed = [], []
+    if missing:
+        os.makedirs(PREFETCH_DIR, exist_ok=True)
+        lock = threading.Lock()
+
+        def fetch(package: "SyncPackage") -> None:
+            try:
+                _download(package, mirror)
+                outcome = downloaded
+            except OSError as e:
+                logger.warning(str(e))
+                outcome = failed
+            with lock:
+                outcome.append(package.name)
+                done = len(downloaded) + len(failed)
+            if on_progress is not None:
+                on_progress(done, len(missing), package.name)
+
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS, thread_name_prefix="prefetch") as executor:
+            list(executor.map(fetch, missing))
+
+    logger.info(f"Prefetch: {len(downloaded)} downloaded, {len(cached)} cached, "
+                f"{len(failed)} failed, {len(unresolved)} unresolved")
+    return PrefetchResult(tuple(downloaded), tuple(cached), tuple(failed), tuple(unresolved))
+
+
+def clean() -> None:
+    """Remove the prefetched files, once pacman has installed them."""
+    try:
+        entries = os.listdir(PREFETCH_DIR)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            os.unlink(os.path.join(PREFETCH_DIR, entry))
+        except OSError:
+            pass
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: prefetch the given packages."""
+    if len(argv) < 2:
+        print(f"Usage: {os.path.basename(argv[0])} PACKAGE...", file=sys.stderr)
+        return 2
+    result = prefetch(argv[1:], on_progress=lambda done, total, name: print(f"({done}/{total}) {name}"))
+    for label, names in zip(("downloaded", "cached", "failed", "unresolved"), result):
+        if names:
+            print(f"{label}: {' '.join(names)}")
+    return 0 if result.complete else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
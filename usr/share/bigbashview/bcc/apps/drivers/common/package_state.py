@@ -0,0 +1,185 @@
+"""
+Package State Module
+
+This module resolves which pacman packages are installed, and their
+versions, with a single read of the local package database instead of one
+"pacman -Q" call per package.
+"""
+import os
+import threading
+import logging
+from typing import Dict, Optional, Tuple
+
+from common.command_runner import get_command_runner
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Local pacman database, one "<name>-<version>-<release>" directory per package
+PACMAN_LOCAL_DB = "/var/lib/pacman/local"
+
+
+class PackageStateCache:
+    """Cache of installed packages invalidated by the local database mtime."""
+
+    def __init__(self, db_path: str = PACMAN_LOCAL_DB) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path of the pacman local database directory.
+        """
+        self.db_path = db_path
+        self._packages: Dict[str, str] = {}
+        self._mtime: Optional[float] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _db_mtime(self) -> Optional[float]:
+        """Return the mtime of the local database directory, or None if missing."""
+        try:
+            return os.stat(self.db_path).st_mtime
+        except OSError:
+            return None
+
+    def _read_local_db(self) -> Dict[str, str]:
+        """
+        Read the installed packages from the local database directory.
+
+        Package names may contain dashes but versions and releases never do,
+        so the directory name alone is enough; the desc file is only read
+        for entries that do not follow that layout.
+
+        Returns:
+            Mapping of package name to "version-release".
+        """
+        packages = {}
+        with os.scandir(self.db_path) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                parts = entry.name.rsplit('-', 2)
+                if len(parts) == 3:
+                    packages[parts[0]] = f"{parts[1]}-{parts[2]}"
+                    continue
+                name, version = self._read_desc(os.path.join(entry.path, "desc"))
+                if name:
+                    packages[name] = version
+        return packages
+
+    def _read_desc(self, desc_path: str) -> Tuple[str, str]:
+        """Read %NAME% and %VERSION% from a local database desc file."""
+        name = version = ""
+        try:
+            with open(desc_path, 'r', errors='replace') as f:
+                lines = f.read().split('\n')
+        except OSError:
+            return name, version
+
+        for i, line in enumerate(lines[:-1]):
+            if line == "%NAME%":
+                name = lines[i + 1].strip()
+            elif line == "%VERSION%":
+                version = lines[i + 1].strip()
+            if name and version:
+                break
+        return name, version
+
+    def _query_pacman(self) -> Dict[str, str]:
+        """Fallback for systems without a readable local database: one pacman -Q call."""
+        packages = {}
+        try:
+            result = get_command_runner().run_sync(["pacman", "-Q"], text=True)
+            for line in result.stdout.splitlines():
+                parts = line.split(' ', 1)
+                if len(parts) == 2:
+                    packages[parts[0]] = parts[1]
+        except Exception as e:
+            logger.error(f"Error listing installed packages: {e}")
+        return packages
+
+    def refresh(self, force: bool = False) -> Dict[str, str]:
+        """
+        Reload the installed packages if the local database changed.
+
+        Args:
+            force: Reload even if the database mtime did not change.
+
+        Returns:
+            Mapping of installed package name to version.
+        """
+        with self._lock:
+            mtime = self._db_mtime()
+            if not force and self._loaded and mtime == self._mtime:
+                return self._packages
+
+            if mtime is None:
+                packages = self._query_pacman()
+            else:
+                try:
+                    packages = self._read_local_db()
+                except OSError as e:
+                    logger.error(f"Error reading pacman local database: {e}")
+                    packages = self._query_pacman()
+
+            self._packages = packages
+            self._mtime = mtime
+            self._loaded = True
+            logger.debug(f"Package state loaded: {len(packages)} installed packages")
+            return self._packages
+
+    def invalidate(self) -> None:
+        """Drop the cached state so the next query reloads it."""
+        with self._lock:
+            self._loaded = False
+
+    def installed_packages(self) -> Dict[str, str]:
+        """
+        Get every installed package.
+
+        Returns:
+            Mapping of package name to version. Treat it as read-only.
+        """
+        return self.refresh()
+
+    def is_installed(self, package: str) -> bool:
+        """
+        Check if a package is installed.
+
+        Args:
+            package: Name of the package to check.
+
+        Returns:
+            True if the package is installed, False otherwise.
+        """
+        return package in self.refresh()
+
+    def get_version(self, package: str) -> Optional[str]:
+        """
+        Get the installed version of a package.
+
+        Args:
+            package: Name of the package.
+
+        Returns:
+            The installed version, or None if the package is not installed.
+        """
+        return self.refresh().get(package)
+
+
+_shared_cache: Optional[PackageStateCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_package_state() -> PackageStateCache:
+    """
+    Get the process-wide package state cache.
+
+    Returns:
+        The shared PackageStateCache instance.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PackageStateCache()
+        return _shared_cache
@@ -0,0 +1,503 @@
+"""
+Pacman Sync Database Module
+
+This module reads the repository databases in /var/lib/pacman/sync
+directly, instead of searching them with "pacman -Ss" and parsing its
+output with regular expressions. Each database is a tar archive
+(compressed with zstd, gzip or xz) holding one "desc" file per package;
+it is read once and kept in memory until its mtime changes.
+
+The packages are indexed by name, by the names they provide and by the
+kernel series of the Manjaro style "linuxNNN" packages, so the kernel
+catalog and its headers pairing come from package metadata:
+
+    python3 common/pacman_db.py kernels
+"""
+import io
+import os
+import re
+import sys
+import glob
+import tarfile
+import threading
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# zstd is the default database compression; Python only reads it natively
+# from 3.14 on, otherwise the zstandard module or the zstd command is used
+try:
+    from compression import zstd as _zstd
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+PACMAN_SYNC_DIR = "/var/lib/pacman/sync"
+PACMAN_CONF = "/etc/pacman.conf"
+PACMAN_CACHE_DIR = "/var/cache/pacman/pkg/"
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Upper bound for the zstd command, when used
+ZSTD_TIMEOUT = 60
+
+# Kernel package names: linux, linux-lts, linux-zen, linux61, linux61-rt...
+_KERNEL_NAME = re.compile(r"^linux(?P<series>\d+)?(?:-[a-z0-9._]+)*$")
+
+# Packages of the kernel family that are not kernels
+_NON_KERNEL_SUFFIXES = (
+    "-headers", "-docs", "-firmware", "-api-headers", "-tools", "-meta",
+    "-extramodules", "-utils", "-dkms"
+)
+_NON_KERNEL_NAMES = ("linux-firmware", "linux-api-headers", "linux-tools")
+
+# Runtime dependencies every kernel image package declares
+_KERNEL_DEPENDS = ("kmod", "initramfs", "mkinitcpio")
+
+
+class SyncPackage(NamedTuple):
+    """One package of a sync database."""
+    repo: str
+    name: str
+    version: str
+    description: str
+    provides: Tuple[str, ...]
+    depends: Tuple[str, ...]
+    groups: Tuple[str, ...]
+    filename: str = ""
+    size: int = 0
+    sha256: str = ""
+
+
+def strip_version(dependency: str) -> str:
+    """Drop the version constraint of a dependency, e.g. "kmod>=30" -> "kmod"."""
+    return re.split(r"[<>=:]", dependency, 1)[0]
+
+
+def kernel_series(name: str) -> Optional[str]:
+    """
+    Get the kernel series of a "linuxNNN" package name.
+
+    Args:
+        name: Package name, e.g. "linux61" or "linux510-rt".
+
+    Returns:
+        The series, e.g. "6.1" or "5.10", or None for other names.
+    """
+    match = _KERNEL_NAME.match(name)
+    if not match or not match.group("series"):
+        return None
+    digits = match.group("series")
+    return f"{digits[0]}.{digits[1:]}" if len(digits) > 1 else digits
+
+
+def is_kernel_name(name: str) -> bool:
+    """
+    Check whether a package name follows the kernel naming, e.g. "linux-zen".
+
+    Args:
+        name: Package name.
+
+    Returns:
+        False for the kernel family packages that are not kernels (headers,
+        firmware, docs...), True for any other "linux..." name.
+    """
+    if not _KERNEL_NAME.match(name) or name in _NON_KERNEL_NAMES:
+        return False
+    return not any(name.endswith(suffix) for suffix in _NON_KERNEL_SUFFIXES)
+
+
+def parse_desc(repo: str, content: str) -> Optional[SyncPackage]:
+    """
+    Parse a database "desc" file.
+
+    Args:
+        repo: Repository the file belongs to.
+        content: Text of the file, "%FIELD%" lines followed by values.
+
+    Returns:
+        The package, or None when the file has no name or version.
+    """
+    fields: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for line in content.split('\n'):
+        if line.startswith('%') and line.endswith('%') and len(line) > 2:
+            current = fields.setdefault(line[1:-1], [])
+        elif line and current is not None:
+            current.append(line)
+        else:
+            current = None
+
+    name = fields.get("NAME", [""])[0]
+    version = fields.get("VERSION", [""])[0]
+    if not name or not version:
+        return None
+    return SyncPackage(
+        repo=repo,
+        name=name,
+        version=version,
+        description=" ".join(fields.get("DESC", [])),
+        provides=tuple(fields.get("PROVIDES", [])),
+        depends=tuple(fields.get("DEPENDS", [])),
+        groups=tuple(fields.get("GROUPS", [])),
+        filename=fields.get("FILENAME", [""])[0],
+        size=int(fields.get("CSIZE", ["0"])[0] or 0),
+        sha256=fields.get("SHA256SUM", [""])[0]
+    )
+
+
+def _decompress_zstd(path: str) -> bytes:
+    """Decompress a zstd database with the best available decoder."""
+    if _zstd is not None:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if hasattr(getattr(_zstd, "ZstdDecompressor", None), "stream_reader"):
+            # zstandard: frames written by streaming have no content size
+            with _zstd.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+                return reader.read()
+        return _zstd.decompress(data)
+
+    # Imported here: the command line entry point sets up sys.path first
+    from common.command_runner import get_command_runner
+    result = get_command_runner().run_sync(["zstd", "-dcq", path], timeout=ZSTD_TIMEOUT)
+    if result.returncode != 0:
+        raise OSError(f"zstd failed for {path}: {result.stderr.decode('utf-8', errors='replace').strip()}")
+    return result.stdout
+
+
+def read_database(path: str, repo: Optional[str] = None) -> Dict[str, SyncPackage]:
+    """
+    Read every package of a sync database file.
+
+    Args:
+        path: Path of the database, e.g. /var/lib/pacman/sync/core.db.
+        repo: Repository name, the file name without extension by default.
+
+    Returns:
+        Mapping of package name to package.
+
+    Raises:
+        OSError: If the file cannot be read or decompressed.
+        tarfile.TarError: If the file is not a valid archive.
+    """
+    repo = repo or os.path.basename(path).split('.', 1)[0]
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+
+    if magic == ZSTD_MAGIC:
+        archive = tarfile.open(fileobj=io.BytesIO(_decompress_zstd(path)), mode='r:')
+    else:
+        archive = tarfile.open(path, mode='r:*')
+
+    packages: Dict[str, SyncPackage] = {}
+    with archive:
+        for member in archive:
+            if not member.isfile() or not member.name.endswith("/desc"):
+                continue
+            f = archive.extractfile(member)
+            if f is None:
+                continue
+            package = parse_desc(repo, f.read().decode('utf-8', errors='replace'))
+            if package is not None:
+                packages[package.name] = package
+    return packages
+
+
+def configured_repos(conf_path: str = PACMAN_CONF) -> List[str]:
+    """Repositories in pacman.conf order, which is also their priority."""
+    repos = []
+    try:
+        with open(conf_path, 'r', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('[') and line.endswith(']') and line != "[options]":
+                    repos.append(line[1:-1])
+    except OSError:
+        pass
+    return repos
+
+
+def _conf_lines(conf_path: str, depth: int = 0) -> List[Tuple[str, str, str]]:
+    """(section, key, value) of pacman.conf, following Include files."""
+    entries: List[Tuple[str, str, str]] = []
+    section = ""
+    try:
+        with open(conf_path, 'r', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return entries
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if line.startswith('[') and line.endswith(']'):
+            section = line[1:-1]
+            continue
+        key, _, value = (part.strip() for part in line.partition('='))
+        if key == "Include" and depth < 2:
+            for included in sorted(glob.glob(value)):
+                entries.extend((section, k, v) for _, k, v in _conf_lines(included, depth + 1))
+        elif key:
+            entries.append((section, key, value))
+    return entries
+
+
+def configured_servers(conf_path: str = PACMAN_CONF) -> Dict[str, List[str]]:
+    """
+    Get the mirrors of every repository, as pacman would use them.
+
+    Args:
+        conf_path: pacman.conf; Include files such as the mirrorlist are followed.
+
+    Returns:
+        Mapping of repository name to server URLs with $repo and $arch replaced.
+    """
+    entries = _conf_lines(conf_path)
+    arch = next((v for s, k, v in entries if s == "options" and k == "Architecture"), "auto")
+    if arch in ("auto", ""):
+        arch = os.uname().machine
+    servers: Dict[str, List[str]] = {}
+    for section, key, value in entries:
+        if key == "Server" and section != "options":
+            servers.setdefault(section, []).append(value.replace("$repo", section).replace("$arch", arch))
+    return servers
+
+
+def configured_cache_dirs(conf_path: str = PACMAN_CONF) -> List[str]:
+    """Package cache directories of pacman.conf, /var/cache/pacman/pkg/ by default."""
+    dirs = [v for s, k, v in _conf_lines(conf_path) if s == "options" and k == "CacheDir"]
+    return dirs or [PACMAN_CACHE_DIR]
+
+
+class SyncDatabase:
+    """In-memory index of the sync databases, reloaded per database mtime."""
+
+    def __init__(self, sync_dir: str = PACMAN_SYNC_DIR, conf_path: str = PACMAN_CONF) -> None:
+        """
+        Initialize the index. Nothing is read before the first query.
+
+        Args:
+            sync_dir: Directory holding the <repo>.db files.
+            conf_path: pacman.conf, for the repository order.
+        """
+        self.sync_dir = sync_dir
+        self.conf_path = conf_path
+        self._repos: Dict[str, Tuple[float, Dict[str, SyncPackage]]] = {}
+        self._by_name: Dict[str, SyncPackage] = {}
+        self._providers: Dict[str, List[SyncPackage]] = {}
+        self._by_series: Dict[str, List[SyncPackage]] = {}
+        self._kernels: Optional[List[Tuple[SyncPackage, Optional[SyncPackage]]]] = None
+        self._state: Tuple[Tuple[str, float], ...] = ()
+        self._lock = threading.Lock()
+
+    def _database_files(self) -> List[Tuple[str, str]]:
+        """Return (repo, path) pairs in priority order."""
+        paths = {
+            os.path.basename(path)[:-3]: path
+            for path in glob.glob(os.path.join(self.sync_dir, "*.db"))
+        }
+        order = [repo for repo in configured_repos(self.conf_path) if repo in paths]
+        order += sorted(repo for repo in paths if repo not in order)
+        return [(repo, paths[repo]) for repo in order]
+
+    def mtimes(self) -> Dict[str, float]:
+        """
+        Get the mtime of every sync database.
+
+        Returns:
+            Mapping of repository name to database mtime; a change in any
+            value means the catalog must be rebuilt.
+        """
+        mtimes = {}
+        for repo, path in self._database_files():
+            try:
+                mtimes[repo] = os.stat(path).st_mtime
+            except OSError:
+                continue
+        return mtimes
+
+    def refresh(self) -> None:
+        """Reload the databases whose mtime changed and rebuild the indexes."""
+        with self._lock:
+            mtimes = self.mtimes()
+            state = tuple(mtimes.items())
+            if state == self._state:
+                return
+
+            repos = {}
+            for repo, path in self._database_files():
+                mtime = mtimes.get(repo)
+                cached = self._repos.get(repo)
+                if cached is not None and cached[0] == mtime:
+                    repos[repo] = cached
+                    continue
+                try:
+                    repos[repo] = (mtime, read_database(path, repo))
+                    logger.debug(f"Read {len(repos[repo][1])} packages from {path}")
+                except (OSError, tarfile.TarError, EOFError) as e:
+                    logger.error(f"Error reading sync database {path}: {e}")
+
+            by_name: Dict[str, SyncPackage] = {}
+            providers: Dict[str, List[SyncPackage]] = {}
+            by_series: Dict[str, List[SyncPackage]] = {}
+            # Earlier repositories win, as in pacman
+            for repo in mtimes:
+                if repo not in repos:
+                    continue
+                for package in repos[repo][1].values():
+                    if package.name in by_name:
+                        continue
+                    by_name[package.name] = package
+                    for provided in package.provides:
+                        providers.setdefault(strip_version(provided), []).append(package)
+                    series = kernel_series(package.name)
+                    if series:
+                        by_series.setdefault(series, []).append(package)
+
+            self._repos = repos
+            self._by_name = by_name
+            self._providers = providers
+            self._by_series = by_series
+            self._kernels = None
+            self._state = state
+            logger.info(f"Sync databases indexed: {len(by_name)} packages in {len(repos)} repositories")
+
+    def get(self, name: str) -> Optional[SyncPackage]:
+        """
+        Get a package by name.
+
+        Args:
+            name: Package name.
+
+        Returns:
+            The package from the first repository that has it, or None.
+        """
+        self.refresh()
+        return self._by_name.get(name)
+
+    def providers(self, name: str) -> List[SyncPackage]:
+        """
+        Get the packages providing a name, the package itself first.
+
+        Args:
+            name: Package or virtual package name, e.g. "linux-headers".
+
+        Returns:
+            Packages satisfying the name, empty if none.
+        """
+        self.refresh()
+        found = [self._by_name[name]] if name in self._by_name else []
+        return found + [package for package in self._providers.get(name, []) if package.name != name]
+
+    def packages(self) -> Iterable[SyncPackage]:
+        """Iterate over every indexed package."""
+        self.refresh()
+        return list(self._by_name.values())
+
+    def series(self, series: str) -> List[SyncPackage]:
+        """
+        Get the "linuxNNN" packages of a kernel series.
+
+        Args:
+            series: Series such as "6.1".
+
+        Returns:
+            The kernel and its companion packages, e.g. linux61-headers.
+        """
+        self.refresh()
+        return list(self._by_series.get(series, []))
+
+    def headers_for(self, kernel_name: str) -> Optional[SyncPackage]:
+        """
+        Get the headers package built for a kernel.
+
+        Args:
+            kernel_name: Kernel package name, e.g. "linux-lts" or "linux61".
+
+        Returns:
+            "<kernel>-headers", or a package providing it, or None.
+        """
+        providers = self.providers(f"{kernel_name}-headers")
+        return providers[0] if providers else None
+
+    def is_kernel(self, package: SyncPackage) -> bool:
+        """Check whether a package is a kernel image, from its name and dependencies."""
+        name = package.name
+        if not is_kernel_name(name):
+            return False
+        depends = {strip_version(dependency) for dependency in package.depends}
+        if depends.intersection(_KERNEL_DEPENDS):
+            return True
+        # Repositories that do not declare the dependencies still ship headers
+        return f"{name}-headers" in self._by_name
+
+    def kernels(self) -> List[Tuple[SyncPackage, Optional[SyncPackage]]]:
+        """
+        List the kernels available in the repositories.
+
+        Returns:
+            (kernel, headers) pairs in repository order; headers is None when
+            the repositories do not ship them.
+        """
+        self.refresh()
+        kernels = self._kernels
+        if kernels is None:
+            kernels = [
+                (package, self.headers_for(package.name))
+                for package in self._by_name.values()
+                if self.is_kernel(package)
+            ]
+            self._kernels = kernels
+        return list(kernels)
+
+
+_shared_database: Optional[SyncDatabase] = None
+_shared_lock = threading.Lock()
+
+
+def get_sync_database() -> SyncDatabase:
+    """
+    Get the process-wide sync database index.
+
+    Returns:
+        The shared SyncDatabase instance.
+    """
+    global _shared_database
+    with _shared_lock:
+        if _shared_database is None:
+            _shared_database = SyncDatabase()
+        return _shared_database
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: list the kernels or query a package."""
+    command = argv[1] if len(argv) > 1 else "kernels"
+    database = get_sync_database()
+
+    if command == "kernels":
+        for kernel, headers in database.kernels():
+            print("\t".join((
+                kernel.repo,
+                kernel.name,
+                kernel.version,
+                headers.name if headers else "-",
+                kernel_series(kernel.name) or "-"
+            )))
+        return 0
+
+    if command == "provides" and len(argv) > 2:
+        for package in database.providers(argv[2]):
+            print(f"{package.repo}/{package.name} {package.version}")
+        return 0
+
+    print(f"Usage: {os.path.basename(argv[0])} [kernels|provides NAME]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    # Allow running as a script from the bash pages
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
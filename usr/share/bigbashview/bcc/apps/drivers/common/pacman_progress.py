@@ -0,0 +1,159 @@
+"""
+Pacman Progress Module
+
+This module turns the output of a pacman transaction, read line by line
+while it runs (directly or through mhwd, mhwd-kernel or an AUR helper), into
+a progress fraction. Each phase of the transaction owns a slice of the bar:
+
+    resolving dependencies    0.00 - 0.05
+    downloading packages      0.05 - 0.45   by packages downloaded
+    keyring/integrity checks  0.45 - 0.50   and pre-transaction hooks
+    installing/removing       0.50 - 0.85   by the "(i/n)" counter
+    post-transaction hooks    0.85 - 1.00   by the "(i/n)" counter
+
+It also coalesces the updates so the UI redraws at a fixed frame rate
+instead of once per output line.
+"""
+import re
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from gi.repository import GLib
+
+# Progress slices of the transaction phases
+PHASE_RANGES = {
+    "prepare": (0.0, 0.05),
+    "download": (0.05, 0.45),
+    "check": (0.45, 0.5),
+    "commit": (0.5, 0.85),
+    "hooks": (0.85, 1.0)
+}
+
+# Checks pacman runs between the download and the commit, in order
+_CHECKS = (
+    "checking keyring", "checking keys in keyring", "checking package integrity",
+    "loading package files", "checking for file conflicts", "checking available disk space"
+)
+
+_COMMIT_ACTIONS = ("installing", "upgrading", "reinstalling", "downgrading", "removing")
+
+_PACKAGES = re.compile(r"^Packages? \((\d+)\)")
+# Printed per file when the output is not a terminal, e.g. " nvidia-utils-550.78-1-x86_64 downloading..."
+_DOWNLOADING = re.compile(r"^(?:\S+\s+downloading\.\.\.|downloading\s+\S+)")
+_COUNTER = re.compile(r"^\(\s*(\d+)/(\d+)\)\s+(.*)$")
+
+# Redraws per second of a coalesced progress
+DEFAULT_FPS = 15
+
+
+class PacmanProgress:
+    """Progress of one pacman transaction, estimated from its output."""
+
+    def __init__(self) -> None:
+        """Start at the dependency resolution phase."""
+        self.phase = "prepare"
+        self.fraction = 0.0
+        self.message = ""
+        self._total_packages = 0
+        self._downloaded = 0
+
+    def _advance(self, phase: str, position: float = 0.0) -> None:
+        """Move to a position (0-1) inside a phase; the fraction never goes back."""
+        self.phase = phase
+        start, end = PHASE_RANGES[phase]
+        self.fraction = max(self.fraction, start + (end - start) * min(max(position, 0.0), 1.0))
+
+    def feed(self, line: str) -> bool:
+        """
+        Account for one output line.
+
+        Args:
+            line: Line of pacman output, as printed with LC_ALL=C.
+
+        Returns:
+            True when the line changed the fraction or the message.
+        """
+        line = line.strip()
+        if not line:
+            return False
+        before = (self.fraction, self.message)
+        counter = _COUNTER.match(line)
+        text = counter.group(3) if counter else line
+        lowered = text.lower()
+
+        packages = _PACKAGES.match(line)
+        if packages:
+            self._total_packages = int(packages.group(1))
+            self._advance("prepare", 1.0)
+        elif lowered.startswith(("resolving dependencies", "looking for conflicting")):
+            self._advance("prepare", 0.5)
+        elif lowered.startswith(":: retrieving packages"):
+            self._advance("download")
+        elif lowered.startswith(":: running pre-transaction hooks"):
+            self._advance("check", 0.9)
+        elif lowered.startswith(":: processing package changes"):
+            self._advance("commit")
+        elif lowered.startswith(":: running post-transaction hooks"):
+            self._advance("hooks")
+        elif counter and text.startswith(_COMMIT_ACTIONS):
+            # Hook descriptions are capitalized ("Removing DKMS modules"), package actions are not.
+            # The "(i/n)" line is printed when the package starts, so it counts as half done
+            self._advance("commit", (int(counter.group(1)) - 0.5) / max(int(counter.group(2)), 1))
+        elif counter and self.phase == "hooks":
+            self._advance("hooks", (int(counter.group(1)) - 0.5) / max(int(counter.group(2)), 1))
+        elif lowered.startswith(_CHECKS):
+            index = next(i for i, check in enumerate(_CHECKS) if lowered.startswith(check))
+            self._advance("check", index / len(_CHECKS))
+        elif self.phase in ("prepare", "download") and _DOWNLOADING.match(line):
+            self._downloaded += 1
+            total = self._total_packages if self._total_packages >= self._downloaded else self._downloaded + 1
+            self._advance("download", self._downloaded / total)
+
+        self.message = line
+        return (self.fraction, self.message) != before
+
+
+class CoalescedProgress:
+    """
+    Hands the latest progress to a UI callback at a fixed frame rate.
+
+    update() can be called from any thread as often as lines arrive; the
+    callback runs on the GTK main loop only when a new value is waiting.
+    """
+
+    def __init__(self, callback: Callable[..., Any], fps: int = DEFAULT_FPS) -> None:
+        """
+        Args:
+            callback: Called on the main loop with the arguments of the last update().
+            fps: Maximum number of calls per second.
+        """
+        self._callback = callback
+        self._interval = max(1, int(1000 / fps))
+        self._lock = threading.Lock()
+        self._pending: Optional[Tuple[Any, ...]] = None
+        self._source_id = 0
+
+    def start(self) -> None:
+        """Start delivering updates; call from the main loop."""
+        if not self._source_id:
+            self._source_id = GLib.timeout_add(self._interval, self._on_tick)
+
+    def update(self, *args: Any) -> None:
+        """Store the latest progress, replacing any value not yet delivered."""
+        with self._lock:
+            self._pending = args
+
+    def _on_tick(self) -> bool:
+        """Deliver the waiting value, if any."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._callback(*pending)
+        return True
+
+    def stop(self) -> None:
+        """Deliver the last value and stop; call from the main loop."""
+        if self._source_id:
+            GLib.source_remove(self._source_id)
+            self._source_id = 0
+        self._on_tick()
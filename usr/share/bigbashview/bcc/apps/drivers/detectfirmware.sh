@@ -37,6 +37,9 @@ _VERSION_="1.0.0-20230726"
 LIBRARY=${LIBRARY:-'/usr/share/bigbashview/bcc/shell'}
 [[ -f "${LIBRARY}/bcclib.sh" ]] && source "${LIBRARY}/bcclib.sh"
 
+# Snapshot compartilhado do mhwd (driver_installer/mhwd_adapter.py)
+MHWD_ADAPTER="/usr/share/bigbashview/bcc/apps/drivers/driver_installer/mhwd_adapter.py"
+
 function sh_config {
 	#Translation
 	export TEXTDOMAINDIR="/usr/share/locale"
@@ -133,15 +136,19 @@ EOF
 function sh_init {
 	# MHWD import info OPEN, used to video drivers
 	###################################
+	# One shared mhwd snapshot instead of running mhwd -la, -l and -li here
+	# Columns: name version free type installed compatible classes
+	MHWD_CONFIGS="$(python3 "$MHWD_ADAPTER" tsv)"
+
 	# If module is proprietary show false
 	# Result example: video-nvidia-470xx false
-	VIDEO_DRIVER_SHOW_ALL_AND_IF_IS_FREE="$(mhwd -la | awk '{ print $1 " " $3 }' | grep -i video-)"
+	VIDEO_DRIVER_SHOW_ALL_AND_IF_IS_FREE="$(awk -F'\t' '{ print $1 " " $3 }' <<< "$MHWD_CONFIGS" | grep -i video-)"
 
 	# Show compatible with this hardware
-	VIDEO_DRIVER_COMPATIBLE_WITH_THIS_HARDWARE="$(mhwd -l | awk '{ print $1 }' | grep -i video-)"
+	VIDEO_DRIVER_COMPATIBLE_WITH_THIS_HARDWARE="$(awk -F'\t' '$6 == "true" { print $1 }' <<< "$MHWD_CONFIGS" | grep -i video-)"
 
 	# Show if installed
-	VIDEO_DRIVER_ENABLED_LIST="$(mhwd -li | awk '{ print $1 }' | grep -i video-)"
+	VIDEO_DRIVER_ENABLED_LIST="$(awk -F'\t' '$5 == "true" { print $1 }' <<< "$MHWD_CONFIGS" | grep -i video-)"
 
 	# Show if nvidia driver is enabled
 	if [[ "$VIDEO_DRIVER_ENABLED_LIST" =~ [nN]vidia ]]; then
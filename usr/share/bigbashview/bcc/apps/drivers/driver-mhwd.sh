@@ -41,6 +41,9 @@ LIBRARY=${LIBRARY:-'/usr/share/bigbashview/bcc/shell'}
 [[ -f "${LIBRARY}/bcclib.sh" ]] && source "${LIBRARY}/bcclib.sh"
 [[ -f "${LIBRARY}/bstrlib.sh" ]] && source "${LIBRARY}/bstrlib.sh"
 
+# Snapshot compartilhado do mhwd (driver_installer/mhwd_adapter.py)
+MHWD_ADAPTER="/usr/share/bigbashview/bcc/apps/drivers/driver_installer/mhwd_adapter.py"
+
 function sh_config {
 	#Translation
 	export TEXTDOMAINDIR="/usr/share/locale"
@@ -126,15 +129,19 @@ function sh_main {
 	# MHWD import info OPEN, used to video drivers
 	##############################################
 
+	# One shared mhwd snapshot instead of running mhwd -la, -l and -li here
+	# Columns: name version free type installed compatible classes
+	MHWD_CONFIGS="$(python3 "$MHWD_ADAPTER" tsv)"
+
 	# If module is proprietary show false
 	# Result example: video-nvidia-470xx false
-	VIDEO_DRIVER_SHOW_ALL_AND_IF_IS_FREE="$(mhwd -la | awk '{ print $1 " " $3 }' | grep -e video- -e network-)"
+	VIDEO_DRIVER_SHOW_ALL_AND_IF_IS_FREE="$(awk -F'\t' '{ print $1 " " $3 }' <<< "$MHWD_CONFIGS" | grep -e video- -e network-)"
 
 	# Show compatible with this hardware
-	VIDEO_DRIVER_COMPATIBLE_WITH_THIS_HARDWARE="$(mhwd -l | awk '{ print $1 }' | grep -e video- -e network-)"
+	VIDEO_DRIVER_COMPATIBLE_WITH_THIS_HARDWARE="$(awk -F'\t' '$6 == "true" { print $1 }' <<< "$MHWD_CONFIGS" | grep -e video- -e network-)"
 
 	# Show if installed
-	VIDEO_DRIVER_ENABLED_LIST="$(mhwd -li | awk '{ print $1 }' | grep -e video- -e network-)"
+	VIDEO_DRIVER_ENABLED_LIST="$(awk -F'\t' '$5 == "true" { print $1 }' <<< "$MHWD_CONFIGS" | grep -e video- -e network-)"
 
 	# Show if nvidia driver is enabled
 	if [ "$(echo "$VIDEO_DRIVER_ENABLED_LIST" | grep -i nvidia)" != "" ]; then
@@ -11,13 +11,22 @@ import json
 import os
 import threading
 import shutil
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, Adw, GLib, Gio, GObject, Pango
 
+from common.command_runner import get_command_runner
+from common.package_state import get_package_state
+from common.pacman_progress import CoalescedProgress
+from hardware_detector.detector import detect_hardware_drivers
+from driver_installer import driver_lister, operation_queue, scan_cache
+from driver_installer.search_index import SearchIndex
+from driver_installer.driver_record import DriverRecord, DriverStore
+
 # Get the absolute path to the current script's directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Get parent directory for scripts (bcc/apps/drivers)
@@ -32,6 +41,7 @@ OPERATION_TIMEOUT = 300  # 5 minutes for package operations
 DRIVERS_SCRIPT = os.path.join(PARENT_DIR, "list_drivers.sh")
 DRIVERS_JSON_OUTPUT = "/tmp/drivers_list.json"
 HARDWARE_DETECT_SCRIPT = os.path.join(PARENT_DIR, "hardware_detect.sh")
+SCAN_CACHE_NAME = "installer"
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -54,6 +64,75 @@ logger.info(f"Hardware detect script path: {HARDWARE_DETECT_SCRIPT}")
 logger.info(f"Drivers script exists: {os.path.exists(DRIVERS_SCRIPT)}")
 logger.info(f"Hardware detect script exists: {os.path.exists(HARDWARE_DETECT_SCRIPT)}")
 
+# Category labels mapping
+CATEGORY_LABELS = {
+    "gpu": "Placa de vídeo",
+    "wifi": "WiFi",
+    "ethernet": "Rede cabeada",
+    "bluetooth": "Bluetooth",
+    "printer": "Impressora",
+    "printer3d": "Impressora 3D",
+    "scanner": "Scanner",
+    "dvb": "TV Digital",
+    "webcam": "Webcam",
+    "touchscreen": "Touchscreen",
+    "sound": "Som",
+    "firmware": "Firmware",
+    "unknown": "Outros"
+}
+
+# Category icon mapping
+CATEGORY_ICONS = {
+    "Placa de vídeo": "video-display-symbolic",
+    "WiFi": "network-wireless-symbolic",
+    "Rede cabeada": "network-wired-symbolic",
+    "Bluetooth": "bluetooth-symbolic",
+    "Impressora": "printer-symbolic",
+    "Impressora 3D": "printer-symbolic",
+    "Scanner": "scanner-symbolic",
+    "TV Digital": "tv-symbolic",
+    "Webcam": "camera-web-symbolic",
+    "Touchscreen": "input-touchpad-symbolic",
+    "Som": "audio-card-symbolic",
+    "Firmware": "application-x-firmware-symbolic",
+    "Outros": "package-x-generic-symbolic"
+}
+
+# Category order (priority-based like hardware_info_page)
+CATEGORY_ORDER = {
+    "Placa de vídeo": 10,
+    "Som": 20,
+    "WiFi": 30,
+    "Rede cabeada": 40,
+    "Bluetooth": 50,
+    "Impressora": 60,
+    "Scanner": 70,
+    "Webcam": 80,
+    "Touchscreen": 90,
+    "TV Digital": 100,
+    "Firmware": 110,
+    "Outros": 120
+}
+
+# Streamed records are handed to the UI in batches of this size, or after this interval
+STREAM_BATCH_SIZE = 50
+STREAM_BATCH_INTERVAL = 0.1  # seconds
+
+# Delay after the last keystroke before the search runs
+SEARCH_DEBOUNCE_MS = 150
+
+
+def _category_label(category_key: str) -> str:
+    """Get the display label of a category key."""
+    return CATEGORY_LABELS.get(category_key, category_key.capitalize())
+
+
+def _category_sort_key(category_key: str):
+    """Sort key placing categories by priority, then by label."""
+    label = _category_label(category_key)
+    return (CATEGORY_ORDER.get(label, 1000), label)
+
+
 class CategoryItem(GObject.Object):
     """Category item for the sidebar."""
     def __init__(self, key: str, label: str, count: int = 0):
@@ -62,6 +141,14 @@ class CategoryItem(GObject.Object):
         self.label = label
         self.count = count
 
+class DriverItem(GObject.Object):
+    """Driver record wrapped for the driver list model."""
+    def __init__(self, driver: Dict[str, Any], kind: str = "catalog", category: str = ""):
+        super().__init__()
+        self.driver = driver
+        self.kind = kind  # "catalog" or "detected"
+        self.category = category
+
 class CategoryRow(Gtk.ListBoxRow):
     def __init__(self, category_id: str, title: str, icon_name: str):
         super().__init__()
@@ -75,11 +162,15 @@ class CategoryRow(Gtk.ListBoxRow):
         if icon_name:
             icon = Gtk.Image.new_from_icon_name(icon_name)
             box.append(icon)
-        label = Gtk.Label(label=title)
-        label.set_xalign(0)
-        box.append(label)
+        self.title_label = Gtk.Label(label=title)
+        self.title_label.set_xalign(0)
+        box.append(self.title_label)
         self.set_child(box)
 
+    def set_title(self, title: str):
+        """Update the row title, e.g. when the driver count changes."""
+        self.title_label.set_label(title)
+
 class DriverInstallerPage(Gtk.Box):
     """Modern Driver Installer page with NavigationSplitView.
     
@@ -100,14 +191,28 @@ class DriverInstallerPage(Gtk.Box):
     
     def _initialize_properties(self):
         """Initialize all class properties."""
-        self.drivers_data = {}  # Dict[category_key, List[driver]]
-        self.detected_drivers_data = []  # List of drivers detected by hardware_detect.sh
+        self.drivers_data = DriverStore()  # Catalog drivers with per-category views
+        self.detected_drivers_data = []  # List of DriverRecord detected on this hardware
         self.current_category = "all"
         self.selected_row = None
-        self._operation_lock = threading.Lock()
+        self._operation_lock = threading.Lock()  # Held while a batch of operations runs
+        self.operation_queue = operation_queue.OperationQueue()
+        self._operation_progress = None  # CoalescedProgress of the running batch
+        self._hardware_fingerprint = None  # Hardware the loaded drivers were listed for
+        self._principal_device_rows = {}  # Dict[device_id, (expander, badge, package rows, drivers)]
+        self._install_recommended_button = None  # "Instalar todos" of the Principal view
         self.pulse_id = 0
         self.error_box_container = None
-        self.search_results_group = None # For displaying search results
+        self.category_rows = {}  # Dict[category_key, CategoryRow]
+        self.search_index = SearchIndex()  # Rebuilt on every data load
+        self._search_timeout_id = 0
+        # Driver list model: store -> category/search filter -> sorter -> ListView
+        self.driver_store = Gio.ListStore.new(DriverItem)
+        self.driver_filter = None
+        self.driver_sorter = None
+        self._list_mode = "category"  # "category" or "search"
+        self._list_category = None
+        self._search_scores = {}  # Dict[id(driver), score] of the current search
         # UI components
         self.split_view = None
         self.category_list = None
@@ -115,6 +220,7 @@ class DriverInstallerPage(Gtk.Box):
         self.content_box = None
         self.content_view = None
         self.progress_bar = None
+        self.operation_bar = None
         self.toast_overlay = Adw.ToastOverlay()  # Initialize here to ensure it exists
         self.detected_drivers_group = None  # Group for detected drivers
         self.category_list = None
@@ -183,6 +289,15 @@ class DriverInstallerPage(Gtk.Box):
         separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
         main_box.append(separator)
         
+        # Progress of the queued installs and removals
+        self.operation_bar = Gtk.ProgressBar()
+        self.operation_bar.set_show_text(True)
+        self.operation_bar.set_margin_top(6)
+        self.operation_bar.set_margin_start(12)
+        self.operation_bar.set_margin_end(12)
+        self.operation_bar.set_visible(False)
+        main_box.append(self.operation_bar)
+        
         # Progress bar (same as hardware_info_page)
         self.progress_bar = Gtk.ProgressBar()
         self.progress_bar.set_halign(Gtk.Align.CENTER)
@@ -231,11 +346,17 @@ class DriverInstallerPage(Gtk.Box):
         self.detected_drivers_group.set_title("Drivers Detectados")
         self.detected_drivers_group.set_description("Drivers recomendados com base no hardware detectado")
         self.detected_drivers_group.set_visible(False)  # Initially hidden until we have data
+        self.detected_drivers_group.set_header_suffix(self._create_install_recommended_button())
         self.content_box.append(self.detected_drivers_group)
         
         clamp.set_child(self.content_box)
         self.content_scroll.set_child(clamp)
-        self.content_view.set_child(self.content_scroll)
+        
+        # Categories and search results are shown in a virtualized list
+        self.content_stack = Gtk.Stack()
+        self.content_stack.add_named(self.content_scroll, "page")
+        self.content_stack.add_named(self._create_driver_list(), "list")
+        self.content_view.set_child(self.content_stack)
         self.split_view.set_sidebar(sidebar)
         self.split_view.set_content(self.content_view)
         main_box.append(self.split_view)
@@ -249,6 +370,126 @@ class DriverInstallerPage(Gtk.Box):
         toast.set_timeout(2)
         self.toast_overlay.add_toast(toast)
 
+    def _create_driver_list(self) -> Gtk.Widget:
+        """Create the driver list view with its header."""
+        list_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        
+        # Header with icon, title and driver count
+        header_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        header_box.set_margin_top(24)
+        header_box.set_margin_bottom(16)
+        header_box.set_margin_start(34)
+        header_box.set_margin_end(34)
+        
+        self.list_header_icon = Gtk.Image.new_from_icon_name("package-x-generic-symbolic")
+        self.list_header_icon.set_pixel_size(24)
+        header_box.append(self.list_header_icon)
+        
+        header_text = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
+        header_text.set_hexpand(True)
+        self.list_header_title = Gtk.Label()
+        self.list_header_title.add_css_class("heading")
+        self.list_header_title.set_xalign(0)
+        header_text.append(self.list_header_title)
+        self.list_header_subtitle = Gtk.Label()
+        self.list_header_subtitle.add_css_class("dim-label")
+        self.list_header_subtitle.set_xalign(0)
+        header_text.append(self.list_header_subtitle)
+        header_box.append(header_text)
+        
+        # Clear button, only shown for search results
+        self.list_clear_button = Gtk.Button()
+        self.list_clear_button.set_icon_name("edit-clear-symbolic")
+        self.list_clear_button.set_tooltip_text("Limpar busca")
+        self.list_clear_button.set_valign(Gtk.Align.CENTER)
+        self.list_clear_button.connect("clicked", lambda _: self._clear_search())
+        header_box.append(self.list_clear_button)
+        
+        list_box.append(header_box)
+        
+        # Filtering and sorting happen in the models, rows are only
+        # created for the items scrolled into view
+        self.driver_filter = Gtk.CustomFilter.new(self._driver_filter_func)
+        self.driver_sorter = Gtk.CustomSorter.new(self._driver_sort_func)
+        filter_model = Gtk.FilterListModel.new(self.driver_store, self.driver_filter)
+        sort_model = Gtk.SortListModel.new(filter_model, self.driver_sorter)
+        
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_driver_item_setup)
+        factory.connect("bind", self._on_driver_item_bind)
+        factory.connect("unbind", self._on_driver_item_unbind)
+        
+        self.driver_list_view = Gtk.ListView.new(Gtk.NoSelection.new(sort_model), factory)
+        self.driver_list_view.add_css_class("card")
+        self.driver_list_view.set_margin_bottom(24)
+        self.driver_list_view.set_margin_start(18)
+        self.driver_list_view.set_margin_end(18)
+        
+        clamp = Adw.ClampScrollable()
+        clamp.set_maximum_size(800)
+        clamp.set_child(self.driver_list_view)
+        
+        self.driver_list_scroll = Gtk.ScrolledWindow()
+        self.driver_list_scroll.set_vexpand(True)
+        self.driver_list_scroll.set_child(clamp)
+        list_box.append(self.driver_list_scroll)
+        
+        return list_box
+    
+    def _driver_filter_func(self, item: DriverItem, *args) -> bool:
+        """Decide whether a driver item is shown in the current list."""
+        if self._list_mode == "search":
+            return id(item.driver) in self._search_scores
+        return item.kind == "catalog" and item.category == self._list_category
+    
+    def _driver_sort_func(self, a: DriverItem, b: DriverItem, *args) -> int:
+        """Order search results by score, categories by status then name."""
+        if self._list_mode == "search":
+            key_a = (-self._search_scores.get(id(a.driver), 0), a.driver.get('name', '').lower())
+            key_b = (-self._search_scores.get(id(b.driver), 0), b.driver.get('name', '').lower())
+        else:
+            key_a = (not a.driver.get('installed', False), a.driver.get('name', ''))
+            key_b = (not b.driver.get('installed', False), b.driver.get('name', ''))
+        return (key_a > key_b) - (key_a < key_b)
+    
+    def _on_driver_item_setup(self, factory, list_item):
+        """Prepare a list item; its row is created on bind."""
+        list_item.set_activatable(False)
+        list_item.set_selectable(False)
+    
+    def _on_driver_item_bind(self, factory, list_item):
+        """Create the row of the driver scrolled into view."""
+        item = list_item.get_item()
+        try:
+            if item.kind == "detected":
+                row = self._create_detected_driver_row(item.driver)
+            else:
+                row = self._create_driver_action_row(item.driver)
+        except Exception as e:
+            logger.error(f"Error creating driver row: {e}", exc_info=True)
+            row = None
+        list_item.set_child(row)
+    
+    def _on_driver_item_unbind(self, factory, list_item):
+        """Release the row of a driver scrolled out of view."""
+        list_item.set_child(None)
+    
+    def _rebuild_driver_store(self) -> None:
+        """Replace the driver list model contents with the loaded drivers."""
+        items = [DriverItem(driver, "detected") for driver in self.detected_drivers_data]
+        items.extend(DriverItem(driver, "catalog", driver.get('category') or 'unknown')
+                     for driver in self.drivers_data)
+        self.driver_store.splice(0, self.driver_store.get_n_items(), items)
+    
+    def _apply_list_filter(self) -> None:
+        """Re-run the list filter and sorter after the mode changed."""
+        self.driver_filter.changed(Gtk.FilterChange.DIFFERENT)
+        self.driver_sorter.changed(Gtk.SorterChange.DIFFERENT)
+    
+    def _show_content_page(self) -> None:
+        """Show the free-form content page (principal view, empty states)."""
+        self.content_stack.set_visible_child_name("page")
+    
     def _pulse_progress_bar(self) -> bool:
         """Pulse progress bar animation (same as hardware_info_page)."""
         if self.progress_bar.get_visible():
@@ -257,7 +498,7 @@ class DriverInstallerPage(Gtk.Box):
         self.pulse_id = 0
         return False
 
-    def _fetch_drivers_data(self) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    def _fetch_drivers_data(self) -> Optional[DriverStore]:
         """Fetch drivers data using the bash script."""
         try:
             print("Fetching drivers data...")
@@ -277,13 +518,7 @@ class DriverInstallerPage(Gtk.Box):
             
             # Run the script with explicit shell=True for better compatibility
             print(f"Executing: bash {script_path}")
-            result = subprocess.run(
-                ["bash", script_path],
-                capture_output=True,
-                text=True,
-                timeout=LOADING_TIMEOUT,
-                check=False
-            )
+            result = get_command_runner().run_sync(["bash", script_path], text=True, timeout=LOADING_TIMEOUT)
             
             print(f"Script executed with return code: {result.returncode}")
             if result.stdout:
@@ -314,16 +549,20 @@ class DriverInstallerPage(Gtk.Box):
                 logger.warning("No drivers found in the JSON file")
                 print("No drivers found in the JSON file")
             
-            # Group by category
-            grouped = {}
+            # Installed flags come from the shared package state (one local DB read)
+            installed_packages = get_package_state().installed_packages()
+            
+            # Store the records; categories are offset views, not copies
+            grouped = DriverStore()
             for driver in drivers_list:
                 if not isinstance(driver, dict):
                     continue
-                    
-                category = driver.get('category', 'unknown')
-                if category not in grouped:
-                    grouped[category] = []
-                grouped[category].append(driver)
+                
+                package = driver.get('package')
+                if package:
+                    driver['installed'] = package in installed_packages
+                
+                grouped.add(driver)
             
             print(f"Loaded {len(drivers_list)} drivers in {len(grouped)} categories")
             logger.info(f"Loaded {len(drivers_list)} drivers in {len(grouped)} categories")
@@ -342,8 +581,91 @@ class DriverInstallerPage(Gtk.Box):
             print(f"Error fetching drivers: {e}")
             return None
 
-    def _fetch_detected_hardware_drivers(self) -> List[Dict[str, Any]]:
+    def _stream_drivers_data(self, on_batch) -> Optional[DriverStore]:
+        """Fetch drivers data from the bash script in stream mode.
+        
+        The script prints one JSON object per line as each source is read, so
+        records reach the UI without waiting for the slowest source.
+        
+        Args:
+            on_batch: Called from the command runner thread with each batch of
+                new records.
+        
+        Returns:
+            All records grouped by category, or None if the script could not run.
+        """
+        script_path = self._ensure_drivers_script()
+        installed_packages = get_package_state().installed_packages()
+        grouped = DriverStore()
+        batch = []
+        last_flush = time.monotonic()
+        
+        def on_line(line: str) -> None:
+            nonlocal batch, last_flush
+            line = line.strip()
+            if not line.startswith('{'):
+                return
+            try:
+                driver = DriverRecord.from_dict(json.loads(line))
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Skipping invalid streamed record: {line[:100]}")
+                return
+            
+            package = driver.get('package')
+            if package:
+                driver['installed'] = package in installed_packages
+            
+            grouped.add(driver)
+            batch.append(driver)
+            
+            now = time.monotonic()
+            if len(batch) >= STREAM_BATCH_SIZE or now - last_flush >= STREAM_BATCH_INTERVAL:
+                on_batch(batch)
+                batch = []
+                last_flush = now
+        
+        runner = get_command_runner()
+        try:
+            # The runner kills the script if it hangs
+            returncode = runner.submit(
+                runner.stream(["bash", script_path, "--stream"], on_stdout=on_line, timeout=LOADING_TIMEOUT)
+            ).result()
+        except subprocess.TimeoutExpired:
+            logger.error(f"Drivers script timed out after {LOADING_TIMEOUT}s")
+            returncode = None
+        except OSError as e:
+            logger.error(f"Error starting drivers script: {e}")
+            return None
+        
+        if batch:
+            on_batch(batch)
+        
+        if returncode != 0:
+            logger.error(f"Drivers script exited with code {returncode}")
+            if not grouped:
+                return None
+        
+        logger.info(f"Streamed {len(grouped)} drivers in {len(grouped.keys())} categories")
+        return grouped
+
+    def _fetch_detected_hardware_drivers(self) -> List[DriverRecord]:
         """Fetch drivers recommended by hardware detection."""
+        try:
+            logger.info("Detecting hardware drivers in-process...")
+            detected_drivers = detect_hardware_drivers()
+        except Exception as e:
+            logger.error(f"Native hardware detection failed, using script: {e}", exc_info=True)
+            return self._fetch_detected_hardware_drivers_from_script()
+        
+        valid_drivers = [
+            DriverRecord.from_dict(driver) for driver in detected_drivers
+            if driver.get('name') and driver.get('package')
+        ]
+        logger.info(f"Loaded {len(valid_drivers)} valid detected hardware drivers")
+        return valid_drivers
+
+    def _fetch_detected_hardware_drivers_from_script(self) -> List[DriverRecord]:
+        """Fetch drivers recommended by the legacy hardware_detect.sh script."""
         try:
             logger.info("Fetching detected hardware drivers...")
             
@@ -366,13 +688,7 @@ class DriverInstallerPage(Gtk.Box):
             if setup_script:
                 try:
                     logger.info(f"Running setup script: {setup_script}")
-                    setup_result = subprocess.run(
-                        ["bash", setup_script], 
-                        check=True, 
-                        timeout=5,
-                        capture_output=True,
-                        text=True
-                    )
+                    setup_result = get_command_runner().run_sync(["bash", setup_script], check=True, timeout=5, text=True)
                     logger.info(f"Setup script output: {setup_result.stdout}")
                     if setup_result.stderr:
                         logger.warning(f"Setup script stderr: {setup_result.stderr}")
@@ -429,13 +745,7 @@ class DriverInstallerPage(Gtk.Box):
             
             # Run the hardware detection script
             try:
-                result = subprocess.run(
-                    ["bash", hardware_detect_script],
-                    capture_output=True,
-                    text=True,
-                    timeout=hardware_detect_timeout,
-                    check=False
-                )
+                result = get_command_runner().run_sync(["bash", hardware_detect_script], text=True, timeout=hardware_detect_timeout)
                 
                 logger.info(f"Hardware script executed with return code: {result.returncode}")
                 if result.stdout:
@@ -479,7 +789,7 @@ class DriverInstallerPage(Gtk.Box):
                 if not driver.get('name') or not driver.get('package'):
                     continue
                     
-                valid_drivers.append(driver)
+                valid_drivers.append(DriverRecord.from_dict(driver))
             
             logger.info(f"Loaded {len(valid_drivers)} valid detected hardware drivers")
             return valid_drivers
@@ -563,7 +873,7 @@ echo "[]"
         os.chmod(script_path, 0o755)
         logger.info(f"Created minimal fallback script at {script_path}")
 
-    def _on_drivers_loaded(self, drivers_data: Optional[Dict[str, List[Dict[str, Any]]]], detected_drivers: List[Dict[str, Any]]):
+    def _on_drivers_loaded(self, drivers_data: Optional[DriverStore], detected_drivers: List[DriverRecord]):
         """Handle successful driver loading."""
         if drivers_data is None and not detected_drivers:
             self._show_error_message("Falha ao carregar dados dos drivers")
@@ -572,22 +882,31 @@ echo "[]"
         if drivers_data:
             self.drivers_data = drivers_data
             # Log driver data for debugging
-            total_drivers = sum(len(drivers) for drivers in drivers_data.values())
-            print(f"Drivers loaded successfully: {len(drivers_data)} categories with {total_drivers} total drivers")
+            print(f"Drivers loaded successfully: {len(drivers_data.keys())} categories with {len(drivers_data)} total drivers")
             
             # Log each category and its driver count
             for category, drivers in drivers_data.items():
                 print(f"Category '{category}' has {len(drivers)} drivers")
         else:
-            self.drivers_data = {}
+            self.drivers_data = DriverStore()
             print("No categorized drivers data loaded")
         
         self.detected_drivers_data = detected_drivers
         print(f"Detected drivers loaded: {len(detected_drivers)}")
         
+        self._rebuild_search_index()
+        self._rebuild_driver_store()
+        
         # Simply call update UI with data - no need to clear here, that's done in _update_ui_with_data
         self._update_ui_with_data()
     
+    def _rebuild_search_index(self) -> None:
+        """Index the loaded drivers for searching."""
+        self.search_index = SearchIndex()
+        self.search_index.add(self.detected_drivers_data, "detected")
+        for drivers in self.drivers_data.values():
+            self.search_index.add(drivers, "catalog")
+    
     def _update_ui_with_data(self) -> None:
         """Update UI with loaded data (same pattern as hardware_info_page)."""
         if self.pulse_id > 0:
@@ -613,83 +932,11 @@ echo "[]"
         principal_row.add_css_class("sidebar-header-row")  # Optional: add custom styling
         self.category_list.append(principal_row)
         
-        # Category icon mapping
-        category_icon_mapping = {
-            "Placa de vídeo": "video-display-symbolic",
-            "WiFi": "network-wireless-symbolic",
-            "Rede cabeada": "network-wired-symbolic",
-            "Bluetooth": "bluetooth-symbolic",
-            "Impressora": "printer-symbolic",
-            "Impressora 3D": "printer-symbolic",
-            "Scanner": "scanner-symbolic",
-            "TV Digital": "tv-symbolic",
-            "Webcam": "camera-web-symbolic",
-            "Touchscreen": "input-touchpad-symbolic",
-            "Som": "audio-card-symbolic",
-            "Firmware": "application-x-firmware-symbolic",
-            "Outros": "package-x-generic-symbolic"
-        }
-        
-        # Category labels mapping
-        category_labels = {
-            "gpu": "Placa de vídeo",
-            "wifi": "WiFi",
-            "ethernet": "Rede cabeada",
-            "bluetooth": "Bluetooth",
-            "printer": "Impressora",
-            "printer3d": "Impressora 3D",
-            "scanner": "Scanner",
-            "dvb": "TV Digital",
-            "webcam": "Webcam",
-            "touchscreen": "Touchscreen",
-            "sound": "Som",
-            "firmware": "Firmware",
-            "unknown": "Outros"
-        }
-        
-        # Category order (priority-based like hardware_info_page)
-        category_order = {
-            "Placa de vídeo": 10,
-            "Som": 20,
-            "WiFi": 30,
-            "Rede cabeada": 40,
-            "Bluetooth": 50,
-            "Impressora": 60,
-            "Scanner": 70,
-            "Webcam": 80,
-            "Touchscreen": 90,
-            "TV Digital": 100,
-            "Firmware": 110,
-            "Outros": 120
-        }
-        
-        # Build categories list
-        categories_to_show = []
-        for category_key in sorted(self.drivers_data.keys()):
-            # Get drivers for this category
-            drivers = self.drivers_data.get(category_key, [])
-            if not drivers:
-                continue
-                
-            # Get category label from mapping or fallback to capitalized key
-            label = category_labels.get(category_key, category_key.capitalize())
-            
-            # Count number of drivers in this category
-            count = len(drivers)
-            
-            # Skip empty categories
-            if count > 0:
-                categories_to_show.append((label, category_key, count))
-        
-        # Sort by priority
-        sorted_categories = sorted(categories_to_show, 
-                                 key=lambda x: (category_order.get(x[0], 1000), x[0]))
-        
-        # Add category rows
-        for label, category_key, count in sorted_categories:
-            icon_name = category_icon_mapping.get(label, "package-x-generic-symbolic")
-            row = CategoryRow(category_key, f"{label} ({count})", icon_name)
-            self.category_list.append(row)
+        # Add category rows, sorted by priority (like hardware_info_page)
+        self.category_rows = {}
+        for category_key in sorted(self.drivers_data.keys(), key=_category_sort_key):
+            if self.drivers_data.get(category_key):
+                self._add_or_update_category_row(category_key)
         
         # Always select the Principal row by default, or fall back to first category
         if has_detected_drivers:
@@ -707,8 +954,64 @@ echo "[]"
         else:
             self._show_error_message("Nenhuma categoria de drivers pôde ser exibida.")
     
+    def _add_or_update_category_row(self, category_key: str):
+        """Add the sidebar row of a category, or refresh its driver count."""
+        label = _category_label(category_key)
+        title = f"{label} ({len(self.drivers_data.get(category_key, []))})"
+        
+        row = self.category_rows.get(category_key)
+        if row is not None:
+            row.set_title(title)
+            return
+        
+        row = CategoryRow(category_key, title, CATEGORY_ICONS.get(label, "package-x-generic-symbolic"))
+        # Principal is always first, the other categories follow their priority
+        sort_key = _category_sort_key(category_key)
+        position = 1 + sum(1 for key in self.category_rows if _category_sort_key(key) < sort_key)
+        self.category_list.insert(row, position)
+        self.category_rows[category_key] = row
+    
+    def _on_drivers_batch(self, batch: List[DriverRecord]) -> bool:
+        """Merge a batch of streamed records into the sidebar and current view."""
+        touched = set()
+        added = []
+        for driver in batch:
+            # The store skips duplicates of a record it already holds
+            before = len(self.drivers_data)
+            self.drivers_data.add(driver)
+            if len(self.drivers_data) > before:
+                added.append(driver)
+                touched.add(driver.get('category') or 'unknown')
+        self.search_index.add(added, "catalog")
+        self.driver_store.splice(
+            self.driver_store.get_n_items(), 0,
+            [DriverItem(driver, "catalog", driver.get('category') or 'unknown') for driver in added]
+        )
+        
+        for category in sorted(touched, key=_category_sort_key):
+            self._add_or_update_category_row(category)
+        
+        # Refresh the open category if it just received drivers
+        selected = self.category_list.get_selected_row()
+        if isinstance(selected, CategoryRow) and selected.category_id in touched:
+            self._populate_drivers_for_category(selected.category_id)
+        
+        return False
+    
+    def _on_drivers_stream_finished(self, drivers_data: Optional[DriverStore],
+                                    detected_drivers: List[DriverRecord]) -> bool:
+        """Handle the end of the streamed driver listing."""
+        if drivers_data is None and not detected_drivers:
+            self._show_error_message("Falha ao carregar dados dos drivers")
+            return False
+        
+        logger.info(f"Driver stream finished: {len(self.drivers_data)} drivers in {len(self.drivers_data.keys())} categories")
+        return False
+    
     def _rebuild_content_area(self):
         """Completely rebuild the content area to avoid widget issues."""
+        self._show_content_page()
+        
         # Remove all existing content
         while child := self.content_box.get_first_child():
             self.content_box.remove(child)
@@ -717,6 +1020,7 @@ echo "[]"
         self.detected_drivers_group = Adw.PreferencesGroup()
         self.detected_drivers_group.set_title("Drivers Detectados")
         self.detected_drivers_group.set_description("Drivers recomendados com base no hardware detectado")
+        self.detected_drivers_group.set_header_suffix(self._create_install_recommended_button())
         
         # Only show and populate if we have data
         if self.detected_drivers_data:
@@ -757,6 +1061,16 @@ echo "[]"
         
         return rows_added
     
+    def _create_install_recommended_button(self) -> Gtk.Button:
+        """Create the button that installs every recommended driver in one batch."""
+        button = Gtk.Button(label="Instalar todos")
+        button.set_tooltip_text("Instalar todos os drivers recomendados de uma vez")
+        button.set_valign(Gtk.Align.CENTER)
+        button.add_css_class("suggested-action")
+        button.connect("clicked", self._on_install_recommended_clicked)
+        button.set_visible(any(not d.get('installed', False) and d.get('package') for d in self.detected_drivers_data))
+        return button
+    
     def _create_detected_driver_row(self, driver: Dict[str, Any]) -> Optional[Adw.ActionRow]:
         """Create an action row for a detected driver."""
         try:
@@ -879,23 +1193,7 @@ echo "[]"
             return
         
         # Get category display name
-        category_labels = {
-            "gpu": "Placa de vídeo",
-            "wifi": "WiFi",
-            "ethernet": "Rede cabeada",
-            "bluetooth": "Bluetooth",
-            "printer": "Impressora",
-            "printer3d": "Impressora 3D",
-            "scanner": "Scanner",
-            "dvb": "TV Digital",
-            "webcam": "Webcam",
-            "touchscreen": "Touchscreen",
-            "sound": "Som",
-            "firmware": "Firmware",
-            "unknown": "Outros"
-        }
-        
-        category_display_name = category_labels.get(category_key, category_key.title())
+        category_display_name = CATEGORY_LABELS.get(category_key, category_key.title())
         self.content_view.set_title(category_display_name)
         self.current_category = category_key
         self._populate_drivers_for_category(category_key)
@@ -926,6 +1224,8 @@ echo "[]"
 
     def _populate_principal_view(self):
         """Populate the Principal view with detected drivers."""
+        self._show_content_page()
+        
         # Clear existing content
         while child := self.content_box.get_first_child():
             self.content_box.remove(child)
@@ -1015,6 +1315,9 @@ echo "[]"
         summary_group = Adw.PreferencesGroup()
         summary_group.set_title("Drivers por Dispositivo")
         summary_group.set_description(f"Total de {len(device_packages)} dispositivo(s) com {total_drivers} driver(s) disponível(is)")
+        self._install_recommended_button = self._create_install_recommended_button()
+        summary_group.set_header_suffix(self._install_recommended_button)
+        self._principal_device_rows = {}
         
         # Add each device group with its available packages
         for device_id, drivers in device_packages.items():
@@ -1058,69 +1361,74 @@ echo "[]"
             icon = Gtk.Image.new_from_icon_name(icon_name)
             device_row.add_prefix(icon)
             
-            # Count installed vs available packages
-            installed_packages = []
-            available_packages = []
-            for driver in drivers:
-                pkg_name = driver.get('package', 'unknown')
-                if driver.get('installed', False):
-                    installed_packages.append(pkg_name)
-                else:
-                    available_packages.append(pkg_name)
-            
-            # Add a badge showing package count
+            # Package count badge and one row per package, updated in place after operations
             package_badge = Gtk.Label()
-            if installed_packages:
-                package_badge.set_markup(f"<b>{len(installed_packages)}</b> instalado(s), <b>{len(available_packages)}</b> disponível(is)")
-            else:
-                package_badge.set_markup(f"<b>{len(drivers)}</b> pacote(s) disponível(is)")
             package_badge.set_margin_end(12)
             device_row.add_suffix(package_badge)
-            
-            # Add each package as a child row in the expander
-            for driver in drivers:
-                package_name = driver.get('package', 'unknown')
-                is_installed = driver.get('installed', False)
-                
-                # Create a row for the package
-                package_row = Adw.ActionRow()
-                package_row.set_title(package_name)
-                
-                # Add description if available
-                if driver.get('description'):
-                    package_row.set_subtitle(driver.get('description'))
-                
-                # Add status badge
-                if is_installed:
-                    status_badge = Gtk.Label(label="Instalado")
-                    status_badge.add_css_class("pill")
-                    status_badge.add_css_class("success")
-                    package_row.add_suffix(status_badge)
-                
-                # Add action button
-                if is_installed:
-                    action_btn = Gtk.Button()
-                    action_btn.set_icon_name("user-trash-symbolic")
-                    action_btn.set_tooltip_text(f"Remover o pacote {package_name}")
-                    action_btn.set_valign(Gtk.Align.CENTER)
-                    action_btn.connect("clicked", self._on_uninstall_detected_clicked, driver)
-                    package_row.add_suffix(action_btn)
-                else:
-                    action_btn = Gtk.Button()
-                    action_btn.set_icon_name("software-install-symbolic")
-                    action_btn.set_tooltip_text(f"Instalar o pacote {package_name}")
-                    action_btn.set_valign(Gtk.Align.CENTER)
-                    action_btn.connect("clicked", self._on_install_detected_clicked, driver)
-                    package_row.add_suffix(action_btn)
-                
-                # Add package row to expander
-                device_row.add_row(package_row)
+            self._principal_device_rows[device_id] = (device_row, package_badge, [], drivers)
+            self._update_principal_device_row(device_id)
             
             # Add the expander row to the group
             summary_group.add(device_row)
         
         self.content_box.append(summary_group)
 
+    def _update_principal_device_row(self, device_id: str):
+        """Render the package count badge and package rows of a device in the Principal view."""
+        device_row, package_badge, package_rows, drivers = self._principal_device_rows[device_id]
+        
+        # Count installed vs available packages
+        installed_packages = [d for d in drivers if d.get('installed', False)]
+        available_packages = [d for d in drivers if not d.get('installed', False)]
+        if installed_packages:
+            package_badge.set_markup(f"<b>{len(installed_packages)}</b> instalado(s), <b>{len(available_packages)}</b> disponível(is)")
+        else:
+            package_badge.set_markup(f"<b>{len(drivers)}</b> pacote(s) disponível(is)")
+        
+        for package_row in package_rows:
+            device_row.remove(package_row)
+        package_rows.clear()
+        
+        # Add each package as a child row in the expander
+        for driver in drivers:
+            package_name = driver.get('package', 'unknown')
+            is_installed = driver.get('installed', False)
+            
+            # Create a row for the package
+            package_row = Adw.ActionRow()
+            package_row.set_title(package_name)
+            
+            # Add description if available
+            if driver.get('description'):
+                package_row.set_subtitle(driver.get('description'))
+            
+            # Add status badge
+            if is_installed:
+                status_badge = Gtk.Label(label="Instalado")
+                status_badge.add_css_class("pill")
+                status_badge.add_css_class("success")
+                package_row.add_suffix(status_badge)
+            
+            # Add action button
+            if is_installed:
+                action_btn = Gtk.Button()
+                action_btn.set_icon_name("user-trash-symbolic")
+                action_btn.set_tooltip_text(f"Remover o pacote {package_name}")
+                action_btn.set_valign(Gtk.Align.CENTER)
+                action_btn.connect("clicked", self._on_uninstall_detected_clicked, driver)
+                package_row.add_suffix(action_btn)
+            else:
+                action_btn = Gtk.Button()
+                action_btn.set_icon_name("software-install-symbolic")
+                action_btn.set_tooltip_text(f"Instalar o pacote {package_name}")
+                action_btn.set_valign(Gtk.Align.CENTER)
+                action_btn.connect("clicked", self._on_install_detected_clicked, driver)
+                package_row.add_suffix(action_btn)
+            
+            # Add package row to expander
+            device_row.add_row(package_row)
+            package_rows.append(package_row)
+    
     def _on_search_toggled(self, button):
         """Handle search button toggle state."""
         is_active = button.get_active()
@@ -1139,65 +1447,6 @@ echo "[]"
         search_text = entry.get_text().lower()
         self._filter_drivers_by_search(search_text)
     
-    def _search_drivers_in_json(self, search_text: str) -> List[Dict[str, Any]]:
-        """Search directly in the drivers_list.json file without loading all data in memory.
-        
-        This is more efficient for large driver databases as it reads directly from the file.
-        
-        Args:
-            search_text: Text to search for in driver attributes
-            
-        Returns:
-            List of matching driver dictionaries
-        """
-        search_text = search_text.lower().strip()
-        if not search_text:
-            return []
-            
-        try:
-            # Check if JSON file exists
-            if not os.path.exists(DRIVERS_JSON_OUTPUT):
-                logger.error(f"JSON file not found at {DRIVERS_JSON_OUTPUT}")
-                return []
-                
-            logger.info(f"Searching for '{search_text}' in drivers JSON file")
-            
-            # Read JSON file and search
-            with open(DRIVERS_JSON_OUTPUT, 'r', encoding='utf-8') as f:
-                all_drivers = json.load(f)
-                
-            if not isinstance(all_drivers, list):
-                logger.error("Invalid JSON format: expected list")
-                return []
-                
-            # Filter drivers based on search text
-            matching_drivers = []
-            for driver in all_drivers:
-                if not isinstance(driver, dict):
-                    continue
-                    
-                # Check various fields for matches
-                name = driver.get('name', '').lower()
-                description = driver.get('description', '').lower()
-                package = driver.get('package', '').lower()
-                driver_field = driver.get('driver', '').lower()
-                category = driver.get('category', '').lower()
-                category_label = driver.get('category_label', '').lower()
-                
-                if (search_text in name or
-                    search_text in description or
-                    search_text in package or
-                    search_text in driver_field or
-                    search_text in category or
-                    search_text in category_label):
-                    matching_drivers.append(driver)
-                    
-            logger.info(f"Found {len(matching_drivers)} drivers matching '{search_text}'")
-            return matching_drivers
-        except Exception as e:
-            logger.error(f"Error searching drivers in JSON: {e}", exc_info=True)
-            return []
-
     def _filter_drivers_by_search(self, search_text: str):
         """Apply search filter to displayed drivers. Shows results in a dedicated group."""
         search_text = search_text.lower().strip()
@@ -1208,10 +1457,6 @@ echo "[]"
 
         if not search_text:
             # === RESTORE NORMAL VIEW ===
-            if self.search_results_group and self.search_results_group.get_parent() == self.content_box:
-                self.content_box.remove(self.search_results_group)
-            self.search_results_group = None
-
             if self.split_view:
                 self.split_view.set_sidebar_visible(True)
 
@@ -1240,191 +1485,55 @@ echo "[]"
         if self.split_view:
             self.split_view.set_sidebar_visible(False)
 
-        # Clear current content box to make space for search results only
-        while child := self.content_box.get_first_child():
-            self.content_box.remove(child)
-
-        # Create search header with improved styling
-        search_header = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
-        search_header.set_margin_top(18)
-        search_header.set_margin_bottom(16)
-        search_header.set_margin_start(16)
-        search_header.set_margin_end(16)
-        
-        search_icon = Gtk.Image.new_from_icon_name("edit-find-symbolic")
-        search_icon.set_pixel_size(32)
-        search_icon.add_css_class("accent")
-        search_header.append(search_icon)
-        
-        # Title with search term in header area
-        header_text = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
-        header_text.set_hexpand(True)
-        
-        title_label = Gtk.Label()
-        title_label.set_markup(f"<span size='large'><b>Resultados da busca: '{search_text}'</b></span>")
-        title_label.add_css_class("title-3")
-        title_label.set_xalign(0)
-        header_text.append(title_label)
-        
-        # Add a subtitle directly in the header
-        subtitle_label = Gtk.Label()
-        subtitle_label.set_markup("<span foreground='dimgray'>Buscando em todos os drivers disponíveis</span>")
-        subtitle_label.set_xalign(0)
-        subtitle_label.add_css_class("dim-label")
-        header_text.append(subtitle_label)
-        
-        search_header.append(header_text)
-        
-        # Add a clear button to easily clear search
-        clear_btn = Gtk.Button()
-        clear_btn.set_icon_name("edit-clear-symbolic")
-        clear_btn.set_tooltip_text("Limpar busca")
-        clear_btn.set_valign(Gtk.Align.CENTER)
-        clear_btn.connect("clicked", lambda _: self._clear_search())
-        search_header.append(clear_btn)
-        
-        self.content_box.append(search_header)
+        # The index is in memory, so the search runs synchronously
+        hits = self.search_index.search(search_text)
+        if not hits:
+            self._show_no_search_results(search_text)
+            return
 
-        # Add spinner for loading results
-        spinner_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-        spinner_box.set_halign(Gtk.Align.CENTER)
-        spinner_box.set_margin_top(12)
-        spinner_box.set_margin_bottom(12)
-        
-        spinner = Gtk.Spinner()
-        spinner.start()
-        spinner_box.append(spinner)
-        
-        loading_label = Gtk.Label(label=f"Buscando por '{search_text}'...")
-        spinner_box.append(loading_label)
-        
-        self.content_box.append(spinner_box)
-        
-        # Use a separate thread to perform the search to keep UI responsive
-        def search_thread():
-            # Search directly in the JSON file
-            matching_drivers = self._search_drivers_in_json(search_text)
-            
-            # Process detected drivers separately for better categorization
-            detected_matches = []
-            for driver in self.detected_drivers_data:
-                name = driver.get('name', '').lower()
-                description = driver.get('description', '').lower()
-                package = driver.get('package', '').lower()
-                driver_field = driver.get('driver', '').lower()
-                device = driver.get('device', '').lower()
-                
-                if (search_text in name or
-                    search_text in description or
-                    search_text in package or
-                    search_text in driver_field or
-                    search_text in device):
-                    detected_matches.append(driver)
-            
-            # Update UI on main thread
-            GLib.idle_add(self._display_search_results, search_text, matching_drivers, detected_matches, spinner_box)
-        
-        # Start search thread
-        threading.Thread(target=search_thread, daemon=True).start()
+        total_detected = sum(1 for hit in hits if hit.kind == "detected")
+        total_regular = len(hits) - total_detected
 
-    def _display_search_results(self, search_text: str, file_matches: List[Dict], detected_matches: List[Dict], spinner_box: Gtk.Box):
-        """Display search results after search is complete."""
-        # Remove spinner
-        if spinner_box.get_parent():
-            self.content_box.remove(spinner_box)
-        
-        # Add info card explaining search scope
-        info_card = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=16)
-        info_card.add_css_class("card")
-        info_card.set_margin_bottom(24)
-        info_card.set_margin_start(16)
-        info_card.set_margin_end(16)
-        info_card.set_margin_top(4)
-        # Internal padding
-        info_card.set_margin_start(16)
-        info_card.set_margin_end(16)
-        info_card.set_margin_top(16)
-        info_card.set_margin_bottom(16)
-        
-        # Add an info icon
-        info_icon = Gtk.Image.new_from_icon_name("info-symbolic")
-        info_icon.add_css_class("accent")
-        info_card.append(info_icon)
-        
-        # Add the descriptive text
-        info_label = Gtk.Label()
-        info_label.set_markup(f"Buscando por <b>'{search_text}'</b> em nomes, descrições, pacotes e categorias de drivers.")
-        info_label.set_wrap(True)
-        info_label.set_xalign(0)
-        info_label.set_hexpand(True)
-        info_card.append(info_label)
-        
-        self.content_box.append(info_card)
-        
-        # Create groups for detected and regular drivers
-        all_rows = []
-        total_detected = len(detected_matches)
-        total_regular = len(file_matches)
-        
-        # Create and add the search results group
-        self.search_results_group = Adw.PreferencesGroup()
-        self.search_results_group.set_title("Drivers encontrados")
-        self.search_results_group.set_description(
-            f"{total_detected + total_regular} driver(s) encontrado(s): {total_detected} detectados, {total_regular} por categoria"
+        # Results are a filter over the driver list, ranked by the sorter
+        self._search_scores = {id(hit.record): hit.score for hit in hits}
+        self._list_mode = "search"
+        self.list_header_icon.set_from_icon_name("edit-find-symbolic")
+        self.list_header_title.set_markup(
+            f"<b>Resultados da busca: '{GLib.markup_escape_text(search_text)}'</b>"
         )
-        self.content_box.append(self.search_results_group)
-        
-        # First add detected driver matches with a badge indicating they are recommended
-        for driver in detected_matches:
-            try:
-                row = self._create_detected_driver_row(driver)
-                if row:
-                    all_rows.append(row)
-            except Exception as e:
-                logger.error(f"Error creating detected driver row: {e}")
-        
-        # Then add regular driver matches
-        for driver in file_matches:
-            try:
-                row = self._create_driver_action_row(driver)
-                if row:
-                    all_rows.append(row)
-            except Exception as e:
-                logger.error(f"Error creating driver row: {e}")
-        
-        # Check if we have any results
-        if all_rows:
-            # Sort rows by name for better readability
-            all_rows.sort(key=lambda row: row.get_title().lower())
-            
-            # Add rows to the group
-            for row in all_rows:
-                self.search_results_group.add(row)
-            
-            # Show toast notification for search results
-            toast = Adw.Toast.new(f"Encontrados {len(all_rows)} drivers para '{search_text}'")
-            toast.set_timeout(3)
-            self.toast_overlay.add_toast(toast)
-        else:
-            # Remove the info card if no results
-            if info_card.get_parent() == self.content_box:
-                self.content_box.remove(info_card)
-                
-            # Create a nice empty state for no results
-            empty_state = Adw.StatusPage()
-            empty_state.set_icon_name("edit-find-symbolic")
-            empty_state.set_title(f"Nenhum resultado para '{search_text}'")
-            empty_state.set_description("Tente termos mais gerais ou verifique a ortografia")
-            empty_state.set_vexpand(True)
-            
-            # Add a button to clear search
-            action_button = Gtk.Button(label="Limpar busca")
-            action_button.add_css_class("pill")
-            action_button.add_css_class("suggested-action") 
-            action_button.connect("clicked", lambda _: self._clear_search())
-            empty_state.set_child(action_button)
-            
-            self.content_box.append(empty_state)
+        self.list_header_subtitle.set_label(
+            f"{len(hits)} driver(s) encontrado(s): {total_detected} detectados, {total_regular} por categoria"
+        )
+        self.list_clear_button.set_visible(True)
+        self._apply_list_filter()
+        self.content_stack.set_visible_child_name("list")
+
+        # Show toast notification for search results
+        toast = Adw.Toast.new(f"Encontrados {len(hits)} drivers para '{search_text}'")
+        toast.set_timeout(3)
+        self.toast_overlay.add_toast(toast)
+
+    def _show_no_search_results(self, search_text: str):
+        """Show the empty state of a search without results."""
+        self._show_content_page()
+        while child := self.content_box.get_first_child():
+            self.content_box.remove(child)
+
+        # Create a nice empty state for no results
+        empty_state = Adw.StatusPage()
+        empty_state.set_icon_name("edit-find-symbolic")
+        empty_state.set_title(f"Nenhum resultado para '{search_text}'")
+        empty_state.set_description("Tente termos mais gerais ou verifique a ortografia")
+        empty_state.set_vexpand(True)
+        
+        # Add a button to clear search
+        action_button = Gtk.Button(label="Limpar busca")
+        action_button.add_css_class("pill")
+        action_button.add_css_class("suggested-action") 
+        action_button.connect("clicked", lambda _: self._clear_search())
+        empty_state.set_child(action_button)
+        
+        self.content_box.append(empty_state)
 
     def _clear_search(self):
         """Clear the search entry and restore normal view."""
@@ -1433,8 +1542,19 @@ echo "[]"
         self.search_entry.grab_focus()
 
     def _on_direct_search_changed(self, entry):
-        """Handle direct search from the header search entry."""
-        search_text = entry.get_text().lower().strip()
+        """Handle direct search from the header search entry.
+        
+        Each keystroke supersedes the pending search, so only the text
+        present when typing pauses is searched.
+        """
+        if self._search_timeout_id:
+            GLib.source_remove(self._search_timeout_id)
+        self._search_timeout_id = GLib.timeout_add(SEARCH_DEBOUNCE_MS, self._run_pending_search)
+    
+    def _run_pending_search(self) -> bool:
+        """Run the search for the current text of the search entry."""
+        self._search_timeout_id = 0
+        search_text = self.search_entry.get_text().lower().strip()
         
         # Only trigger search if we have at least 2 characters to avoid too many results
         if len(search_text) >= 2 or not search_text:
@@ -1444,107 +1564,40 @@ echo "[]"
         if search_text and self.content_scroll:
             self.content_scroll.get_vadjustment().set_value(0)  # Scroll to top
         
-        # Log the search term for debugging
-        if search_text:
-            print(f"Searching for: '{search_text}'")
+        return False
 
     def _populate_drivers_for_category(self, category_key: str):
-        """Populate drivers for the selected category."""
-        # Completely rebuild the content area from scratch
-        while child := self.content_box.get_first_child():
-            self.content_box.remove(child)
-        
-        # Get drivers for specific category only
+        """Show the drivers of a category in the driver list."""
         drivers_to_show = self.drivers_data.get(category_key, [])
         
         if not drivers_to_show:
             # Show empty state
+            while child := self.content_box.get_first_child():
+                self.content_box.remove(child)
             self._show_empty_state()
             return
         
-        # Create a header for the category
-        category_labels = {
-            "gpu": "Placa de vídeo",
-            "wifi": "WiFi",
-            "ethernet": "Rede cabeada",
-            "bluetooth": "Bluetooth",
-            "printer": "Impressora",
-            "printer3d": "Impressora 3D",
-            "scanner": "Scanner",
-            "dvb": "TV Digital",
-            "webcam": "Webcam",
-            "touchscreen": "Touchscreen",
-            "sound": "Som",
-            "firmware": "Firmware",
-            "unknown": "Outros"
-        }
-        
-        category_display_name = category_labels.get(category_key, category_key.title())
-        
-        # Add a category header
-        header_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
-        header_box.set_margin_top(12)
-        header_box.set_margin_bottom(16)
-        header_box.set_margin_start(16)
-        header_box.set_margin_end(16)
-        
-        # Choose appropriate icon for this category
-        category_icon_mapping = {
-            "gpu": "video-display-symbolic",
-            "wifi": "network-wireless-symbolic",
-            "ethernet": "network-wired-symbolic",
-            "bluetooth": "bluetooth-symbolic",
-            "printer": "printer-symbolic",
-            "printer3d": "printer-symbolic",
-            "scanner": "scanner-symbolic",
-            "dvb": "tv-symbolic",
-            "webcam": "camera-web-symbolic",
-            "touchscreen": "input-touchpad-symbolic",
-            "sound": "audio-card-symbolic",
-            "firmware": "application-x-firmware-symbolic",
-            "unknown": "package-x-generic-symbolic"
-        }
-        
-        icon_name = category_icon_mapping.get(category_key, "package-x-generic-symbolic")
-        header_icon = Gtk.Image.new_from_icon_name(icon_name)
-        header_icon.set_pixel_size(24)
-        header_box.append(header_icon)
-        
-        title_label = Gtk.Label()
-        title_label.set_markup(f"<b>Drivers para {category_display_name}</b>")
-        title_label.add_css_class("heading")
-        title_label.set_hexpand(True)
-        title_label.set_xalign(0)
-        header_box.append(title_label)
-        
-        self.content_box.append(header_box)
-        
-        # Create a single group for all drivers (flat list)
-        group = Adw.PreferencesGroup()
-        group.set_description(f"{len(drivers_to_show)} driver(s) encontrado(s)")
-        
-        # Sort drivers by installation status (installed first) then by name
-        drivers_to_show.sort(key=lambda d: (not d.get('installed', False), d.get('name', '')))
-        
-        # Add each driver as a direct action row (no expander)
-        rows_added = False
-        for driver in drivers_to_show:
-            try:
-                driver_row = self._create_driver_action_row(driver)
-                if driver_row is not None:
-                    group.add(driver_row)
-                    rows_added = True
-            except Exception as e:
-                logger.error(f"Error adding driver row: {e}", exc_info=True)
-        
-        # Only add the group if we added rows
-        if rows_added:
-            self.content_box.append(group)
-        else:
-            self._show_empty_state()
+        category_display_name = _category_label(category_key)
+        self.list_header_icon.set_from_icon_name(
+            CATEGORY_ICONS.get(category_display_name, "package-x-generic-symbolic")
+        )
+        self.list_header_title.set_markup(f"<b>Drivers para {GLib.markup_escape_text(category_display_name)}</b>")
+        self.list_header_subtitle.set_label(f"{len(drivers_to_show)} driver(s) encontrado(s)")
+        self.list_clear_button.set_visible(False)
+        
+        # Switching category only changes the filter; no rows are rebuilt
+        if self._list_mode != "category" or self._list_category != category_key:
+            self._list_mode = "category"
+            self._list_category = category_key
+            self._search_scores = {}
+            self._apply_list_filter()
+            self.driver_list_scroll.get_vadjustment().set_value(0)
+        
+        self.content_stack.set_visible_child_name("list")
     
     def _show_empty_state(self):
         """Show empty state when no drivers are found."""
+        self._show_content_page()
         group = Adw.PreferencesGroup()
         group.set_title("Nenhum driver encontrado")
         
@@ -1744,11 +1797,13 @@ echo "[]"
             self.category_list.remove(child)
         
         # Reset data
-        self.drivers_data = {}
+        self.drivers_data = DriverStore()
         self.detected_drivers_data = []
+        self.driver_store.remove_all()
+        self._show_content_page()
         
-        # Start loading data
-        self._load_drivers()
+        # Start loading data, skipping the scan cache on an explicit refresh
+        self._load_drivers(use_cache=False)
     
     def _on_install_clicked(self, button: Gtk.Button, driver: Dict[str, Any]):
         """Handle install button click."""
@@ -1772,11 +1827,7 @@ echo "[]"
         if response != "install":
             return
         
-        def install_thread():
-            success = self._install_package(driver_info)
-            GLib.idle_add(self._on_operation_complete, success, driver_info.get('package'), "instalação")
-        
-        threading.Thread(target=install_thread, daemon=True).start()
+        self._queue_operation(operation_queue.INSTALL, driver_info)
     
     def _on_uninstall_clicked(self, button: Gtk.Button, driver: Dict[str, Any]):
         """Handle uninstall button click."""
@@ -1800,127 +1851,186 @@ echo "[]"
         if response != "remove":
             return
         
-        def uninstall_thread():
-            success = self._uninstall_package(driver_info)
-            GLib.idle_add(self._on_operation_complete, success, driver_info.get('package'), "remoção")
-        
-        threading.Thread(target=uninstall_thread, daemon=True).start()
+        self._queue_operation(operation_queue.REMOVE, driver_info)
     
-    def _install_package(self, driver_info: Dict[str, Any]) -> bool:
-        """Install a package using pacman or mhwd."""
-        pkg_name = driver_info.get('package')
-        source = driver_info.get('source')
-        
-        if not pkg_name:
+    def _queue_operation(self, action: str, driver_info: Dict[str, Any]) -> None:
+        """Queue an install or removal and start the queue."""
+        operation = operation_queue.Operation.from_driver(action, driver_info)
+        if operation is None:
             logger.error("Package name is missing in driver_info.")
-            return False
-        
-        try:
-            if source == "mhwd":
-                logger.info(f"Installing MHWD package: {pkg_name}")
-                # For mhwd, the package name is often like 'video-nvidia'
-                # MHWD typically installs for 'pci' devices.
-                # Ensure the exact command structure mhwd expects.
-                # It might need specific device IDs or types if not 'pci'.
-                # Assuming 'pci' for now as it's common for video/network drivers.
-                result = subprocess.run(
-                    ["pkexec", "mhwd", "-i", "pci", pkg_name, "--noconfirm"],
-                    capture_output=True,
-                    text=True,
-                    timeout=OPERATION_TIMEOUT
-                )
-            else: # Default to pacman
-                logger.info(f"Installing pacman package: {pkg_name}")
-                result = subprocess.run(
-                    ["pkexec", "pacman", "-S", "--noconfirm", pkg_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=OPERATION_TIMEOUT
-                )
-            
-            if result.returncode == 0:
-                logger.info(f"Successfully installed {pkg_name}. Output: {result.stdout}")
-                return True
-            else:
-                logger.error(f"Failed to install {pkg_name}. Return code: {result.returncode}. Error: {result.stderr}. Output: {result.stdout}")
-                return False
-        except Exception as e:
-            logger.error(f"Install error for {pkg_name} (source: {source}): {e}")
-            return False
+            return
+        self.operation_queue.add(operation)
+        self._start_operation_queue()
     
-    def _uninstall_package(self, driver_info: Dict[str, Any]) -> bool:
-        """Uninstall a package using pacman or mhwd."""
-        pkg_name = driver_info.get('package')
-        source = driver_info.get('source')
-        
-        if not pkg_name:
-            logger.error("Package name is missing in driver_info for uninstall.")
-            return False
+    def _start_operation_queue(self) -> bool:
+        """Apply the queued operations unless a batch is already running.
         
+        Operations queued while a batch runs are applied right after it, as
+        the next batch.
+        """
+        if len(self.operation_queue) and self._operation_lock.acquire(blocking=False):
+            self.operation_bar.set_fraction(0.0)
+            self.operation_bar.set_text("")
+            self.operation_bar.set_visible(True)
+            # Output lines arrive much faster than the bar needs to redraw
+            self._operation_progress = CoalescedProgress(self._on_operation_progress)
+            self._operation_progress.start()
+            get_command_runner().submit(self._run_operation_queue(self._operation_progress), background=True)
+        return False
+    
+    async def _run_operation_queue(self, progress: CoalescedProgress) -> None:
+        """Commit the queued operations in batches, one authentication each."""
         try:
-            if source == "mhwd":
-                logger.info(f"Removing MHWD package: {pkg_name}")
-                # Similar to install, assuming 'pci' for mhwd removal.
-                result = subprocess.run(
-                    ["pkexec", "mhwd", "-r", "pci", pkg_name, "--noconfirm"],
-                    capture_output=True,
-                    text=True,
-                    timeout=OPERATION_TIMEOUT
-                )
-            else: # Default to pacman
-                logger.info(f"Removing pacman package: {pkg_name}")
-                result = subprocess.run(
-                    ["pkexec", "pacman", "-Rns", "--noconfirm", pkg_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=OPERATION_TIMEOUT
+            while True:
+                operations = self.operation_queue.take()
+                if not operations:
+                    break
+                result = await operation_queue.commit(
+                    operations,
+                    on_progress=progress.update,
+                    step_timeout=OPERATION_TIMEOUT
                 )
-            
-            if result.returncode == 0:
-                logger.info(f"Successfully uninstalled {pkg_name}. Output: {result.stdout}")
-                return True
-            else:
-                logger.error(f"Failed to uninstall {pkg_name}. Return code: {result.returncode}. Error: {result.stderr}. Output: {result.stdout}")
-                return False
-        except Exception as e:
-            logger.error(f"Uninstall error for {pkg_name} (source: {source}): {e}")
-            return False
+                GLib.idle_add(self._on_operation_complete, result)
+        finally:
+            # The lock is released on the main loop, once the progress of this
+            # run is stopped, so a new run cannot start in between
+            GLib.idle_add(self._on_operation_queue_finished)
     
-    def _on_operation_complete(self, success: bool, pkg_name: str, operation: str):
-        """Handle package operation completion."""
-        if success:
-            toast = Adw.Toast.new(f"{operation.title()} de {pkg_name} concluída")
+    def _on_operation_progress(self, fraction: float, done: int, total: int, message: str) -> None:
+        """Show the progress of the running batch."""
+        self.operation_bar.set_fraction(fraction)
+        self.operation_bar.set_text(f"{done}/{total} - {message[:80]}")
+    
+    def _on_operation_queue_finished(self) -> bool:
+        """Stop the progress updates of the finished batches and allow a new run."""
+        if self._operation_progress is not None:
+            self._operation_progress.stop()
+            self._operation_progress = None
+        self.operation_bar.set_visible(False)
+        self._operation_lock.release()
+        # Operations queued after the last take() are picked up by a new run
+        self._start_operation_queue()
+        return False
+    
+    def _on_operation_complete(self, result: operation_queue.BatchResult) -> bool:
+        """Handle the completion of a batch of package operations."""
+        if result.done:
+            installed = [op.package for op in result.done if op.action == operation_queue.INSTALL]
+            removed = [op.package for op in result.done if op.action == operation_queue.REMOVE]
+            parts = []
+            if installed:
+                parts.append(f"Instalação de {', '.join(installed)} concluída")
+            if removed:
+                parts.append(f"Remoção de {', '.join(removed)} concluída")
+            toast = Adw.Toast.new("; ".join(parts))
             toast.set_timeout(3)
             self.toast_overlay.add_toast(toast)
             
-            # Reload drivers data to refresh status
-            self._load_drivers()
-        else:
+            # Cached scan no longer reflects the installed packages
+            scan_cache.invalidate(SCAN_CACHE_NAME)
+            
+            # Update only the status of the listed drivers
+            self._refresh_driver_status()
+        
+        if not result.success:
+            packages = ", ".join(op.package for op in result.failed)
             dialog = Adw.MessageDialog.new(
                 self.get_root(),
-                f"Falha na {operation}",
-                f"Não foi possível completar a {operation} do pacote {pkg_name}."
+                "Falha na operação",
+                f"Não foi possível completar a operação dos pacotes: {packages}."
             )
+            if result.output:
+                dialog.set_body(f"{dialog.get_body()}\n\n{result.output.splitlines()[-1]}")
             dialog.add_response("ok", "OK")
             dialog.present()
+        return False
     
-    def _on_detected_operation_complete(self, success: bool, pkg_name: str, operation: str):
-        """Handle package operation completion for detected drivers."""
-        if success:
-            toast = Adw.Toast.new(f"{operation.title()} de {pkg_name} concluída")
-            toast.set_timeout(3)
-            self.toast_overlay.add_toast(toast)
-            
-            # Reload drivers data to refresh status
-            self._load_drivers()
-        else:
-            dialog = Adw.MessageDialog.new(
-                self.get_root(),
-                f"Falha na {operation}",
-                f"Não foi possível completar a {operation} do pacote {pkg_name}."
+    def _refresh_driver_status(self) -> None:
+        """Apply the outcome of a batch to the listed drivers without reloading them.
+        
+        The installed/loaded flags are re-checked against the package
+        database and /proc/modules in a thread; the drivers are listed again
+        only when the hardware fingerprint changed.
+        """
+        records = list(self.detected_drivers_data) + self.drivers_data.records()
+        
+        def refresh_thread():
+            try:
+                if scan_cache.compute_hardware_fingerprint() != self._hardware_fingerprint:
+                    logger.info("Hardware changed since the drivers were listed, rescanning")
+                    GLib.idle_add(self._load_drivers, False)
+                    return
+                changes = driver_lister.status_changes(records)
+                GLib.idle_add(self._on_driver_status_refreshed, changes, scan_cache.compute_fingerprint())
+            except Exception as e:
+                logger.error(f"Error refreshing driver status, rescanning: {e}", exc_info=True)
+                GLib.idle_add(self._load_drivers, False)
+        
+        threading.Thread(target=refresh_thread, daemon=True).start()
+    
+    def _on_driver_status_refreshed(self, changes: List[Tuple[DriverRecord, Dict[str, bool]]], fingerprint: str) -> bool:
+        """Update the changed records and re-render only their rows and badges."""
+        for record, fields in changes:
+            for key, value in fields.items():
+                record[key] = value
+        changed = {id(record) for record, _ in changes}
+        
+        # Rows of the driver list are recreated when their item changes
+        for position in range(self.driver_store.get_n_items()):
+            if id(self.driver_store.get_item(position).driver) in changed:
+                self.driver_store.items_changed(position, 1, 1)
+        
+        # Devices of the Principal view holding a changed driver
+        for device_id, (_, _, _, drivers) in self._principal_device_rows.items():
+            if any(id(driver) in changed for driver in drivers):
+                self._update_principal_device_row(device_id)
+        
+        if self._install_recommended_button is not None:
+            self._install_recommended_button.set_visible(
+                any(not d.get('installed', False) and d.get('package') for d in self.detected_drivers_data)
             )
-            dialog.add_response("ok", "OK")
-            dialog.present()
+        
+        # The scan cache matches the current packages again
+        if len(self.drivers_data):
+            payload = {
+                "drivers_data": self.drivers_data.to_payload(),
+                "detected_drivers": [driver.to_dict() for driver in self.detected_drivers_data]
+            }
+            threading.Thread(target=scan_cache.store, args=(SCAN_CACHE_NAME, fingerprint, payload), daemon=True).start()
+        
+        logger.info(f"Driver status updated in place: {len(changes)} driver(s) changed")
+        return False
+    
+    def _on_install_recommended_clicked(self, button: Gtk.Button):
+        """Handle the "install all" button of the detected drivers."""
+        pending = [d for d in self.detected_drivers_data if not d.get('installed', False) and d.get('package')]
+        if not pending:
+            return
+        
+        packages = sorted({d.get('package') for d in pending})
+        dialog = Adw.MessageDialog.new(
+            self.get_root(),
+            "Instalar drivers recomendados?",
+            f"Deseja instalar {len(packages)} pacote(s): {', '.join(packages)}?\n\nEsta operação requer privilégios de administrador."
+        )
+        dialog.add_response("cancel", "Cancelar")
+        dialog.add_response("install", "Instalar")
+        dialog.set_response_appearance("install", Adw.ResponseAppearance.SUGGESTED)
+        dialog.connect("response", self._on_install_recommended_response, pending)
+        dialog.present()
+    
+    def _on_install_recommended_response(self, dialog: Adw.MessageDialog, response: str, drivers: List[Dict[str, Any]]):
+        """Queue every recommended driver as one batch."""
+        dialog.destroy()
+        
+        if response != "install":
+            return
+        
+        for driver_info in drivers:
+            operation = operation_queue.Operation.from_driver(operation_queue.INSTALL, driver_info)
+            if operation is not None:
+                self.operation_queue.add(operation)
+        self._start_operation_queue()
     
     def _show_error_message(self, message: str) -> None:
         """Show error message (same as hardware_info_page)."""
@@ -2006,11 +2116,7 @@ echo "[]"
         if response != "install":
             return
         
-        def install_thread():
-            success = self._install_package(driver_info) # Pass full driver_info
-            GLib.idle_add(self._on_detected_operation_complete, success, driver_info.get('package'), "instalação")
-        
-        threading.Thread(target=install_thread, daemon=True).start()
+        self._queue_operation(operation_queue.INSTALL, driver_info)
     
     def _on_uninstall_detected_clicked(self, button: Gtk.Button, driver: Dict[str, Any]):
         """Handle uninstall button click for detected drivers."""
@@ -2034,11 +2140,7 @@ echo "[]"
         if response != "remove":
             return
         
-        def uninstall_thread():
-            success = self._uninstall_package(driver_info) # Pass full driver_info
-            GLib.idle_add(self._on_detected_operation_complete, success, driver_info.get('package'), "remoção")
-        
-        threading.Thread(target=uninstall_thread, daemon=True).start()
+        self._queue_operation(operation_queue.REMOVE, driver_info)
     
     def _on_detected_driver_info_clicked(self, button: Gtk.Button, driver: Dict[str, Any]):
         """Show detailed detected driver information."""
@@ -2089,8 +2191,12 @@ echo "[]"
         
         return "\n".join(info_parts)
     
-    def _load_drivers(self):
-        """Load drivers data in a separate thread."""
+    def _load_drivers(self, use_cache: bool = True):
+        """Load drivers data in a separate thread.
+        
+        Args:
+            use_cache: Paint the cached scan first when it matches the hardware fingerprint.
+        """
         print("Starting to load drivers...")
         logger.info("Starting to load drivers data")
         self.progress_bar.set_visible(True)
@@ -2114,13 +2220,23 @@ echo "[]"
         
         def load_thread():
             try:
-                print("Inside load thread, about to fetch drivers...")
+                # Depois de instalar/remover, só uma mudança de hardware exige nova varredura
+                self._hardware_fingerprint = scan_cache.compute_hardware_fingerprint()
                 
-                # Carrega os drivers padrão primeiro
-                drivers_data = self._fetch_drivers_data()
-                print(f"Drivers data loaded: {'Success' if drivers_data else 'Failed'}")
+                # Pinta a partir do cache em disco e revalida em segundo plano
+                fingerprint = scan_cache.compute_fingerprint()
+                cached = scan_cache.load(SCAN_CACHE_NAME, fingerprint) if use_cache else None
+                if cached is not None:
+                    logger.info("Showing cached scan while revalidating")
+                    GLib.idle_add(
+                        self._on_drivers_loaded,
+                        DriverStore.from_grouped(cached["drivers_data"]),
+                        [DriverRecord.from_dict(driver) for driver in cached["detected_drivers"]]
+                    )
+                
+                print("Inside load thread, about to fetch drivers...")
                 
-                # Tenta carregar drivers detectados com tratamento de erros adicional
+                # A detecção nativa é rápida: carrega os drivers detectados primeiro
                 detected_drivers = []
                 try:
                     detected_drivers = self._fetch_detected_hardware_drivers()
@@ -2130,6 +2246,33 @@ echo "[]"
                     logger.error(f"Error in hardware detection (non-fatal): {e}", exc_info=True)
                     print(f"Error in hardware detection: {str(e)}")
                 
+                if cached is None:
+                    # Sem cache: mostra a Principal já e recebe o catálogo aos poucos
+                    GLib.idle_add(self._on_drivers_loaded, DriverStore(), detected_drivers)
+                    drivers_data = self._stream_drivers_data(
+                        lambda batch: GLib.idle_add(self._on_drivers_batch, batch)
+                    )
+                else:
+                    drivers_data = self._fetch_drivers_data()
+                print(f"Drivers data loaded: {'Success' if drivers_data else 'Failed'}")
+                
+                fresh = {
+                    "drivers_data": drivers_data.to_payload() if drivers_data is not None else None,
+                    "detected_drivers": [driver.to_dict() for driver in detected_drivers]
+                }
+                if drivers_data is not None:
+                    scan_cache.store(SCAN_CACHE_NAME, fingerprint, fresh)
+                
+                if cached is None:
+                    GLib.idle_add(self._on_drivers_stream_finished, drivers_data, detected_drivers)
+                    return
+                
+                # Nada a repintar se o cache já mostrava o resultado atual
+                # (ou se a revalidação falhou e o cache continua na tela)
+                if cached is not None and (cached == fresh or drivers_data is None):
+                    logger.info("Keeping cached scan after revalidation")
+                    return
+                
                 # Continua o carregamento mesmo que a detecção de hardware falhe
                 GLib.idle_add(self._on_drivers_loaded, drivers_data, detected_drivers)
             except Exception as e:
@@ -2141,106 +2284,6 @@ echo "[]"
         thread.start()
         print("Driver loading thread started")
     
-    def _on_search_toggled(self, button):
-        """Handle search button toggle state."""
-        is_active = button.get_active()
-        self.search_bar.set_search_mode(is_active)
-        
-        if is_active:
-            # When activated, focus the search entry
-            self.search_entry.grab_focus()
-        else:
-            # When deactivated, clear the search
-            self.search_entry.set_text("")
-            self._filter_drivers_by_search("")
-            
-    def _on_search_text_changed(self, entry):
-        """Filter drivers based on search text."""
-        search_text = entry.get_text().lower()
-        print(f"Search text changed: '{search_text}'")
-        self._filter_drivers_by_search(search_text)
-    
-    def _filter_drivers_by_search(self, search_text):
-        """Apply search filter to displayed drivers."""
-        # Find all the device groups in the content box
-        device_groups = []
-        
-        # Use proper GTK 4 iteration instead of get_children()
-        child = self.content_box.get_first_child()
-        while child:
-            if isinstance(child, Adw.PreferencesGroup) and child != self.detected_drivers_group:
-                device_groups.append(child)
-            child = child.get_next_sibling()
-        
-        if not device_groups:
-            return
-            
-        # Skip filtering if search is empty
-        if not search_text:
-            # Show all device groups and their rows
-            for group in device_groups:
-                group.set_visible(True)
-                # Iterate through all children of the group using proper GTK 4 methods
-                row = group.get_first_child()
-                while row:
-                    row.set_visible(True)
-                    # For ExpanderRow, also make child rows visible
-                    if isinstance(row, Adw.ExpanderRow):
-                        for child_row in row.get_rows():  # ExpanderRow does have get_rows()
-                            child_row.set_visible(True)
-                    row = row.get_next_sibling()
-            return
-        
-        # Apply filter based on search text
-        for group in device_groups:
-            visible_rows = 0
-            
-            # Iterate through all children of the group using proper GTK 4 methods
-            row = group.get_first_child()
-            while row:
-                row_visible = False
-                
-                # For ExpanderRow, check the title and all child rows
-                if isinstance(row, Adw.ExpanderRow):
-                    # Check if the row title matches
-                    if search_text in row.get_title().lower():
-                        row_visible = True
-                    elif row.get_subtitle() and search_text in row.get_subtitle().lower():
-                        row_visible = True
-                    else:
-                        # Check each child row
-                        child_visible = False
-                        # ExpanderRow has get_rows()
-                        for child_row in row.get_rows():
-                            if (search_text in child_row.get_title().lower() or 
-                                (child_row.get_subtitle() and search_text in child_row.get_subtitle().lower())):
-                                child_visible = True
-                                break
-                        
-                        row_visible = child_visible
-                
-                # For regular ActionRow, just check the title and subtitle
-                elif isinstance(row, Adw.ActionRow):
-                    if search_text in row.get_title().lower():
-                        row_visible = True
-                    elif row.get_subtitle() and search_text in row.get_subtitle().lower():
-                        row_visible = True
-                
-                row.set_visible(row_visible)
-                if row_visible:
-                    visible_rows += 1
-                
-                row = row.get_next_sibling()
-            
-            # Only show the group if it has visible rows
-            group.set_visible(visible_rows > 0)
-    
-    def _on_direct_search_changed(self, entry):
-        """Handle direct search from the header search entry."""
-        search_text = entry.get_text().lower()
-        print(f"Search text changed: '{search_text}'")
-        self._filter_drivers_by_search(search_text)
-    
     def _on_drivers_error(self, error_message: str):
         """Handle errors in driver loading thread."""
         logger.error(f"Driver loading error: {error_message}")
@@ -4,15 +4,42 @@ Driver Lister Module
 This module provides functions to list all available drivers on the system.
 """
 import os
-import subprocess
 import re
 import json
+import shutil
+import time
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, FrozenSet, Iterable, List, Any, Optional, Tuple
+
+from common.command_runner import get_command_runner
+from common.package_state import get_package_state
+from . import hardware_index, mhwd_adapter
+from .driver_record import DriverRecord
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Matches the "[vendor:device]" suffix of an "lspci -nn" line
+_PCI_ID_PATTERN = re.compile(r"\[([0-9a-fA-F]{4}):([0-9a-fA-F]{4})\]")
+
+# Seconds each source may take before list_all_drivers gives up on it
+SOURCE_TIMEOUTS = {
+    "device-ids": 15.0,
+    "firmware": 15.0,
+    "mhwd": 20.0,
+    "standalone": 10.0
+}
+
+# Upper bound for a single probe subprocess, so a timed out source
+# does not leave its worker thread blocked forever
+PROBE_TIMEOUT = 30.0
+
+# Timings of the most recent collection, see get_last_collection_stats()
+_last_collection_stats: List[Dict[str, Any]] = []
+
 # Category labels mapping - used by other modules for consistent UI display
 CATEGORY_LABELS = {
     "Star": "Principais",
@@ -31,108 +58,244 @@ CATEGORY_LABELS = {
     "Webcam": "Webcam"
 }
 
-def list_all_drivers() -> List[Dict[str, Any]]:
+class _ProbeCache:
     """
-    List all available drivers on the system.
-    
-    Returns:
-        A list of dictionaries containing driver information.
+    Run each shared probe (lspci, dmesg, mhwd, ...) at most once.
+
+    Sources running in parallel ask for the same probes; the first caller
+    runs it and the others wait for its result.
     """
-    drivers = []
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+
+    def get(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+
+        if owner:
+            try:
+                future.set_result(func())
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
+
+# Probe cache of the collection running in the current context, if any
+_active_probes: contextvars.ContextVar = contextvars.ContextVar("driver_lister_probes", default=None)
+
+def _shared_probe(key: str, func: Callable[[], Any]) -> Any:
+    """
+    Run a probe, sharing its result within the current collection.
+
+    Outside list_all_drivers the probe simply runs, so the public helpers
+    keep returning fresh data.
+    """
+    probes = _active_probes.get()
+    if probes is None:
+        return func()
+    return probes.get(key, func)
+
+def _timed_source(name: str, func: Callable[[], List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], float]:
+    """Run a source and return its drivers with the time it took."""
+    start = time.monotonic()
+    drivers = func()
+    return drivers, time.monotonic() - start
+
+def collect_drivers(timeouts: Optional[Dict[str, float]] = None) -> Tuple[List[DriverRecord], List[Dict[str, Any]]]:
+    """
+    Collect drivers from every source in parallel.
     
-    # Get drivers from device-ids
-    drivers.extend(_get_device_id_drivers())
+    The sources run in a thread pool and share their probes, so lspci,
+    dmesg and mhwd run once per collection. A source that exceeds its
+    timeout is left out of the result instead of stalling the list.
     
-    # Get drivers from firmware
-    drivers.extend(_get_firmware_drivers())
+    Args:
+        timeouts: Per-source timeouts in seconds, overriding SOURCE_TIMEOUTS.
+        
+    Returns:
+        Tuple of the driver records, in source order, and one stats dictionary
+        per source with "source", "seconds", "count" and "status" ("ok",
+        "timeout" or "error").
+    """
+    global _last_collection_stats
+    
+    sources = (
+        ("device-ids", _get_device_id_drivers),
+        ("firmware", _get_firmware_drivers),
+        ("mhwd", _get_mhwd_drivers),
+        ("standalone", _get_standalone_drivers)
+    )
+    limits = dict(SOURCE_TIMEOUTS)
+    if timeouts:
+        limits.update(timeouts)
+    
+    probes = _ProbeCache()
+    
+    def submit(func, *args):
+        # Every task gets its own context copy carrying the shared probe cache
+        context = contextvars.copy_context()
+        context.run(_active_probes.set, probes)
+        return executor.submit(context.run, func, *args)
     
-    # Get drivers from mhwd
-    drivers.extend(_get_mhwd_drivers())
+    drivers = []
+    stats = []
+    executor = ThreadPoolExecutor(max_workers=len(sources) + 1,
+                                  thread_name_prefix="driver-lister")
+    try:
+        # Warm the package database while the probes run
+        submit(get_package_state().refresh)
+        
+        start = time.monotonic()
+        futures = [(name, submit(_timed_source, name, func)) for name, func in sources]
+        
+        for name, future in futures:
+            remaining = max(0.0, start + limits.get(name, PROBE_TIMEOUT) - time.monotonic())
+            try:
+                source_drivers, seconds = future.result(timeout=remaining)
+                drivers.extend(DriverRecord.from_dict(driver) for driver in source_drivers)
+                stats.append({"source": name, "seconds": seconds,
+                              "count": len(source_drivers), "status": "ok"})
+            except FutureTimeoutError:
+                logger.warning(f"Driver source '{name}' timed out after {limits.get(name, PROBE_TIMEOUT)}s")
+                stats.append({"source": name, "seconds": time.monotonic() - start,
+                              "count": 0, "status": "timeout"})
+            except Exception as e:
+                logger.error(f"Error collecting drivers from '{name}': {e}")
+                stats.append({"source": name, "seconds": time.monotonic() - start,
+                              "count": 0, "status": "error"})
+    finally:
+        # Do not wait for timed out sources; their probes are bounded by PROBE_TIMEOUT
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    logger.info("Driver sources: " + ", ".join(
+        f"{s['source']}={s['seconds']:.2f}s/{s['count']} ({s['status']})" for s in stats
+    ))
+    _last_collection_stats = stats
+    return drivers, stats
+
+def get_last_collection_stats() -> List[Dict[str, Any]]:
+    """
+    Get the per-source timings of the most recent collection.
     
-    # Get standalone drivers (printer, scanner, etc.)
-    drivers.extend(_get_standalone_drivers())
+    Returns:
+        A list of stats dictionaries, as returned by collect_drivers().
+    """
+    return list(_last_collection_stats)
+
+def list_all_drivers() -> List[DriverRecord]:
+    """
+    List all available drivers on the system.
     
+    Returns:
+        A list of driver records, readable like driver dictionaries.
+    """
+    drivers, _ = collect_drivers()
     return drivers
 
+def status_changes(records: Iterable[Any]) -> List[Tuple[Any, Dict[str, bool]]]:
+    """
+    Re-check the installed and loaded flags of already listed drivers.
+
+    Reads the pacman local database, the mhwd local database and
+    /proc/modules once, instead of listing every source again, e.g. after
+    installing or removing drivers. The flags follow the same rules as the
+    sources; the records themselves are not modified.
+
+    Args:
+        records: Driver records or dictionaries, from the lister or the
+            hardware detection (which sets "module").
+
+    Returns:
+        A list of (record, changed fields) for the records whose flags changed.
+    """
+    get_package_state().refresh(force=True)
+    installed_configs = mhwd_adapter.installed_configs()
+    try:
+        loaded_modules = _read_proc_modules()
+    except OSError as e:
+        logger.error(f"Error reading loaded modules: {e}")
+        loaded_modules = set()
+
+    def check(record) -> Dict[str, bool]:
+        source = record.get("source") or ""
+        package = record.get("package") or ""
+        if not package:
+            return {}
+        if source.startswith("mhwd"):
+            installed = package in installed_configs
+        else:
+            installed = _is_package_installed(package)
+
+        if source == "device-ids":
+            module = record.get("module") or record.get("name") or ""
+            loaded = _module_name(module) in loaded_modules
+            if "module" in record:
+                # Hardware detection counts a loaded module as installed
+                installed = installed or loaded
+        elif source == "firmware":
+            loaded = False
+        else:
+            loaded = installed
+
+        fields = {"installed": installed}
+        if "loaded" in record:
+            fields["loaded"] = loaded
+        return {key: value for key, value in fields.items() if record.get(key) != value}
+
+    changes = []
+    for record in records:
+        changed = check(record)
+        if changed:
+            changes.append((record, changed))
+
+    logger.info(f"Driver status re-checked: {len(changes)} changed")
+    return changes
+
 def _get_device_id_drivers() -> List[Dict[str, Any]]:
     """
-    Get drivers from device-ids directory.
+    Get drivers from the device-ids catalog.
+    
+    Module metadata and supported IDs come from the precompiled hardware
+    index, which falls back to walking the directory when it is stale.
     
     Returns:
         A list of dictionaries containing driver information.
     """
     drivers = []
-    device_ids_dir = "/usr/share/bigbashview/bcc/apps/drivers/device-ids"
-    
-    if not os.path.exists(device_ids_dir):
-        logger.warning(f"Device IDs directory not found: {device_ids_dir}")
-        return drivers
     
     try:
-        # Get list of PCI devices
-        pci_devices = _get_pci_devices()
+        index = hardware_index.load_index()
         
-        # List modules in device-ids directory
-        modules = [d for d in os.listdir(device_ids_dir) 
-                  if os.path.isdir(os.path.join(device_ids_dir, d))]
+        # Resolve every PCI device with a single index probe
+        compatible_modules = set()
+        for device in _get_pci_devices():
+            match = _PCI_ID_PATTERN.search(device)
+            if match:
+                compatible_modules.update(
+                    hardware_index.lookup("pci", match.group(1), match.group(2), index)
+                )
         
-        for module in modules:
-            module_dir = os.path.join(device_ids_dir, module)
-            
-            # Get module information
+        for module, info in index["modules"].items():
             try:
-                with open(os.path.join(module_dir, "category"), 'r') as f:
-                    category = f.read().strip()
-                
-                with open(os.path.join(module_dir, "pkg"), 'r') as f:
-                    package = f.read().strip()
-                
-                with open(os.path.join(module_dir, "description"), 'r') as f:
-                    description = f.read().strip()
-                
-                # Read PCI IDs
-                pci_ids_file = os.path.join(module_dir, "pci.ids")
-                if os.path.exists(pci_ids_file):
-                    with open(pci_ids_file, 'r') as f:
-                        pci_ids = [line.strip() for line in f.readlines()]
-                else:
-                    pci_ids = []
-                
-                # Check if module is compatible with the system
-                is_compatible = False
-                for pci_id in pci_ids:
-                    id_parts = pci_id.split(':')
-                    if len(id_parts) >= 2:
-                        vendor_id, device_id = id_parts[0], id_parts[1]
-                        pattern = f"{vendor_id}:{device_id}"
-                        
-                        for device in pci_devices:
-                            if pattern.lower() in device.lower():
-                                is_compatible = True
-                                break
-                    
-                    if is_compatible:
-                        break
-                
-                # Check if package is installed
-                is_installed = _is_package_installed(package)
-                
-                # Check if module is loaded
-                is_loaded = _is_module_loaded(module)
-                
-                # Map category to label
-                category_label = _get_category_label(category)
+                category = info["category"]
+                package = info["package"]
                 
                 # Add driver to the list
                 drivers.append({
                     "name": module,
                     "package": package,
-                    "description": description,
+                    "description": info["description"],
                     "category": category,
-                    "category_label": category_label,
-                    "compatible": is_compatible,
-                    "installed": is_installed,
-                    "loaded": is_loaded,
+                    "category_label": _get_category_label(category),
+                    "compatible": module in compatible_modules,
+                    "installed": _is_package_installed(package),
+                    "loaded": _is_module_loaded(module),
                     "source": "device-ids"
                 })
                 
@@ -243,6 +406,9 @@ def _get_mhwd_drivers() -> List[Dict[str, Any]]:
     """
     Get drivers from MHWD (Manjaro Hardware Detection).
     
+    Uses the shared mhwd adapter snapshot, so mhwd runs at most once per
+    listing mode instead of once per driver.
+    
     Returns:
         A list of dictionaries containing MHWD driver information.
     """
@@ -250,87 +416,34 @@ def _get_mhwd_drivers() -> List[Dict[str, Any]]:
     
     try:
         # Check if mhwd is available
-        if not _command_exists("mhwd"):
+        if not mhwd_adapter.is_available():
             logger.warning("MHWD command not found")
             return drivers
         
-        # Get list of MHWD drivers
-        result = subprocess.run(
-            ["mhwd", "-l"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        if result.returncode != 0:
-            logger.error(f"Error running mhwd -l: {result.stderr}")
-            return drivers
-        
-        # Parse MHWD output
-        output = result.stdout
-        
-        # Clean ANSI color codes
-        cleaned_output = re.sub(r'\x1B\[[0-9;]*[mG]', '', output)
-        
-        # Extract available drivers
-        free_section = re.search(r"Free drivers:\s*\n(.*?)(?=Non-free drivers:|\Z)", 
-                               cleaned_output, re.DOTALL)
-        nonfree_section = re.search(r"Non-free drivers:\s*\n(.*?)(?=\Z)", 
-                                   cleaned_output, re.DOTALL)
-        
-        # Process free drivers
-        if free_section:
-            free_drivers = re.findall(r"(\w+/\w+)", free_section.group(1))
-            for driver in free_drivers:
-                # Get more info about the driver
-                info = _get_mhwd_driver_info(driver)
-                
-                name = info.get("name", driver)
-                description = info.get("description", "Driver livre detectado pelo MHWD")
-                package = info.get("package", name)
-                
-                # Check if package is installed
-                is_installed = info.get("installed", False)
-                
-                # Add driver to the list
-                drivers.append({
-                    "name": name,
-                    "package": package,
-                    "description": description,
-                    "category": "Video",
-                    "category_label": "Placa de vídeo",
-                    "compatible": True,  # MHWD only lists compatible drivers
-                    "installed": is_installed,
-                    "loaded": is_installed,  # Assume loaded if installed
-                    "source": "mhwd-free"
-                })
-        
-        # Process non-free drivers
-        if nonfree_section:
-            nonfree_drivers = re.findall(r"(\w+/\w+)", nonfree_section.group(1))
-            for driver in nonfree_drivers:
-                # Get more info about the driver
-                info = _get_mhwd_driver_info(driver)
-                
-                name = info.get("name", driver)
-                description = info.get("description", "Driver proprietário detectado pelo MHWD")
-                package = info.get("package", name)
-                
-                # Check if package is installed
-                is_installed = info.get("installed", False)
-                
-                # Add driver to the list
-                drivers.append({
-                    "name": name,
-                    "package": package,
-                    "description": description,
-                    "category": "Video",
-                    "category_label": "Placa de vídeo",
-                    "compatible": True,  # MHWD only lists compatible drivers
-                    "installed": is_installed,
-                    "loaded": is_installed,  # Assume loaded if installed
-                    "source": "mhwd-nonfree"
-                })
+        for config in _shared_probe("mhwd", mhwd_adapter.load_configs).values():
+            # MHWD only suggests the configs compatible with this hardware
+            if not config.compatible:
+                continue
+            
+            if config.free:
+                description = "Driver livre detectado pelo MHWD"
+                source = "mhwd-free"
+            else:
+                description = "Driver proprietário detectado pelo MHWD"
+                source = "mhwd-nonfree"
+            
+            # Add driver to the list
+            drivers.append({
+                "name": config.name,
+                "package": config.name,
+                "description": description,
+                "category": "Video",
+                "category_label": "Placa de vídeo",
+                "compatible": True,
+                "installed": config.installed,
+                "loaded": config.installed,  # Assume loaded if installed
+                "source": source
+            })
     
     except Exception as e:
         logger.error(f"Error getting MHWD drivers: {e}")
@@ -436,13 +549,12 @@ def _get_pci_devices() -> List[str]:
     Returns:
         A list of PCI device IDs and descriptions.
     """
+    return _shared_probe("lspci", _run_lspci)
+
+def _run_lspci() -> List[str]:
+    """Run lspci -nn and return its lines."""
     try:
-        result = subprocess.run(
-            ["lspci", "-nn"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        result = get_command_runner().run_sync(["lspci", "-nn"], text=True, timeout=PROBE_TIMEOUT)
         
         if result.returncode != 0:
             logger.error(f"Error running lspci: {result.stderr}")
@@ -458,6 +570,9 @@ def _is_package_installed(package: str) -> bool:
     """
     Check if a package is installed.
     
+    Uses the shared package state cache, which reads the pacman local
+    database once instead of forking pacman for every package.
+    
     Args:
         package: Name of the package to check.
         
@@ -465,14 +580,7 @@ def _is_package_installed(package: str) -> bool:
         True if the package is installed, False otherwise.
     """
     try:
-        result = subprocess.run(
-            ["pacman", "-Q", package],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        return result.returncode == 0
+        return get_package_state().is_installed(package)
     
     except Exception as e:
         logger.error(f"Error checking if package {package} is installed: {e}")
@@ -483,21 +591,27 @@ def _is_module_loaded(module: str) -> bool:
     Check if a kernel module is loaded.
     
     Args:
-        module: Name of the module to check.
+        module: Name of the module to check; dashes and underscores match.
         
     Returns:
         True if the module is loaded, False otherwise.
     """
     try:
-        with open("/proc/modules", "r") as f:
-            loaded_modules = f.read()
-        
-        return module in loaded_modules
+        return _module_name(module) in _shared_probe("/proc/modules", _read_proc_modules)
     
     except Exception as e:
         logger.error(f"Error checking if module {module} is loaded: {e}")
         return False
 
+def _module_name(module: str) -> str:
+    """Normalize a module name the way /proc/modules prints it."""
+    return module.replace('-', '_')
+
+def _read_proc_modules() -> FrozenSet[str]:
+    """Read the names of the loaded kernel modules."""
+    with open("/proc/modules", "r") as f:
+        return frozenset(line.split(' ', 1)[0] for line in f if line.strip())
+
 def _get_category_label(category: str) -> str:
     """
     Map category ID to human-readable label.
@@ -547,13 +661,12 @@ def _get_missing_firmware() -> List[str]:
     Returns:
         A list of missing firmware filenames.
     """
+    return _shared_probe("dmesg", _run_dmesg)
+
+def _run_dmesg() -> List[str]:
+    """Run dmesg and extract the firmware files that failed to load."""
     try:
-        result = subprocess.run(
-            ["dmesg"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        result = get_command_runner().run_sync(["dmesg"], text=True, timeout=PROBE_TIMEOUT)
         
         if result.returncode != 0:
             logger.error(f"Error running dmesg: {result.stderr}")
@@ -592,35 +705,12 @@ def _get_mhwd_driver_info(driver_name: str) -> Dict[str, Any]:
     }
     
     try:
-        # Check if driver is installed using mhwd -li
-        result = subprocess.run(
-            ["mhwd", "-li"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        if result.returncode != 0:
-            logger.error(f"Error running mhwd -li: {result.stderr}")
-            return info
-        
-        # Clean ANSI color codes
-        cleaned_output = re.sub(r'\x1B\[[0-9;]*[mG]', '', result.stdout)
-        
-        # Check if driver is listed as installed
-        if driver_name in cleaned_output and "installed" in cleaned_output:
-            info["installed"] = True
-            
-            # Try to extract a better description
-            driver_section = re.search(
-                r"(?:>.*" + re.escape(driver_name) + r".*\n)(.*?)(?:\n\n|\Z)", 
-                cleaned_output, 
-                re.MULTILINE
-            )
-            if driver_section:
-                description = driver_section.group(1).strip()
-                if description:
-                    info["description"] = description
+        config = _shared_probe("mhwd", mhwd_adapter.load_configs).get(driver_name)
+        if config is not None:
+            info["installed"] = config.installed
+            info["version"] = config.version
+            info["free"] = config.free
+            info["class_ids"] = list(config.class_ids)
     
     except Exception as e:
         logger.error(f"Error getting MHWD driver info for {driver_name}: {e}")
@@ -637,19 +727,7 @@ def _command_exists(command: str) -> bool:
     Returns:
         True if the command exists, False otherwise.
     """
-    try:
-        result = subprocess.run(
-            ["which", command],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        return result.returncode == 0
-    
-    except Exception as e:
-        logger.error(f"Error checking if command {command} exists: {e}")
-        return False
+    return shutil.which(command) is not None
 
 # Export private functions as public API for use in other modules
 is_package_installed = _is_package_installed
@@ -0,0 +1,262 @@
+"""
+Driver Record Module
+
+This module provides the driver record type shared by the driver lister,
+the installer page and the driver manager windows, and the store that
+holds the canonical list of records with per-category views.
+
+DriverRecord keeps its fields in __slots__ and interns the repeated
+strings (category, source, type...), so thousands of records cost far
+less than the equivalent dictionaries. It keeps the read/write mapping
+interface of those dictionaries (get, [], in, keys), so the UI code can
+use either.
+"""
+import sys
+import logging
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Known driver fields, stored in slots
+FIELDS = (
+    "id", "name", "package", "description", "category", "category_label",
+    "type", "source", "driver", "device", "module", "version",
+    "installed", "loaded", "compatible", "open"
+)
+
+# Fields with few distinct values, interned so records share the strings
+INTERNED_FIELDS = frozenset(("category", "category_label", "type", "source", "device"))
+
+_MISSING = object()
+
+
+class DriverRecord:
+    """
+    A driver entry from any source (device-ids, firmware, mhwd, ...).
+
+    Fields that were never set behave like missing dictionary keys: get()
+    returns the default and [] raises KeyError. Unknown fields are kept in
+    an extra dictionary.
+    """
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, **fields: Any):
+        self.extra: Optional[Dict[str, Any]] = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DriverRecord":
+        """
+        Build a record from a driver dictionary.
+
+        Args:
+            data: Driver dictionary, e.g. one line of list_drivers.sh.
+
+        Returns:
+            The record; a DriverRecord passed in is returned as is.
+        """
+        if isinstance(data, DriverRecord):
+            return data
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain (JSON serializable) dictionary."""
+        return dict(self.items())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            if key in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self) -> List[str]:
+        """Return the names of the fields that are set."""
+        return [key for key, _ in self.items()]
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over the (field, value) pairs that are set."""
+        for key in FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                yield key, value
+        if self.extra:
+            yield from self.extra.items()
+
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        """Key identifying the same driver across loads and sources."""
+        return (self.get("id"), self.get("source"), self.get("category"),
+                self.get("package"), self.get("name"))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, DriverRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    # Records are mutable (e.g. "installed" changes), so they are not hashable
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"DriverRecord({self.to_dict()!r})"
+
+
+_FIELD_SET = frozenset(FIELDS)
+
+
+class CategoryView:
+    """
+    Read-only sequence of the records of one category.
+
+    Holds offsets into the store instead of copies of the records, and
+    follows records added to the store later.
+    """
+    __slots__ = ("_records", "_offsets")
+
+    def __init__(self, records: List[DriverRecord], offsets: array):
+        self._records = records
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __bool__(self) -> bool:
+        return len(self._offsets) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._records[offset] for offset in self._offsets[index]]
+        return self._records[self._offsets[index]]
+
+    def __iter__(self) -> Iterator[DriverRecord]:
+        records = self._records
+        for offset in self._offsets:
+            yield records[offset]
+
+    def __repr__(self) -> str:
+        return f"CategoryView({len(self)} records)"
+
+
+class DriverStore:
+    """
+    Canonical list of driver records with per-category views.
+
+    Also answers the dictionary calls the pages used on their
+    category -> list mappings (get, keys, values, items).
+    """
+
+    def __init__(self, records: Iterable[Any] = ()):
+        self._records: List[DriverRecord] = []
+        self._categories: Dict[str, array] = {}
+        self._identities: Dict[Tuple[Any, ...], int] = {}
+        self.extend(records)
+
+    @classmethod
+    def from_grouped(cls, grouped: Dict[str, Iterable[Any]]) -> "DriverStore":
+        """
+        Build a store from a category -> drivers mapping.
+
+        Args:
+            grouped: Mapping such as the cached "drivers_data" payload.
+
+        Returns:
+            A new store holding every driver of the mapping.
+        """
+        store = cls()
+        for drivers in grouped.values():
+            store.extend(drivers)
+        return store
+
+    def add(self, driver: Any) -> int:
+        """
+        Add a driver, skipping duplicates of a driver already stored.
+
+        Args:
+            driver: DriverRecord or driver dictionary.
+
+        Returns:
+            The offset of the record in the store.
+        """
+        record = DriverRecord.from_dict(driver)
+        identity = record.identity
+        offset = self._identities.get(identity)
+        if offset is not None:
+            return offset
+
+        offset = len(self._records)
+        self._records.append(record)
+        self._identities[identity] = offset
+        category = record.get("category") or "unknown"
+        self._categories.setdefault(category, array("I")).append(offset)
+        return offset
+
+    def extend(self, drivers: Iterable[Any]) -> List[DriverRecord]:
+        """
+        Add several drivers.
+
+        Returns:
+            The stored records, in the order given.
+        """
+        return [self._records[self.add(driver)] for driver in drivers]
+
+    def category(self, key: str) -> CategoryView:
+        """Return the view of one category (empty when unknown)."""
+        return CategoryView(self._records, self._categories.get(key, array("I")))
+
+    def to_payload(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the records grouped by category as plain dictionaries."""
+        return {key: [record.to_dict() for record in self.category(key)]
+                for key in self._categories}
+
+    def records(self) -> List[DriverRecord]:
+        """Return every record, in insertion order."""
+        return list(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[DriverRecord]:
+        return iter(self._records)
+
+    def __getitem__(self, offset: int) -> DriverRecord:
+        return self._records[offset]
+
+    # Mapping interface over the categories
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._categories:
+            return self.category(key)
+        return default
+
+    def keys(self) -> List[str]:
+        return list(self._categories)
+
+    def values(self) -> List[CategoryView]:
+        return [self.category(key) for key in self._categories]
+
+    def items(self) -> List[Tuple[str, CategoryView]]:
+        return [(key, self.category(key)) for key in self._categories]
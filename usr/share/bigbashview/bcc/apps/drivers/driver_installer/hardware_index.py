@@ -0,0 +1,331 @@
+"""
+Hardware Index Module
+
+This module compiles the driver catalog (device-ids, firmware, printer and
+scanner directories) into a single versioned index file, and loads it back
+so hardware IDs can be resolved with one dictionary probe per device.
+
+The index is generated at package build time:
+
+    python3 -m driver_installer.hardware_index build
+
+When the index is missing, belongs to an older format or is older than any
+catalog directory or file, the loader falls back to walking the catalog in
+memory.
+"""
+import os
+import sys
+import json
+import logging
+from typing import Dict, Iterator, List, Any, Optional
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the generated file changes
+INDEX_VERSION = 1
+
+DRIVERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_FILE = os.path.join(DRIVERS_DIR, "hardware-index.json")
+
+# Catalog directories compiled into the index
+CATALOG_DIRS = ("device-ids", "firmware", "printer", "scanner")
+
+# ID list files inside each device-ids module and the bus they describe
+ID_FILES = {
+    "pci.ids": "pci",
+    "usb.ids": "usb",
+    "sdio.ids": "sdio"
+}
+
+_loaded_index: Optional[Dict[str, Any]] = None
+_loaded_mtime: float = 0.0
+
+
+def make_key(bus: str, vendor: str, device: str) -> str:
+    """
+    Build the normalized lookup key for a device.
+
+    Args:
+        bus: Bus name ("pci", "usb" or "sdio").
+        vendor: Vendor ID, with or without a "0x" prefix.
+        device: Device ID, with or without a "0x" prefix, or "*".
+
+    Returns:
+        Key in the form "bus:vendor:device" in lowercase.
+    """
+    vendor = vendor.strip().lower()
+    device = device.strip().lower()
+    if vendor.startswith("0x"):
+        vendor = vendor[2:]
+    if device.startswith("0x"):
+        device = device[2:]
+    return f"{bus.lower()}:{vendor}:{device}"
+
+
+def _read_text(path: str, default: str = "") -> str:
+    """Read a small catalog file, returning a default when it is missing."""
+    try:
+        with open(path, 'r', errors='replace') as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def _list_entries(directory: str) -> List[str]:
+    """Return the sorted names of the subdirectories of a catalog directory."""
+    try:
+        return sorted(entry.name for entry in os.scandir(directory) if entry.is_dir())
+    except OSError:
+        return []
+
+
+def _catalog_mtimes(base_dir: str) -> Iterator[float]:
+    """Yield the mtime of every catalog directory, entry directory and file."""
+    for catalog in CATALOG_DIRS:
+        root = os.path.join(base_dir, catalog)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                yield os.stat(current).st_mtime
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            yield entry.stat().st_mtime
+            except OSError:
+                continue
+
+
+def catalog_mtime(base_dir: str = DRIVERS_DIR) -> float:
+    """
+    Get the newest modification time found in the catalog directories.
+
+    Args:
+        base_dir: Directory holding the catalog directories.
+
+    Returns:
+        The newest mtime of any catalog directory, entry directory or file.
+    """
+    return max(_catalog_mtimes(base_dir), default=0.0)
+
+
+def catalog_changed_since(stamp: float, base_dir: str = DRIVERS_DIR) -> bool:
+    """
+    Check whether anything in the catalog was modified after a build stamp.
+
+    Entry files edited in place (pci.ids, pkg, description...) do not touch
+    the mtime of any directory, so every file is checked; the walk stops at
+    the first newer one.
+
+    Args:
+        stamp: catalog_mtime() recorded when the index was built.
+        base_dir: Directory holding the catalog directories.
+
+    Returns:
+        True when a catalog directory or file is newer than stamp.
+    """
+    return any(mtime > stamp for mtime in _catalog_mtimes(base_dir))
+
+
+def compile_index(base_dir: str = DRIVERS_DIR) -> Dict[str, Any]:
+    """
+    Walk the catalog directories and build the index structure.
+
+    Args:
+        base_dir: Directory holding the catalog directories.
+
+    Returns:
+        Dictionary with the "ids", "modules", "firmware", "printer" and
+        "scanner" tables.
+    """
+    ids: Dict[str, List[str]] = {}
+    modules: Dict[str, Dict[str, Any]] = {}
+    firmware: Dict[str, Dict[str, Any]] = {}
+    printer: Dict[str, str] = {}
+    scanner: Dict[str, str] = {}
+
+    device_ids_dir = os.path.join(base_dir, "device-ids")
+    for module in _list_entries(device_ids_dir):
+        module_dir = os.path.join(device_ids_dir, module)
+        buses = []
+        for file_name, bus in ID_FILES.items():
+            id_file = os.path.join(module_dir, file_name)
+            if not os.path.exists(id_file):
+                continue
+            buses.append(bus)
+            for line in _read_text(id_file).splitlines():
+                parts = line.strip().split(':')
+                if len(parts) < 2 or not parts[0]:
+                    continue
+                key = make_key(bus, parts[0], parts[1] or "*")
+                owners = ids.setdefault(key, [])
+                if module not in owners:
+                    owners.append(module)
+
+        modules[module] = {
+            "category": _read_text(os.path.join(module_dir, "category"), "unknown"),
+            "package": _read_text(os.path.join(module_dir, "pkg"), module),
+            "description": _read_text(os.path.join(module_dir, "description")),
+            "buses": buses
+        }
+
+    firmware_dir = os.path.join(base_dir, "firmware")
+    for pkg in _list_entries(firmware_dir):
+        pkg_dir = os.path.join(firmware_dir, pkg)
+        files = [line.strip() for line in _read_text(os.path.join(pkg_dir, pkg)).splitlines()
+                 if line.strip() and not line.startswith('#')]
+        firmware[pkg] = {
+            "category": _read_text(os.path.join(pkg_dir, "category"), "firmware"),
+            "description": _read_text(os.path.join(pkg_dir, "description")),
+            "files": files
+        }
+
+    for catalog, table in (("printer", printer), ("scanner", scanner)):
+        catalog_dir = os.path.join(base_dir, catalog)
+        for pkg in _list_entries(catalog_dir):
+            table[pkg] = _read_text(os.path.join(catalog_dir, pkg, "description"))
+
+    return {
+        "version": INDEX_VERSION,
+        "ids": ids,
+        "modules": modules,
+        "firmware": firmware,
+        "printer": printer,
+        "scanner": scanner
+    }
+
+
+def build_index(base_dir: str = DRIVERS_DIR, output: str = INDEX_FILE) -> Dict[str, Any]:
+    """
+    Compile the catalog and write the index file atomically.
+
+    Args:
+        base_dir: Directory holding the catalog directories.
+        output: Path of the index file to write.
+
+    Returns:
+        The compiled index.
+    """
+    index = compile_index(base_dir)
+    index["catalog_mtime"] = catalog_mtime(base_dir)
+
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, output)
+
+    logger.info(f"Hardware index written to {output} ({len(index['ids'])} IDs)")
+    return index
+
+
+def _read_index_file(path: str, base_dir: str) -> Optional[Dict[str, Any]]:
+    """Read the index file, returning None when it is missing or stale."""
+    try:
+        with open(path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Hardware index not usable ({path}): {e}")
+        return None
+
+    if index.get("version") != INDEX_VERSION:
+        logger.info(f"Hardware index version mismatch in {path}, walking catalog")
+        return None
+
+    if catalog_changed_since(index.get("catalog_mtime", 0), base_dir):
+        logger.info(f"Hardware index {path} is older than the catalog, walking catalog")
+        return None
+
+    return index
+
+
+def load_index(base_dir: str = DRIVERS_DIR, path: str = INDEX_FILE) -> Dict[str, Any]:
+    """
+    Load the hardware index, compiling it in memory when the file is stale.
+
+    The result is kept for the lifetime of the process and reloaded only
+    when the index file changes on disk.
+
+    Args:
+        base_dir: Directory holding the catalog directories.
+        path: Path of the prebuilt index file.
+
+    Returns:
+        The hardware index dictionary.
+    """
+    global _loaded_index, _loaded_mtime
+
+    try:
+        file_mtime = os.stat(path).st_mtime
+    except OSError:
+        file_mtime = 0.0
+
+    if _loaded_index is not None and file_mtime == _loaded_mtime:
+        return _loaded_index
+
+    index = _read_index_file(path, base_dir) if file_mtime else None
+    if index is None:
+        index = compile_index(base_dir)
+
+    _loaded_index = index
+    _loaded_mtime = file_mtime
+    return index
+
+
+def lookup(bus: str, vendor: str, device: str,
+           index: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Find the device-ids modules that support a device.
+
+    Args:
+        bus: Bus name ("pci", "usb" or "sdio").
+        vendor: Vendor ID.
+        device: Device ID.
+        index: Index to search, loaded on demand when not given.
+
+    Returns:
+        List of module names, exact matches first, then vendor wildcards.
+    """
+    if index is None:
+        index = load_index()
+    ids = index["ids"]
+    modules = list(ids.get(make_key(bus, vendor, device), ()))
+    for module in ids.get(make_key(bus, vendor, "*"), ()):
+        if module not in modules:
+            modules.append(module)
+    return modules
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: build, check or dump the index."""
+    command = argv[1] if len(argv) > 1 else "build"
+    base_dir = argv[2] if len(argv) > 2 else DRIVERS_DIR
+    output = argv[3] if len(argv) > 3 else os.path.join(base_dir, "hardware-index.json")
+
+    if command == "build":
+        index = build_index(base_dir, output)
+        print(f"{output}: {len(index['ids'])} IDs, {len(index['modules'])} modules")
+        return 0
+
+    if command == "check":
+        # Exit status 0 when the index file is current, 1 otherwise
+        return 0 if _read_index_file(output, base_dir) is not None else 1
+
+    if command == "ids":
+        # Tab separated "key<TAB>module" lines for shell consumers
+        index = load_index(base_dir, output)
+        for key, owners in sorted(index["ids"].items()):
+            for module in owners:
+                print(f"{key}\t{module}")
+        return 0
+
+    print(f"Usage: {os.path.basename(argv[0])} [build|check|ids] [catalog_dir] [index_file]",
+          file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv))
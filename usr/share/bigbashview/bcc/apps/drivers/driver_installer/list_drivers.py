@@ -0,0 +1,238 @@
+"""
+Driver Catalog Listing
+
+This module lists the driver catalog (device-ids, firmware, printer and
+scanner directories) as the JSON array read by the installer page and the
+bash pages, in a single pass: the catalog comes from the hardware index
+(one directory walk when the prebuilt index is stale), the installed flags
+from one read of the pacman local database and the loaded flags from one
+read of /proc/modules, and the result is serialized once.
+
+It replaces the per-entry cat/pacman/jq calls of list_drivers.sh, which is
+now a wrapper around it, and keeps its output contract:
+
+    python3 driver_installer/list_drivers.py            # JSON array on stdout
+    python3 driver_installer/list_drivers.py --stream   # one object per line
+
+Both write the array to /tmp/drivers_list.json.
+"""
+import os
+import re
+import sys
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+OUTPUT_FILE = "/tmp/drivers_list.json"
+PROC_MODULES = "/proc/modules"
+
+# Labels of the catalog category keys, as shown by the pages
+CATEGORY_LABELS = {
+    "gpu": "Placa de vídeo",
+    "wifi": "Wifi",
+    "ethernet": "Rede Cabeada",
+    "bluetooth": "Bluetooth",
+    "printer": "Impressora",
+    "printer3d": "Impressora 3D",
+    "scanner": "Scanner",
+    "dvb": "TV Digital",
+    "webcam": "Webcam",
+    "touchscreen": "Touchscreen",
+    "sound": "Som",
+    "firmware": "Firmware (Geral)"
+}
+
+# Emitted when the device-ids catalog yields nothing, so the list is never empty
+DEFAULT_DEVICE = {
+    "id": "default_example",
+    "name": "Exemplo",
+    "description": "Driver de exemplo (gerado automaticamente)",
+    "category": "unknown",
+    "category_label": "Outros",
+    "package": "exemplo-driver",
+    "type": "unknown",
+    "loaded": False,
+    "installed": False,
+    "source": "device-ids"
+}
+
+# Written instead of an empty list
+FALLBACK_DEVICE = {
+    "id": "example_device",
+    "name": "Dispositivo de Exemplo",
+    "description": "Este é um dispositivo de exemplo gerado quando nenhum driver foi encontrado",
+    "category": "unknown",
+    "category_label": "Outros",
+    "package": "example-package",
+    "type": "unknown",
+    "installed": False,
+    "source": "fallback"
+}
+
+
+def category_label(category_key: str) -> str:
+    """Map a catalog category key to its label."""
+    return CATEGORY_LABELS.get(category_key, "Outros")
+
+
+def clean_description(text: str) -> str:
+    """Join the lines of a description file into one line with single spaces."""
+    return re.sub(r" +", " ", " ".join(line.strip() for line in text.splitlines())).strip()
+
+
+def _loaded_modules(proc_modules: str = PROC_MODULES) -> Set[str]:
+    """Read the names of the loaded kernel modules once."""
+    try:
+        with open(proc_modules, 'r') as f:
+            return {line.split(' ', 1)[0] for line in f if line.strip()}
+    except OSError as e:
+        logger.warning(f"Error reading loaded modules: {e}")
+        return set()
+
+
+def _brand_and_model(pkg: str) -> Tuple[str, str]:
+    """Split a printer/scanner package name such as "brother-dcp1617nw" in brand and model."""
+    brand, _, model = pkg.partition('-')
+    return brand, model or pkg
+
+
+def iter_drivers(index: Dict[str, Any], installed: Set[str], loaded: Set[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Build the driver objects of the catalog.
+
+    Args:
+        index: Hardware index, see hardware_index.load_index().
+        installed: Names of the installed packages.
+        loaded: Names of the loaded kernel modules.
+
+    Yields:
+        One dictionary per catalog entry: device-ids, firmware, printers,
+        then scanners.
+    """
+    count = 0
+    for module, info in sorted(index["modules"].items()):
+        category = info.get("category") or "unknown"
+        label = category_label(category)
+        package = info.get("package") or module
+        buses = info.get("buses") or []
+        bus_type = buses[-1] if buses else "unknown"
+        count += 1
+        yield {
+            "id": f"{bus_type}_{module}",
+            "name": module,
+            "description": clean_description(info.get("description") or f"Driver para {module} ({label})"),
+            "category": category,
+            "category_label": label,
+            "package": package,
+            "type": bus_type,
+            "loaded": module.replace('-', '_') in loaded,
+            "installed": package in installed,
+            "source": "device-ids"
+        }
+    if not count:
+        logger.warning("No device-ids entry in the catalog")
+        yield dict(DEFAULT_DEVICE)
+
+    for pkg, info in sorted(index["firmware"].items()):
+        category = info.get("category") or "firmware"
+        label = category_label(category)
+        yield {
+            "id": f"firmware_{pkg}",
+            "name": pkg,
+            "description": clean_description(info.get("description") or f"Firmware {label} para {pkg}"),
+            "category": category,
+            "category_label": label,
+            "package": pkg,
+            "type": "firmware",
+            "installed": pkg in installed,
+            "firmware_files": list(info.get("files") or []),
+            "source": "firmware"
+        }
+
+    for catalog, kind in (("printer", "impressora"), ("scanner", "scanner")):
+        for pkg, description in sorted(index[catalog].items()):
+            brand, model = _brand_and_model(pkg)
+            yield {
+                "id": f"{catalog}_{pkg}",
+                "name": pkg,
+                "description": clean_description(description) if description else f"Driver para {kind} {brand} {model}",
+                "category": catalog,
+                "category_label": category_label(catalog),
+                "package": pkg,
+                "type": catalog,
+                "installed": pkg in installed,
+                "source": catalog
+            }
+
+
+def list_drivers(base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    List the driver catalog with the installed and loaded flags.
+
+    Args:
+        base_dir: Directory holding the catalog directories; the one this
+            module is installed in by default.
+
+    Returns:
+        The driver objects, as written to OUTPUT_FILE.
+    """
+    # Imported here: the command line entry point sets up sys.path first
+    from common.package_state import get_package_state
+    from driver_installer import hardware_index
+
+    index = hardware_index.load_index(base_dir or hardware_index.DRIVERS_DIR)
+    installed = set(get_package_state().installed_packages())
+    return list(iter_drivers(index, installed, _loaded_modules()))
+
+
+def write_output(drivers: List[Dict[str, Any]], path: str = OUTPUT_FILE) -> None:
+    """
+    Write the driver array atomically.
+
+    Args:
+        drivers: Driver objects; an empty list is written as FALLBACK_DEVICE.
+        path: File to write.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(drivers or [FALLBACK_DEVICE], f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write {path}: {e}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: print the catalog as a JSON array or, with --stream, one object per line."""
+    if any(arg != "--stream" for arg in argv[1:]):
+        print(f"Usage: {os.path.basename(argv[0])} [--stream]", file=sys.stderr)
+        return 2
+
+    drivers = list_drivers()
+    if "--stream" in argv:
+        sys.stdout.writelines(
+            json.dumps(driver, ensure_ascii=False, separators=(',', ':')) + "\n" for driver in drivers
+        )
+    else:
+        json.dump(drivers or [FALLBACK_DEVICE], sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    sys.stdout.flush()
+
+    write_output(drivers)
+    logger.info(f"Listed {len(drivers)} drivers")
+    return 0
+
+
+if __name__ == "__main__":
+    # Allow running as a script from the bash pages
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
@@ -0,0 +1,361 @@
+"""
+MHWD Adapter Module
+
+This module is the single place that runs mhwd to list driver configs.
+Each listing mode ("mhwd -la", "mhwd -l" and "mhwd -li") runs at most once
+per snapshot, the three in parallel, and the outputs are merged into one
+typed record per config.
+
+Snapshots are kept in memory and in the scan cache directory, keyed by the
+hardware fingerprint and the mhwd database mtimes, so the Python listers,
+the GTK pages and the legacy bash pages share the same results. Bash pages
+read them through the command line:
+
+    python3 driver_installer/mhwd_adapter.py tsv
+
+which prints "name version free type installed compatible classes" lines
+separated by tabs; the first four columns match "mhwd -la". The devices
+each compatible config matched, as listed by "mhwd -l", are printed by:
+
+    python3 driver_installer/mhwd_adapter.py devices
+
+as "name class:vendor:device device-name" lines separated by tabs.
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import logging
+import subprocess
+import threading
+from typing import Dict, List, Any, NamedTuple, Optional, Set, Tuple
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Directories holding the available and the installed mhwd configs
+MHWD_DB_DIR = "/var/lib/mhwd/db"
+MHWD_LOCAL_DIR = "/var/lib/mhwd/local"
+
+# Scan cache entry name of the snapshot
+CACHE_NAME = "mhwd"
+
+# Upper bound for each mhwd call
+MHWD_TIMEOUT = 30
+
+# Listing modes and the options that produce them
+MODES = {
+    "all": "-la",
+    "compatible": "-l",
+    "installed": "-li"
+}
+
+# "> 0000:01:00.0 (0300:10de:1c82) Display controller nVidia Corporation:"
+DEVICE_PATTERN = re.compile(r"\(([0-9a-fA-F]{4}):([0-9a-fA-F]{4}):([0-9a-fA-F]{4})\)\s*(.*?):?\s*$")
+# "     video-nvidia-470xx            2023.03.23               false            PCI"
+CONFIG_PATTERN = re.compile(r"^\s*([A-Za-z0-9_.-]+)\s+(\S+)\s+(true|false)\s+(\S+)\s*$")
+_ANSI_PATTERN = re.compile(r'\x1B\[[0-9;]*[mG]')
+
+
+class MhwdDevice(NamedTuple):
+    """A device mhwd matched a config for, as printed by "mhwd -l"."""
+    class_id: str
+    vendor: str
+    device: str
+    name: str
+
+
+class MhwdConfig(NamedTuple):
+    """A merged mhwd config record."""
+    name: str
+    version: str
+    free: bool
+    bus_type: str
+    installed: bool
+    compatible: bool
+    devices: Tuple[MhwdDevice, ...] = ()
+
+    @property
+    def class_ids(self) -> Tuple[str, ...]:
+        """PCI class codes of the devices the config is compatible with."""
+        return tuple(sorted({device.class_id for device in self.devices}))
+
+
+_lock = threading.Lock()
+_snapshot_key: Optional[str] = None
+_snapshot: Dict[str, MhwdConfig] = {}
+
+
+def _mtime(path: str) -> float:
+    """Return the mtime of a path, or 0 when it does not exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def is_available() -> bool:
+    """Check whether mhwd is installed."""
+    return shutil.which("mhwd") is not None
+
+
+def installed_configs() -> Set[str]:
+    """
+    Get the names of the installed configs without running mhwd.
+
+    Returns:
+        Config names found in the mhwd local database.
+    """
+    names: Set[str] = set()
+    for bus_type in ("pci", "usb"):
+        try:
+            names.update(os.listdir(os.path.join(MHWD_LOCAL_DIR, bus_type)))
+        except OSError:
+            continue
+    return names
+
+
+def _fingerprint() -> str:
+    """Key the snapshot by the hardware/package state and the mhwd databases."""
+    # Imported here: scan_cache depends on hardware_detector, which uses this module
+    from driver_installer import scan_cache
+
+    state = [scan_cache.compute_fingerprint(), _mtime(MHWD_DB_DIR), _mtime(MHWD_LOCAL_DIR)]
+    return hashlib.sha256(json.dumps(state).encode('utf-8')).hexdigest()
+
+
+def _run_modes() -> Tuple[Dict[str, str], List[str]]:
+    """
+    Run every listing mode in parallel.
+
+    Returns:
+        Tuple of (cleaned output per mode, modes that timed out, could not
+        run or exited with an error).
+    """
+    # Imported here: the command line entry point sets up sys.path first
+    from common.command_runner import get_command_runner
+
+    runner = get_command_runner()
+    futures = {
+        mode: runner.submit(runner.run(["mhwd", option], timeout=MHWD_TIMEOUT, text=True))
+        for mode, option in MODES.items()
+    }
+
+    outputs = {}
+    failed = []
+    for mode, future in futures.items():
+        try:
+            result = future.result()
+        except subprocess.TimeoutExpired:
+            logger.error(f"mhwd {MODES[mode]} timed out after {MHWD_TIMEOUT}s")
+            failed.append(mode)
+            continue
+        except OSError as e:
+            logger.error(f"Error running mhwd {MODES[mode]}: {e}")
+            failed.append(mode)
+            continue
+
+        if result.returncode != 0:
+            logger.error(f"Error running mhwd {MODES[mode]}: {result.stderr.strip()}")
+            failed.append(mode)
+        outputs[mode] = _ANSI_PATTERN.sub('', result.stdout)
+
+    return outputs, failed
+
+
+def parse_configs(output: str) -> List[Tuple[str, str, bool, str]]:
+    """
+    Parse the config table of a "mhwd -la" or "mhwd -li" listing.
+
+    Args:
+        output: mhwd output without ANSI colors.
+
+    Returns:
+        List of (name, version, free, bus type) tuples.
+    """
+    configs = []
+    for line in output.splitlines():
+        match = CONFIG_PATTERN.match(line)
+        if match:
+            configs.append((match.group(1), match.group(2), match.group(3) == "true", match.group(4)))
+    return configs
+
+
+def parse_compatible(output: str) -> List[Tuple[MhwdDevice, Tuple[str, str, bool, str]]]:
+    """
+    Parse a "mhwd -l" listing into (device, config) pairs.
+
+    Args:
+        output: mhwd output without ANSI colors.
+
+    Returns:
+        List of (device, (name, version, free, bus type)) pairs in output order.
+    """
+    pairs = []
+    device = None
+    for line in output.splitlines():
+        device_match = DEVICE_PATTERN.search(line)
+        if device_match:
+            class_id, vendor, device_id = (group.lower() for group in device_match.groups()[:3])
+            device = MhwdDevice(class_id, vendor, device_id, device_match.group(4).strip())
+            continue
+
+        config_match = CONFIG_PATTERN.match(line)
+        if config_match and device is not None:
+            pairs.append((device, (config_match.group(1), config_match.group(2),
+                                   config_match.group(3) == "true", config_match.group(4))))
+    return pairs
+
+
+def merge_outputs(outputs: Dict[str, str]) -> Dict[str, MhwdConfig]:
+    """
+    Merge the outputs of the listing modes into config records.
+
+    Args:
+        outputs: Cleaned output per mode ("all", "compatible", "installed").
+
+    Returns:
+        Dictionary of config name to record, in listing order.
+    """
+    rows: Dict[str, Tuple[str, bool, str]] = {}
+    for name, version, free, bus_type in parse_configs(outputs.get("all", "")):
+        rows.setdefault(name, (version, free, bus_type))
+
+    installed = set()
+    for name, version, free, bus_type in parse_configs(outputs.get("installed", "")):
+        installed.add(name)
+        rows.setdefault(name, (version, free, bus_type))
+
+    devices: Dict[str, List[MhwdDevice]] = {}
+    for device, (name, version, free, bus_type) in parse_compatible(outputs.get("compatible", "")):
+        rows.setdefault(name, (version, free, bus_type))
+        if device not in devices.setdefault(name, []):
+            devices[name].append(device)
+
+    configs = {}
+    for name, (version, free, bus_type) in rows.items():
+        configs[name] = MhwdConfig(
+            name=name,
+            version=version,
+            free=free,
+            bus_type=bus_type,
+            installed=name in installed,
+            compatible=name in devices,
+            devices=tuple(devices.get(name, ()))
+        )
+    return configs
+
+
+def _to_payload(configs: Dict[str, MhwdConfig]) -> List[Dict[str, Any]]:
+    """Convert records to the JSON layout stored in the scan cache."""
+    payload = []
+    for config in configs.values():
+        entry = config._asdict()
+        entry["devices"] = [device._asdict() for device in config.devices]
+        payload.append(entry)
+    return payload
+
+
+def _from_payload(payload: List[Dict[str, Any]]) -> Dict[str, MhwdConfig]:
+    """Rebuild records from the scan cache layout."""
+    configs = {}
+    for entry in payload:
+        devices = tuple(MhwdDevice(**device) for device in entry.get("devices", ()))
+        configs[entry["name"]] = MhwdConfig(**{**entry, "devices": devices})
+    return configs
+
+
+def load_configs(use_cache: bool = True) -> Dict[str, MhwdConfig]:
+    """
+    Get every mhwd config, running mhwd only when no snapshot is current.
+
+    Args:
+        use_cache: Reuse the in-memory and on-disk snapshots when current.
+
+    Returns:
+        Dictionary of config name to record; empty when mhwd is missing.
+    """
+    global _snapshot_key, _snapshot
+
+    if not is_available():
+        return {}
+
+    # Imported here for the same reason as in _fingerprint()
+    from driver_installer import scan_cache
+
+    with _lock:
+        key = _fingerprint()
+        if use_cache and key == _snapshot_key:
+            return _snapshot
+
+        if use_cache:
+            payload = scan_cache.load(CACHE_NAME, key)
+            if payload is not None:
+                try:
+                    _snapshot, _snapshot_key = _from_payload(payload), key
+                    return _snapshot
+                except (KeyError, TypeError) as e:
+                    logger.warning(f"Discarding malformed mhwd snapshot: {e}")
+
+        outputs, failed = _run_modes()
+        configs = merge_outputs(outputs)
+        if failed:
+            # A partial listing is returned but not kept, so the next call retries
+            logger.warning(f"Not caching the mhwd snapshot, failed modes: {failed}")
+            return configs
+        scan_cache.store(CACHE_NAME, key, _to_payload(configs))
+        _snapshot, _snapshot_key = configs, key
+        return configs
+
+
+def invalidate() -> None:
+    """Forget the current snapshot, e.g. after installing or removing a config."""
+    global _snapshot_key
+
+    from driver_installer import scan_cache
+
+    with _lock:
+        _snapshot_key = None
+        scan_cache.invalidate(CACHE_NAME)
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: print the snapshot as TSV or JSON."""
+    command = argv[1] if len(argv) > 1 else "tsv"
+    configs = load_configs(use_cache="--refresh" not in argv)
+
+    if command == "tsv":
+        for config in configs.values():
+            print("\t".join((
+                config.name,
+                config.version,
+                "true" if config.free else "false",
+                config.bus_type,
+                "true" if config.installed else "false",
+                "true" if config.compatible else "false",
+                ",".join(config.class_ids)
+            )))
+        return 0
+
+    if command == "devices":
+        for config in configs.values():
+            for device in config.devices:
+                print(f"{config.name}\t{device.class_id}:{device.vendor}:{device.device}\t{device.name}")
+        return 0
+
+    if command == "json":
+        json.dump(_to_payload(configs), sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    print(f"Usage: {os.path.basename(argv[0])} [tsv|devices|json] [--refresh]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    # Allow running as a script from the bash pages
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
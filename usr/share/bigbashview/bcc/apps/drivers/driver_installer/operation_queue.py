@@ -0,0 +1,297 @@
+"""
+Driver Operation Queue
+
+This module collects the driver installs and removals chosen in the
+installer page and applies them as one privileged batch. A single pkexec
+call (one authentication) runs one pacman removal, one pacman install
+transaction and one mhwd call per configuration, so installing every
+recommended driver resolves dependencies, downloads and commits only once.
+
+Before authentication, the packages of the pacman install are resolved and
+downloaded in parallel without privileges (see common.package_prefetch), so
+the privileged transaction only verifies and installs files already on disk.
+
+Progress is read from the output while the batch runs: step markers
+printed between the commands tell which step is running, and the pacman
+output of each step (mhwd runs pacman too) gives the fraction inside it.
+The markers also time the steps, so the time spent at the password prompt
+never counts against a step.
+"""
+import re
+import time
+import shlex
+import asyncio
+import logging
+import threading
+import subprocess
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+from common import package_prefetch
+from common.command_runner import get_command_runner
+from common.pacman_progress import PacmanProgress
+from driver_installer import mhwd_adapter
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+INSTALL = "install"
+REMOVE = "remove"
+
+# Printed by the batch script before each step and at the end
+STEP_MARKER = "::driver-manager-step"
+
+# Lines of the pacman commit phase, e.g. "(2/5) installing nvidia-utils..."
+_PACMAN_ACTION = re.compile(r"^\(\s*\d+/\d+\)\s+(?:installing|reinstalling|upgrading|removing)\s+(\S+?)(?:\.\.\.|\s|$)")
+
+# Share of the progress bar taken by the unprivileged download, when there is one
+PREFETCH_SHARE = 0.4
+
+# Lines of output kept for the error report
+OUTPUT_TAIL_LINES = 40
+
+# Seconds between two checks of the running step against its timeout
+WATCHDOG_INTERVAL = 1.0
+
+
+class Operation(NamedTuple):
+    """One queued install or removal."""
+    action: str
+    package: str
+    source: str
+
+    @classmethod
+    def from_driver(cls, action: str, driver_info: Dict[str, Any]) -> Optional["Operation"]:
+        """
+        Build an operation from a driver dictionary of the installer page.
+
+        Args:
+            action: INSTALL or REMOVE.
+            driver_info: Driver with "package" and "source" ("mhwd", "mhwd-free",
+                "mhwd-nonfree" or a repository).
+
+        Returns:
+            The operation, or None when the driver has no package name.
+        """
+        package = driver_info.get('package')
+        if not package:
+            return None
+        source = driver_info.get('source') or ""
+        return cls(action, package, "mhwd" if source.startswith("mhwd") else "pacman")
+
+
+class Step(NamedTuple):
+    """One command of a batch and the operations it applies."""
+    args: Tuple[str, ...]
+    operations: Tuple[Operation, ...]
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a committed batch."""
+    success: bool
+    done: Tuple[Operation, ...]
+    failed: Tuple[Operation, ...]
+    output: str
+
+
+def plan(operations: List[Operation], cachedir_args: Sequence[str] = (),
+         mhwd_buses: Optional[Mapping[str, str]] = None) -> List[Step]:
+    """
+    Resolve operations into the commands of one batch.
+
+    Removals run first, so a package can be swapped for another one (e.g. a
+    driver replacing a conflicting one) in the same batch.
+
+    Args:
+        operations: Operations to apply, at most one per package.
+        cachedir_args: Extra --cachedir options of the pacman install, so it
+            finds the prefetched files.
+        mhwd_buses: Bus ("pci" or "usb") of each mhwd config; "pci" when
+            a config is not listed.
+
+    Returns:
+        Steps in execution order.
+    """
+    def of(action: str, source: str) -> Tuple[Operation, ...]:
+        return tuple(op for op in operations if op.action == action and op.source == source)
+
+    def bus(op: Operation) -> str:
+        return (mhwd_buses or {}).get(op.package, "pci")
+
+    steps = [Step(("mhwd", "-r", bus(op), op.package, "--noconfirm"), (op,)) for op in of(REMOVE, "mhwd")]
+    removals = of(REMOVE, "pacman")
+    if removals:
+        steps.append(Step(("pacman", "-Rns", "--noconfirm") + tuple(op.package for op in removals), removals))
+    installs = of(INSTALL, "pacman")
+    if installs:
+        steps.append(Step(("pacman", "-S", "--needed", "--noconfirm") + tuple(cachedir_args)
+                           + tuple(op.package for op in installs), installs))
+    steps.extend(Step(("mhwd", "-i", bus(op), op.package, "--noconfirm"), (op,)) for op in of(INSTALL, "mhwd"))
+    return steps
+
+
+def batch_command(steps: List[Step]) -> List[str]:
+    """
+    Build the single privileged command running all the steps.
+
+    Args:
+        steps: Steps returned by plan().
+
+    Returns:
+        pkexec command line; it stops at the first failing step.
+    """
+    lines = ["set -e", "export LC_ALL=C"]
+    for index, step in enumerate(steps):
+        lines.append(f"echo '{STEP_MARKER} {index}'")
+        lines.append(shlex.join(step.args))
+    lines.append(f"echo '{STEP_MARKER} {len(steps)}'")
+    return ["pkexec", "/bin/sh", "-c", "\n".join(lines)]
+
+
+class OperationQueue:
+    """Pending driver operations, applied in batches."""
+
+    def __init__(self) -> None:
+        """Initialize an empty queue."""
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Operation] = {}
+
+    def add(self, operation: Operation) -> None:
+        """Queue an operation; a later one for the same package replaces it."""
+        with self._lock:
+            self._pending.pop(operation.package, None)
+            self._pending[operation.package] = operation
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def take(self) -> List[Operation]:
+        """Remove and return all pending operations, in the order they were queued."""
+        with self._lock:
+            operations = list(self._pending.values())
+            self._pending.clear()
+            return operations
+
+
+async def commit(operations: List[Operation],
+                 on_progress: Optional[Callable[[float, int, int, str], None]] = None,
+                 step_timeout: Optional[float] = None) -> BatchResult:
+    """
+    Apply operations as one privileged batch.
+
+    Args:
+        operations: Operations to apply.
+        on_progress: Called with (fraction, packages done, total packages,
+            message) for every downloaded file and every output line that
+            moves the batch forward, from the download threads or the
+            command runner loop.
+        step_timeout: Seconds allowed per step, counted from the step
+            marker, so authentication is not included; None for no limit.
+
+    Returns:
+        The operations applied and the ones that failed or never ran.
+    """
+    installs = [op.package for op in operations if op.action == INSTALL and op.source == "pacman"]
+    mhwd_buses: Dict[str, str] = {}
+    if any(op.source == "mhwd" for op in operations):
+        # The snapshot is normally current; running mhwd would block the loop
+        configs = await asyncio.get_running_loop().run_in_executor(None, mhwd_adapter.load_configs)
+        mhwd_buses = {name: config.bus_type.lower() for name, config in configs.items() if config.bus_type}
+    steps = plan(operations, package_prefetch.cachedir_args() if installs else (), mhwd_buses)
+    total = sum(len(step.operations) for step in steps)
+    if not steps:
+        return BatchResult(True, (), (), "")
+
+    output: List[str] = []
+    completed_steps = 0
+    step_started: Optional[float] = None
+    step_progress = PacmanProgress()
+    seen: Set[str] = set()
+    prefetch_share = PREFETCH_SHARE if installs else 0.0
+
+    def report(message: str) -> None:
+        if on_progress is not None:
+            fraction = (completed_steps + step_progress.fraction) / len(steps)
+            fraction = prefetch_share + (1.0 - prefetch_share) * fraction
+            on_progress(min(fraction, 1.0), min(len(seen), total), total, message)
+
+    def on_download(done: int, count: int, name: str) -> None:
+        if on_progress is not None:
+            on_progress(prefetch_share * done / max(count, 1), 0, total, f"Baixando pacotes ({done}/{count}): {name}")
+
+    def on_line(line: str) -> None:
+        nonlocal completed_steps, step_progress, step_started
+        output.append(line)
+        del output[:-OUTPUT_TAIL_LINES]
+
+        if line.startswith(STEP_MARKER):
+            completed_steps = int(line.split()[-1])
+            step_started = time.monotonic()
+            step_progress = PacmanProgress()
+            for step in steps[:completed_steps]:
+                seen.update(op.package for op in step.operations)
+            if completed_steps < len(steps):
+                step = steps[completed_steps]
+                report(f"{' '.join(step.args[:2])}: {', '.join(op.package for op in step.operations)}")
+            else:
+                report("Concluído")
+            return
+
+        if completed_steps >= len(steps) or not step_progress.feed(line):
+            return
+        match = _PACMAN_ACTION.match(step_progress.message)
+        if match and match.group(1) in (op.package for op in steps[completed_steps].operations):
+            seen.add(match.group(1))
+        report(step_progress.message)
+
+    if installs:
+        if on_progress is not None:
+            on_progress(0.0, 0, total, "Baixando pacotes...")
+        try:
+            prefetched = await asyncio.get_running_loop().run_in_executor(
+                None, package_prefetch.prefetch, installs, on_download
+            )
+            if not prefetched.complete:
+                # Not fatal: pacman downloads whatever is still missing itself
+                logger.warning(f"Prefetch incomplete, failed: {list(prefetched.failed)}, "
+                               f"unresolved: {list(prefetched.unresolved)}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not prefetch driver packages: {e}")
+
+    async def run_batch() -> int:
+        # The timeout of each step starts at its marker: the first one is
+        # printed only after the password prompt
+        command = batch_command(steps)
+        task = asyncio.ensure_future(get_command_runner().stream(command, on_stdout=on_line, on_stderr=on_line))
+        while True:
+            done, _pending = await asyncio.wait({task}, timeout=WATCHDOG_INTERVAL)
+            if done:
+                return task.result()
+            if step_timeout and step_started is not None and time.monotonic() - step_started > step_timeout:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                logger.warning(f"Driver batch step {completed_steps} timed out after {step_timeout}s")
+                raise subprocess.TimeoutExpired(command, step_timeout)
+
+    report(f"Aguardando autenticação para {total} pacote(s)...")
+    logger.info(f"Committing driver batch: {[' '.join(step.args) for step in steps]}")
+    try:
+        returncode = await run_batch()
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.error(f"Driver batch could not run: {e}")
+        output.append(str(e))
+        returncode = -1
+
+    done = tuple(op for step in steps[:completed_steps] for op in step.operations)
+    failed = tuple(op for step in steps[completed_steps:] for op in step.operations)
+    success = returncode == 0 and not failed
+    if success:
+        logger.info(f"Driver batch applied: {[op.package for op in done]}")
+        if installs:
+            package_prefetch.clean()
+    else:
+        logger.error(f"Driver batch failed with code {returncode}, not applied: {[op.package for op in failed]}")
+    return BatchResult(success, done, failed, "\n".join(output))
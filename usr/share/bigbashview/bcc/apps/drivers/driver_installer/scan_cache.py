@@ -0,0 +1,163 @@
+"""
+Scan Cache Module
+
+This module persists driver scan results under $XDG_CACHE_HOME so a warm
+start can paint the previous results immediately and revalidate them in
+the background.
+
+Entries are keyed by a hardware fingerprint built from the sorted PCI/USB/
+SDIO ID set, the hardware index version, the pacman local database mtime
+and the running kernel release. Any of those changing produces a new key,
+so stale results are never served for different hardware or packages.
+"""
+import os
+import json
+import glob
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+
+from common.cache_paths import CACHE_DIR
+from common.package_state import PACMAN_LOCAL_DB
+from driver_installer import hardware_index
+from hardware_detector.detector import list_devices
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the cached payloads changes
+CACHE_FORMAT = 1
+
+
+def _mtime(path: str) -> float:
+    """Return the mtime of a path, or 0 when it does not exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def _hardware_state() -> Dict[str, Any]:
+    """Return the scan inputs that do not depend on the installed packages."""
+    devices = sorted(f"{d['bus']}:{d['vendor']}:{d['device']}" for d in list_devices())
+    return {
+        "format": CACHE_FORMAT,
+        "devices": devices,
+        "index_version": hardware_index.INDEX_VERSION,
+        "index_mtime": _mtime(hardware_index.INDEX_FILE),
+        "kernel": os.uname().release
+    }
+
+
+def _digest(state: Dict[str, Any]) -> str:
+    """Return the hex digest of a fingerprint state."""
+    encoded = json.dumps(state, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def compute_fingerprint() -> str:
+    """
+    Compute the fingerprint of the current hardware and package state.
+
+    Returns:
+        Hex digest identifying the current scan inputs.
+    """
+    state = _hardware_state()
+    state["pacman_local_mtime"] = _mtime(PACMAN_LOCAL_DB)
+    return _digest(state)
+
+
+def compute_hardware_fingerprint() -> str:
+    """
+    Compute the fingerprint of the hardware alone.
+
+    Installing or removing packages does not change it, so a driver
+    operation only needs a full rescan when this changed too.
+
+    Returns:
+        Hex digest identifying the devices, hardware index and kernel.
+    """
+    return _digest(_hardware_state())
+
+
+def _entry_path(name: str, fingerprint: str) -> str:
+    """Return the cache file path of an entry."""
+    return os.path.join(CACHE_DIR, f"{name}-{fingerprint[:32]}.json")
+
+
+def load(name: str, fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a cached scan result.
+
+    Args:
+        name: Cache entry name, one per consumer (e.g. "installer").
+        fingerprint: Fingerprint to look up, computed when not given.
+
+    Returns:
+        The cached payload, or None on a cache miss.
+    """
+    if fingerprint is None:
+        fingerprint = compute_fingerprint()
+
+    path = _entry_path(name, fingerprint)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Discarding unreadable scan cache {path}: {e}")
+        return None
+
+    if entry.get("fingerprint") != fingerprint:
+        return None
+
+    logger.info(f"Scan cache hit for '{name}'")
+    return entry.get("payload")
+
+
+def store(name: str, fingerprint: str, payload: Dict[str, Any]) -> None:
+    """
+    Store a scan result, replacing older entries of the same name.
+
+    Args:
+        name: Cache entry name.
+        fingerprint: Fingerprint the payload was computed for.
+        payload: JSON serializable scan result.
+    """
+    path = _entry_path(name, fingerprint)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": fingerprint, "payload": payload}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write scan cache {path}: {e}")
+        return
+
+    # Only the newest fingerprint of each entry is worth keeping
+    for old_path in glob.glob(os.path.join(CACHE_DIR, f"{name}-*.json")):
+        if old_path != path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+def invalidate(name: str) -> None:
+    """
+    Remove cached scan results, e.g. after installing or removing a driver.
+
+    Only the files of the entry are removed: the directory also holds the
+    caches of the other components.
+
+    Args:
+        name: Entry to remove.
+    """
+    for path in glob.glob(os.path.join(CACHE_DIR, f"{name}-*.json")):
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove scan cache {path}: {e}")
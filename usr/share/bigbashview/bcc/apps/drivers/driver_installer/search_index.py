@@ -0,0 +1,191 @@
+"""
+Search Index Module
+
+This module provides an in-memory search index for driver records. The
+searchable fields are folded once (lowercase, accents stripped) when the
+records are added, and every word is indexed by its bigrams and trigrams,
+so a query only verifies the few records that can possibly match.
+
+Results are ranked by the field that matched (name and package first,
+description last) and by whether the query matched a whole word, a word
+prefix or only a substring.
+"""
+import re
+import unicodedata
+import logging
+from typing import Dict, Iterable, List, Any, NamedTuple, Optional, Set, Tuple
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Searchable record fields and their ranking weights
+FIELD_WEIGHTS = (
+    ("name", 8),
+    ("package", 6),
+    ("driver", 5),
+    ("category_label", 3),
+    ("category", 3),
+    ("device", 2),
+    ("description", 1)
+)
+
+# Score multipliers for the kind of match inside a field
+WORD_MATCH = 3
+PREFIX_MATCH = 2
+SUBSTRING_MATCH = 1
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def fold(text: Any) -> str:
+    """
+    Normalize text for matching: lowercase and without accents.
+
+    Args:
+        text: Text to fold; non-string values are converted first.
+
+    Returns:
+        The folded text, e.g. "Áudio" becomes "audio".
+    """
+    if not isinstance(text, str):
+        text = "" if text is None else str(text)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split folded text into words."""
+    return _WORD_PATTERN.findall(text)
+
+
+def _grams(word: str) -> Set[str]:
+    """Return the bigrams and trigrams of a word."""
+    grams = set()
+    for size in (2, 3):
+        for i in range(len(word) - size + 1):
+            grams.add(word[i:i + size])
+    return grams
+
+
+class SearchHit(NamedTuple):
+    """A ranked search result."""
+    record: Dict[str, Any]
+    kind: str
+    score: int
+
+
+class _Entry(NamedTuple):
+    """An indexed record with its folded fields."""
+    record: Dict[str, Any]
+    kind: str
+    fields: Tuple[Tuple[int, str, Tuple[str, ...]], ...]  # (weight, text, words)
+
+
+class SearchIndex:
+    """
+    In-memory index over driver records.
+
+    Records are added once per data load; searching does not touch the
+    records again except to verify and rank the candidates.
+    """
+
+    def __init__(self):
+        self._entries: List[_Entry] = []
+        self._grams: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove every record from the index."""
+        self._entries = []
+        self._grams = {}
+
+    def add(self, records: Iterable[Dict[str, Any]], kind: str = "") -> None:
+        """
+        Index records.
+
+        Args:
+            records: Driver records or dictionaries to index.
+            kind: Label returned with the hits of these records, e.g.
+                "detected" or "catalog".
+        """
+        for record in records:
+            if not hasattr(record, "get"):
+                continue
+
+            fields = []
+            position = len(self._entries)
+            for field, weight in FIELD_WEIGHTS:
+                text = fold(record.get(field))
+                if not text:
+                    continue
+                words = tuple(tokenize(text))
+                fields.append((weight, text, words))
+                for word in words:
+                    for gram in _grams(word):
+                        self._grams.setdefault(gram, set()).add(position)
+
+            self._entries.append(_Entry(record, kind, tuple(fields)))
+
+    def _candidates(self, words: List[str]) -> Optional[Set[int]]:
+        """Positions that contain every gram of the query, None for all."""
+        candidates = None
+        for word in words:
+            for gram in _grams(word):
+                postings = self._grams.get(gram)
+                if not postings:
+                    return set()
+                candidates = set(postings) if candidates is None else candidates & postings
+                if not candidates:
+                    return candidates
+        return candidates
+
+    @staticmethod
+    def _score(entry: _Entry, words: List[str]) -> int:
+        """Score an entry, or return 0 when a query word does not match."""
+        total = 0
+        for word in words:
+            best = 0
+            for weight, text, field_words in entry.fields:
+                if word not in text:
+                    continue
+                if word in field_words:
+                    kind = WORD_MATCH
+                elif any(w.startswith(word) for w in field_words):
+                    kind = PREFIX_MATCH
+                else:
+                    kind = SUBSTRING_MATCH
+                best = max(best, weight * kind)
+            if not best:
+                return 0
+            total += best
+        return total
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[SearchHit]:
+        """
+        Find the records matching every word of a query.
+
+        Args:
+            query: Text typed by the user.
+            limit: Maximum number of hits to return.
+
+        Returns:
+            Hits ordered by score, then by record name.
+        """
+        words = tokenize(fold(query))
+        if not words:
+            return []
+
+        candidates = self._candidates(words)
+        positions = range(len(self._entries)) if candidates is None else candidates
+
+        hits = []
+        for position in positions:
+            entry = self._entries[position]
+            score = self._score(entry, words)
+            if score:
+                hits.append(SearchHit(entry.record, entry.kind, score))
+
+        hits.sort(key=lambda hit: (-hit.score, fold(hit.record.get("name"))))
+        return hits[:limit] if limit is not None else hits
@@ -22,6 +22,59 @@ format_output() {
 # Diretório base para os device-ids
 DEVICE_IDS_DIR="/usr/share/bigbashview/bcc/apps/drivers/device-ids"
 
+# Índice pré-compilado (gerado por driver_installer/hardware_index.py)
+INDEX_FILE="/usr/share/bigbashview/bcc/apps/drivers/hardware-index.json"
+INDEX_VERSION="1"
+
+# Snapshot compartilhado do mhwd (driver_installer/mhwd_adapter.py)
+MHWD_ADAPTER="/usr/share/bigbashview/bcc/apps/drivers/driver_installer/mhwd_adapter.py"
+
+# Mapa "barramento:vendor:device" -> módulo, carregado uma única vez
+declare -A ID_MAP
+
+load_id_map() {
+    # Arquivos editados no lugar (pci.ids, usb.ids) não mudam a data dos diretórios,
+    # então a comparação é com a data mais nova do catálogo gravada no build
+    local catalog_mtime=""
+    if [ -f "$INDEX_FILE" ] && command -v jq >/dev/null 2>&1; then
+        catalog_mtime="$(jq -r 'select(.version == '"$INDEX_VERSION"') | .catalog_mtime // empty' "$INDEX_FILE" 2>/dev/null)"
+    fi
+    if [ -n "$catalog_mtime" ] \
+        && [ -z "$(find "$DEVICE_IDS_DIR" -newermt "@$catalog_mtime" -print -quit 2>/dev/null)" ]; then
+        local key module
+        while IFS=$'\t' read -r key module; do
+            ID_MAP["$key"]="$module"
+        done < <(jq -r '.ids | to_entries[] | "\(.key)\t\(.value[0])"' "$INDEX_FILE")
+    else
+        # Índice ausente ou desatualizado: percorre o device-ids uma única vez
+        local ids_file bus module line
+        for ids_file in "$DEVICE_IDS_DIR"/*/*.ids; do
+            [ -f "$ids_file" ] || continue
+            bus="${ids_file##*/}"
+            bus="${bus%.ids}"
+            module="${ids_file%/*}"
+            module="${module##*/}"
+            while read -r line; do
+                line="${line,,}"
+                [[ $line == *:* ]] || continue
+                [ -n "${ID_MAP["$bus:$line"]}" ] || ID_MAP["$bus:$line"]="$module"
+            done < "$ids_file"
+        done
+    fi
+}
+
+# Define MODULE com o módulo que suporta o ID (vazio se nenhum)
+find_module() {
+    local bus="$1"
+    local id="${2,,}"
+    MODULE="${ID_MAP["$bus:$id"]}"
+    if [ -z "$MODULE" ]; then
+        MODULE="${ID_MAP["$bus:${id%%:*}:*"]}"
+    fi
+}
+
+load_id_map
+
 # Variável para armazenar a saída JSON
 OUTPUT_FILE="$(mktemp)"
 echo "[" > "$OUTPUT_FILE" # Início do array JSON
@@ -31,17 +84,13 @@ OIFS=$IFS
 IFS=$'\n'
 
 # PCI
-PCI_LIST="$(grep -Ri : "$DEVICE_IDS_DIR" 2>/dev/null | grep -i 'pci.ids' 2>/dev/null)"
-
 for i in $(lspci -nn); do
     ID="$(echo "$i" | rev | cut -f1 -d[ | cut -f2 -d] | rev)"
     TYPE="$(echo "$i" | cut -f1 -d[ | cut -f1 -d: | xargs)"
     NAME="$(echo "$i" | cut -f2- -d: | rev | cut -f2- -d[ | rev | xargs)"
 
-    if [ -n "$PCI_LIST" ] && [ "$(echo "$PCI_LIST" | grep -i "$ID")" != "" ]; then
-        ADDR="$(grep -i -m1 -R "$ID" "$DEVICE_IDS_DIR" 2>/dev/null)"
-        MODULE="$(echo "$ADDR" | cut -f2 -d/)"
-
+    find_module pci "$ID"
+    if [ -n "$MODULE" ]; then
         # Verifica se o módulo está carregado
         if lsmod | grep -q "^${MODULE}\s"; then
             INSTALLED="true"
@@ -70,17 +119,13 @@ for i in $(lspci -nn); do
 done
 
 # USB
-USB_LIST="$(grep -Ri : "$DEVICE_IDS_DIR" 2>/dev/null | grep -i 'usb.ids' 2>/dev/null)"
-
 for i in $(lsusb); do
     ID="$(echo "$i" | cut -f6 -d" ")"
     NAME="$(echo "$i" | cut -f7- -d" " | xargs)"
     TYPE="USB"
 
-    if [ -n "$USB_LIST" ] && [ "$(echo "$USB_LIST" | grep -i "$ID")" != "" ]; then
-        ADDR="$(grep -i -m1 -R "$ID" "$DEVICE_IDS_DIR" 2>/dev/null)"
-        MODULE="$(echo "$ADDR" | cut -f2 -d/)"
-
+    find_module usb "$ID"
+    if [ -n "$MODULE" ]; then
         # Verifica se o módulo está carregado
         if lsmod | grep -q "^${MODULE}\s"; then
             INSTALLED="true"
@@ -109,8 +154,6 @@ for i in $(lsusb); do
 done
 
 # SDIO
-SDIO_LIST="$(grep -Ri : "$DEVICE_IDS_DIR" 2>/dev/null | grep -i 'sdio.ids' 2>/dev/null)"
-
 for i in $(ls /sys/bus/sdio/devices/ 2>/dev/null); do
     Vendor="$(cat /sys/bus/sdio/devices/$i/vendor 2>/dev/null | cut -f2 -dx)"
     Device="$(cat /sys/bus/sdio/devices/$i/device 2>/dev/null | cut -f2 -dx)"
@@ -119,10 +162,8 @@ for i in $(ls /sys/bus/sdio/devices/ 2>/dev/null); do
     NAME="SDIO Device $ID"
     TYPE="SDIO"
 
-    if [ -n "$SDIO_LIST" ] && [ "$(echo "$SDIO_LIST" | grep -i "$ID")" != "" ]; then
-        ADDR="$(grep -i -m1 -R "$ID" "$DEVICE_IDS_DIR" 2>/dev/null)"
-        MODULE="$(echo "$ADDR" | cut -f2 -d/)"
-
+    find_module sdio "$ID"
+    if [ -n "$MODULE" ]; then
         # Verifica se o módulo está carregado
         if lsmod | grep -q "^${MODULE}\s"; then
             INSTALLED="true"
@@ -152,117 +193,78 @@ done
 
 # 2. Detecção de drivers MHWD (apenas os compatíveis)
 if command -v mhwd >/dev/null 2>&1; then
-    # Get list of installed drivers once to improve performance
-    INSTALLED_DRIVERS=$(mhwd -li | awk '{print $1}')
-    
-    # Processa a saída do mhwd -l linha por linha
-    mhwd -l | while IFS= read -r line; do
-        # Detecta início de bloco de dispositivo
-        if [[ $line =~ \(([0-9a-f]{4}:[0-9a-f]{4}:[0-9a-f]{4})\) ]]; then
-            # Remove os primeiros 5 caracteres (0300: → fica só vendor:device)
-            FULL_ID="${BASH_REMATCH[1]}"
-            ID="${FULL_ID:5}"
-
-            NAME=""
-
-            # Extrai nome se existir
-            if [[ $line =~ \)\ (.+): ]]; then
-                NAME="${BASH_REMATCH[1]}"
-            fi
-
-            # Determina o tipo
-            TYPE_CODE="${FULL_ID:0:4}"
-            case "$TYPE_CODE" in
-                "0300") TYPE="Graphics" ;;
-                "0200") TYPE="Network" ;;
-                *) TYPE="Other" ;;
-            esac
-
-            # Variáveis para processar drivers
-            PROCESSING_DRIVERS=false
-            DRIVERS=()
-            continue
+    # Installed and free configs from the shared mhwd snapshot
+    # Columns: name version free type installed compatible classes
+    MHWD_CONFIGS="$(python3 "$MHWD_ADAPTER" tsv)"
+    INSTALLED_DRIVERS=$(awk -F'\t' '$5 == "true" { print $1 }' <<< "$MHWD_CONFIGS")
+    FREE_DRIVERS=$(awk -F'\t' '$3 == "true" { print $1 }' <<< "$MHWD_CONFIGS")
+
+    # Dispositivos de cada config compatível, do mesmo snapshot (sem rodar mhwd -l de novo)
+    # Columns: name class:vendor:device device-name
+    while IFS=$'\t' read -r MODULE FULL_ID NAME; do
+        # Filtra drivers relevantes (video-* ou network-*, exceto os básicos)
+        [[ $MODULE =~ ^(video|network)- ]] || continue
+        [[ $MODULE =~ ^(video-linux|video-modesetting|video-vesa)$ ]] && continue
+
+        # Remove os primeiros 5 caracteres (0300: → fica só vendor:device)
+        ID="${FULL_ID:5}"
+
+        # Determina o tipo
+        TYPE_CODE="${FULL_ID:0:4}"
+        case "$TYPE_CODE" in
+            "0300") TYPE="Graphics" ;;
+            "0200") TYPE="Network" ;;
+            *) TYPE="Other" ;;
+        esac
+
+        # Verifica se está instalado usando o resultado do mhwd -li
+        if echo "$INSTALLED_DRIVERS" | grep -q "^${MODULE}$"; then
+            INSTALLED="true"
+        else
+            INSTALLED="false"
         fi
 
-        # Marca início da seção de drivers
-        if [[ $line =~ ^[[:space:]]*(TYPE|[[:space:]]*NAME[[:space:]]+VERSION[[:space:]]+FREEDRIVER[[:space:]]+TYPE)[[:space:]]*$ ]]; then
-            PROCESSING_DRIVERS=true
-            continue
+        # Verifica se é free
+        if echo "$FREE_DRIVERS" | grep -q "^${MODULE}$"; then
+            OPEN="true"
+        else
+            OPEN="false"
         fi
 
-        # Ignora linhas de separador
-        [[ $line =~ ^-+$ ]] && continue
-
-        # Coleta drivers durante o processamento
-        if [[ $PROCESSING_DRIVERS == true && $line =~ ^[[:space:]]*([a-zA-Z0-9_.-]+) ]]; then
-            DRIVER="${BASH_REMATCH[1]}"
-
-            # Filtra drivers relevantes (video-* ou network-*, exceto os básicos)
-            if [[ $DRIVER =~ ^(video|network)- ]] && [[ ! $DRIVER =~ ^(video-linux|video-modesetting|video-vesa)$ ]]; then
-                DRIVERS+=("$DRIVER")
-            fi
-        fi
+        COMPATIBLE="true"
 
-        # Quando encontra linha vazia, processa todos os drivers coletados
-        if [[ -z "$line" && -n "$ID" && ${#DRIVERS[@]} -gt 0 ]]; then
-            for MODULE in "${DRIVERS[@]}"; do
-                # Verifica se está instalado usando o resultado do mhwd -li
-                if echo "$INSTALLED_DRIVERS" | grep -q "^${MODULE}$"; then
-                    INSTALLED="true"
-                else
-                    INSTALLED="false"
-                fi
-
-                # Verifica se é free
-                if mhwd -la | grep "^$MODULE " | awk '{print $3}' | grep -q "free"; then
-                    OPEN="true"
-                else
-                    OPEN="false"
-                fi
-
-                COMPATIBLE="true"
-
-                # Adiciona descrição específica para o driver
-                DESCRIPTION=""
-                case "$MODULE" in
-                    video-nvidia)
-                        DESCRIPTION="Driver proprietário NVIDIA mais recente" ;;
-                    video-nvidia-390xx)
-                        DESCRIPTION="Driver proprietário NVIDIA legado (série 390xx)" ;;
-                    video-nvidia-470xx)
-                        DESCRIPTION="Driver proprietário NVIDIA legado (série 470xx)" ;;
-                    video-hybrid-*)
-                        DESCRIPTION="Driver híbrido para sistemas com GPU integrada e dedicada" ;;
-                    network-*)
-                        DESCRIPTION="Driver para dispositivo de rede" ;;
-                    *)
-                        DESCRIPTION="Driver para $NAME" ;;
-                esac
-
-                # Adiciona informação adicional ao JSON para melhor identificação
-                echo "{" >> "$OUTPUT_FILE"
-                echo "  \"name\": \"$NAME\"," >> "$OUTPUT_FILE"
-                echo "  \"device\": \"$TYPE\"," >> "$OUTPUT_FILE"
-                echo "  \"driver\": \"$MODULE\"," >> "$OUTPUT_FILE"
-                echo "  \"id\": \"$ID\"," >> "$OUTPUT_FILE"
-                echo "  \"open\": $OPEN," >> "$OUTPUT_FILE"
-                echo "  \"compatible\": $COMPATIBLE," >> "$OUTPUT_FILE"
-                echo "  \"installed\": $INSTALLED," >> "$OUTPUT_FILE"
-                echo "  \"module\": \"$MODULE\"," >> "$OUTPUT_FILE"
-                echo "  \"package\": \"$MODULE\"," >> "$OUTPUT_FILE"
-                echo "  \"description\": \"$DESCRIPTION\"," >> "$OUTPUT_FILE"
-                echo "  \"source\": \"mhwd\"" >> "$OUTPUT_FILE" # Add source for MHWD
-                echo "}," >> "$OUTPUT_FILE"
-            done
-
-            # Reseta variáveis para o próximo dispositivo
-            ID=""
-            NAME=""
-            TYPE=""
-            DRIVERS=()
-            PROCESSING_DRIVERS=false
-        fi
-    done
+        # Adiciona descrição específica para o driver
+        DESCRIPTION=""
+        case "$MODULE" in
+            video-nvidia)
+                DESCRIPTION="Driver proprietário NVIDIA mais recente" ;;
+            video-nvidia-390xx)
+                DESCRIPTION="Driver proprietário NVIDIA legado (série 390xx)" ;;
+            video-nvidia-470xx)
+                DESCRIPTION="Driver proprietário NVIDIA legado (série 470xx)" ;;
+            video-hybrid-*)
+                DESCRIPTION="Driver híbrido para sistemas com GPU integrada e dedicada" ;;
+            network-*)
+                DESCRIPTION="Driver para dispositivo de rede" ;;
+            *)
+                DESCRIPTION="Driver para $NAME" ;;
+        esac
+
+        # Adiciona informação adicional ao JSON para melhor identificação
+        echo "{" >> "$OUTPUT_FILE"
+        echo "  \"name\": \"$NAME\"," >> "$OUTPUT_FILE"
+        echo "  \"device\": \"$TYPE\"," >> "$OUTPUT_FILE"
+        echo "  \"driver\": \"$MODULE\"," >> "$OUTPUT_FILE"
+        echo "  \"id\": \"$ID\"," >> "$OUTPUT_FILE"
+        echo "  \"open\": $OPEN," >> "$OUTPUT_FILE"
+        echo "  \"compatible\": $COMPATIBLE," >> "$OUTPUT_FILE"
+        echo "  \"installed\": $INSTALLED," >> "$OUTPUT_FILE"
+        echo "  \"module\": \"$MODULE\"," >> "$OUTPUT_FILE"
+        echo "  \"package\": \"$MODULE\"," >> "$OUTPUT_FILE"
+        echo "  \"description\": \"$DESCRIPTION\"," >> "$OUTPUT_FILE"
+        echo "  \"source\": \"mhwd\"" >> "$OUTPUT_FILE" # Add source for MHWD
+        echo "}," >> "$OUTPUT_FILE"
+    done < <(python3 "$MHWD_ADAPTER" devices)
 fi
 
 IFS=$OIFS
@@ -276,7 +278,7 @@ if lspci | grep -i "Realtek RTL8111/8168/8411" > /dev/null; then
     # A more robust check would be to see if mhwd -l lists it for the device.
     if ! grep -q "\"package\": \"network-r8168\"" "$OUTPUT_FILE"; then
         R8168_INSTALLED="false"
-        if mhwd -li | grep -q "network-r8168"; then
+        if echo "$INSTALLED_DRIVERS" | grep -q "^network-r8168$"; then
             R8168_INSTALLED="true"
         fi
 
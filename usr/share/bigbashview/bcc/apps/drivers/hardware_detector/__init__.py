@@ -0,0 +1,6 @@
+"""
+Hardware Detector Package
+
+This package provides native detection of the system hardware and of the
+drivers available for it.
+"""
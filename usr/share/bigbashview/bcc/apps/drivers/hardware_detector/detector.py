@@ -0,0 +1,351 @@
+"""
+Hardware Detector Module
+
+This module detects the devices present on the system and the drivers
+available for them, replacing hardware_detect.sh. Devices are enumerated
+directly from /sys/bus/{pci,usb,sdio}/devices and matched against the
+hardware index, so no lspci, lsusb, grep or lsmod processes are needed.
+
+The records keep the shape produced by hardware_detect.sh: name, device,
+driver, id, open, compatible, installed, module, package and source.
+"""
+import os
+import sys
+import json
+import logging
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+if __name__ == "__main__":
+    # Allow running as a script from the bash pages
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.package_state import get_package_state
+from driver_installer import hardware_index, mhwd_adapter
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+SYSFS_BUS_DIR = "/sys/bus"
+PROC_MODULES = "/proc/modules"
+HWDATA_PCI_IDS = "/usr/share/hwdata/pci.ids"
+HWDATA_USB_IDS = "/usr/share/hwdata/usb.ids"
+
+# mhwd configs that are always present and never worth recommending
+MHWD_IGNORED_CONFIGS = {"video-linux", "video-modesetting", "video-vesa"}
+
+# PCI class codes used to label mhwd devices
+MHWD_DEVICE_TYPES = {
+    "0300": "Graphics",
+    "0200": "Network"
+}
+
+
+def _read_sysfs(path: str) -> str:
+    """Read a sysfs attribute, returning an empty string when unavailable."""
+    try:
+        with open(path, 'r', errors='replace') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _strip_hex(value: str) -> str:
+    """Normalize a sysfs hex value such as "0x10ec" to "10ec"."""
+    value = value.strip().lower()
+    return value[2:] if value.startswith("0x") else value
+
+
+def list_devices(sysfs_dir: str = SYSFS_BUS_DIR) -> List[Dict[str, str]]:
+    """
+    Enumerate PCI, USB and SDIO devices from sysfs.
+
+    Args:
+        sysfs_dir: Root of the sysfs bus tree.
+
+    Returns:
+        A list of dictionaries with bus, vendor, device, class and the
+        sysfs path of each device.
+    """
+    devices = []
+    attributes = {
+        "pci": ("vendor", "device"),
+        "usb": ("idVendor", "idProduct"),
+        "sdio": ("vendor", "device")
+    }
+
+    for bus, (vendor_attr, device_attr) in attributes.items():
+        bus_dir = os.path.join(sysfs_dir, bus, "devices")
+        try:
+            entries = sorted(os.listdir(bus_dir))
+        except OSError:
+            continue
+
+        for entry in entries:
+            path = os.path.join(bus_dir, entry)
+            vendor = _strip_hex(_read_sysfs(os.path.join(path, vendor_attr)))
+            device = _strip_hex(_read_sysfs(os.path.join(path, device_attr)))
+            # USB interfaces and hubs without IDs are skipped
+            if not vendor or not device:
+                continue
+
+            devices.append({
+                "bus": bus,
+                "vendor": vendor,
+                "device": device,
+                "class": _strip_hex(_read_sysfs(os.path.join(path, "class"))),
+                "path": path
+            })
+
+    return devices
+
+
+def get_loaded_modules(proc_modules: str = PROC_MODULES) -> Set[str]:
+    """
+    Read the loaded kernel modules once.
+
+    Args:
+        proc_modules: Path of the kernel module list.
+
+    Returns:
+        Set of loaded module names, as printed there (with underscores).
+    """
+    try:
+        with open(proc_modules, 'r') as f:
+            return {line.split(' ', 1)[0] for line in f if line.strip()}
+    except OSError as e:
+        logger.error(f"Error reading loaded modules: {e}")
+        return set()
+
+
+def _is_loaded(module: str, loaded_modules: Set[str]) -> bool:
+    """Check a catalog module name against the loaded module set."""
+    return module.replace('-', '_') in loaded_modules
+
+
+def _read_pci_names(wanted: Set[Tuple[str, str]], classes: Set[str],
+                    ids_file: str = HWDATA_PCI_IDS) -> Tuple[Dict[Tuple[str, str], str], Dict[str, str]]:
+    """
+    Resolve PCI vendor/device and class names from hwdata in one pass.
+
+    Args:
+        wanted: Set of (vendor, device) pairs to name.
+        classes: Set of four digit class codes ("0200") to name.
+        ids_file: Path of the hwdata pci.ids file.
+
+    Returns:
+        Tuple of ({(vendor, device): "Vendor Device"}, {class: "Class name"}).
+    """
+    device_names: Dict[Tuple[str, str], str] = {}
+    class_names: Dict[str, str] = {}
+    wanted_vendors = {vendor for vendor, _ in wanted}
+    wanted_bases = {code[:2] for code in classes}
+
+    vendor = vendor_name = None
+    base_class = base_name = None
+    try:
+        with open(ids_file, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                if line.startswith('C '):
+                    vendor = None
+                    base_class = line[2:4].lower()
+                    base_name = line[4:].strip()
+                    if base_class in wanted_bases:
+                        for code in classes:
+                            if code.startswith(base_class):
+                                class_names.setdefault(code, base_name)
+                    continue
+                if not line.startswith('\t'):
+                    base_class = None
+                    vendor = line[:4].lower()
+                    vendor_name = line[4:].strip() if vendor in wanted_vendors else None
+                    continue
+                if line.startswith('\t\t'):
+                    continue
+
+                code = line[1:3].lower() if base_class else line[1:5].lower()
+                name = line[5:].strip() if not base_class else line[3:].strip()
+                if base_class:
+                    full_code = f"{base_class}{code}"
+                    if full_code in classes:
+                        class_names[full_code] = name
+                elif vendor_name and (vendor, code) in wanted:
+                    device_names[(vendor, code)] = f"{vendor_name} {name}"
+    except OSError:
+        logger.debug(f"hwdata PCI database not available: {ids_file}")
+
+    return device_names, class_names
+
+
+def _device_name(device: Dict[str, str], pci_names: Dict[Tuple[str, str], str]) -> str:
+    """Build a human readable name for a device."""
+    device_id = f"{device['vendor']}:{device['device']}"
+
+    if device["bus"] == "pci":
+        return pci_names.get((device["vendor"], device["device"]), f"PCI Device {device_id}")
+
+    if device["bus"] == "usb":
+        manufacturer = _read_sysfs(os.path.join(device["path"], "manufacturer"))
+        product = _read_sysfs(os.path.join(device["path"], "product"))
+        name = " ".join(part for part in (manufacturer, product) if part)
+        return name or f"USB Device {device_id}"
+
+    return f"SDIO Device {device_id}"
+
+
+def _device_type(device: Dict[str, str], class_names: Dict[str, str]) -> str:
+    """Get the device type label, mirroring the old script ("USB", "SDIO" or the PCI class)."""
+    if device["bus"] == "pci":
+        return class_names.get(device["class"][:4], "PCI")
+    return device["bus"].upper()
+
+
+def _detect_catalog_drivers(devices: List[Dict[str, str]],
+                            loaded_modules: Set[str]) -> List[Dict[str, Any]]:
+    """
+    Match devices against the device-ids catalog.
+
+    Args:
+        devices: Devices returned by list_devices.
+        loaded_modules: Set returned by get_loaded_modules.
+
+    Returns:
+        A list of detected driver records.
+    """
+    index = hardware_index.load_index()
+    packages = get_package_state()
+
+    matches = []
+    for device in devices:
+        for module in hardware_index.lookup(device["bus"], device["vendor"], device["device"], index):
+            matches.append((device, module))
+
+    if not matches:
+        return []
+
+    pci_names, class_names = _read_pci_names(
+        {(d["vendor"], d["device"]) for d, _ in matches if d["bus"] == "pci"},
+        {d["class"][:4] for d, _ in matches if d["bus"] == "pci" and d["class"]}
+    )
+
+    drivers = []
+    for device, module in matches:
+        info = index["modules"].get(module, {})
+        package = info.get("package", module)
+        drivers.append({
+            "name": _device_name(device, pci_names),
+            "device": _device_type(device, class_names),
+            "driver": module,
+            "id": f"{device['vendor']}:{device['device']}",
+            "open": True,
+            "compatible": True,
+            "installed": packages.is_installed(package) or _is_loaded(module, loaded_modules),
+            "module": module,
+            "package": package,
+            "description": info.get("description", ""),
+            "source": "device-ids"
+        })
+
+    return drivers
+
+
+def _mhwd_description(config: str, device_name: str) -> str:
+    """Describe an mhwd config the same way hardware_detect.sh did."""
+    if config == "video-nvidia":
+        return "Driver proprietário NVIDIA mais recente"
+    if config == "video-nvidia-390xx":
+        return "Driver proprietário NVIDIA legado (série 390xx)"
+    if config == "video-nvidia-470xx":
+        return "Driver proprietário NVIDIA legado (série 470xx)"
+    if config.startswith("video-hybrid-"):
+        return "Driver híbrido para sistemas com GPU integrada e dedicada"
+    if config.startswith("network-"):
+        return "Driver para dispositivo de rede"
+    return f"Driver para {device_name}"
+
+
+def _detect_mhwd_drivers() -> List[Dict[str, Any]]:
+    """
+    Collect the video and network configs suggested by mhwd.
+
+    The configs come from the shared mhwd adapter snapshot, so mhwd runs
+    at most once per listing mode.
+
+    Returns:
+        A list of detected driver records.
+    """
+    drivers = []
+    for config in mhwd_adapter.load_configs().values():
+        if not config.name.startswith(("video-", "network-")) or config.name in MHWD_IGNORED_CONFIGS:
+            continue
+
+        for device in config.devices:
+            drivers.append({
+                "name": device.name,
+                "device": MHWD_DEVICE_TYPES.get(device.class_id, "Other"),
+                "driver": config.name,
+                "id": f"{device.vendor}:{device.device}",
+                "open": config.free,
+                "compatible": True,
+                "installed": config.installed,
+                "module": config.name,
+                "package": config.name,
+                "description": _mhwd_description(config.name, device.name),
+                "source": "mhwd"
+            })
+
+    return drivers
+
+
+def _r8168_driver(devices: List[Dict[str, str]], drivers: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Offer network-r8168 for RTL8111/8168/8411 cards when mhwd did not list it."""
+    if not any(d["bus"] == "pci" and d["vendor"] == "10ec" and d["device"] == "8168" for d in devices):
+        return None
+    if any(d.get("package") == "network-r8168" for d in drivers):
+        return None
+
+    return {
+        "name": "Network controller Realtek RTL8111/8168/8411",
+        "device": "Network",
+        "driver": "r8168",
+        "id": "10ec:8168",
+        "open": True,
+        "compatible": True,
+        # Same source as the mhwd configs and the status refresh: mhwd -li
+        "installed": "network-r8168" in mhwd_adapter.installed_configs(),
+        "module": "r8168",
+        "package": "network-r8168",
+        "description": "Driver alternativo para placas de rede Realtek 8168/8111/8411 (MHWD)",
+        "source": "mhwd"
+    }
+
+
+def detect_hardware_drivers(include_mhwd: bool = True) -> List[Dict[str, Any]]:
+    """
+    Detect the drivers available for the hardware present on the system.
+
+    Args:
+        include_mhwd: Also collect the configs suggested by mhwd.
+
+    Returns:
+        A list of detected driver records.
+    """
+    devices = list_devices()
+    loaded_modules = get_loaded_modules()
+
+    drivers = _detect_catalog_drivers(devices, loaded_modules)
+    if include_mhwd:
+        drivers.extend(_detect_mhwd_drivers())
+        r8168 = _r8168_driver(devices, drivers)
+        if r8168:
+            drivers.append(r8168)
+
+    logger.info(f"Detected {len(drivers)} compatible drivers on {len(devices)} devices")
+    return drivers
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    json.dump(detect_hardware_drivers(), sys.stdout, indent=2, ensure_ascii=False)
+    print()
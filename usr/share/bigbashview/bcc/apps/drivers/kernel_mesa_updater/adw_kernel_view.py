@@ -96,9 +96,16 @@ class AdwKernelView(Gtk.Box):
         self.spinner.start()
         self.loading_label.set_text("Loading kernel information...")
         
+        # Show the list persisted by any process right away
+        cached_data, cache_fresh = self.kernel_manager.get_cached_kernels_json()
+        if cached_data is not None:
+            self._populate_kernel_groups(cached_data)
+            if cache_fresh:
+                return
+        
         async def load():
             try:
-                # Get kernel data from KernelManager
+                # Get kernel data from KernelManager, rebuilt only if the databases changed
                 kernels_data = await self.kernel_manager.get_kernels_json()
                 
                 # Update UI with the kernel data
@@ -0,0 +1,340 @@
+"""
+AUR Kernel Snapshot
+
+This module keeps a local snapshot of the kernel packages published in the
+AUR (name, version, description, votes, popularity, last modification) in
+the cache directory, so the kernel page lists them without running an AUR
+helper or parsing its search output.
+
+A background job refreshes the snapshot through the AUR RPC interface at
+most every few hours, comparing the packages by last modification: new
+ones are added, modified ones updated and the ones removed from the AUR
+dropped. A local file in the RPC format ({"results": [...]}) can stand in
+for the AUR, e.g. for tests:
+
+    BIGLINUX_AUR_SOURCE=/tmp/aur.json python3 kernel_mesa_updater/aur_kernels.py update
+    python3 kernel_mesa_updater/aur_kernels.py list
+"""
+import os
+import sys
+import json
+import asyncio
+import time
+import shutil
+import logging
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+if __name__ == "__main__":
+    # Allow running as a script from the bash pages
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.cache_paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the stored snapshot changes
+SNAPSHOT_FORMAT = 1
+
+SNAPSHOT_FILE = os.path.join(CACHE_DIR, "aur-kernels.json")
+
+# Path of a local file used instead of the AUR
+SOURCE_ENV = "BIGLINUX_AUR_SOURCE"
+
+AUR_RPC_URL = "https://aur.archlinux.org/rpc/v5/search/{arg}?by={by}"
+# Kernel images depend on these; searching by dependency keeps the result
+# far below the RPC limit, unlike a name search for "linux"
+AUR_SEARCHES = (("depends", "initramfs"), ("depends", "mkinitcpio"), ("depends", "kmod"))
+REQUEST_TIMEOUT = 20
+
+# Minimum interval between two refreshes of the snapshot
+MAX_AGE_SECONDS = 6 * 3600
+
+AUR_HELPERS = ("yay", "paru")
+
+_lock = threading.Lock()
+# (file signature, parsed snapshot) of the last file read by this process
+_loaded: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+_refresh: Optional[Future] = None
+
+
+class AurKernel(NamedTuple):
+    """One kernel package of the AUR."""
+    name: str
+    version: str
+    description: str
+    votes: int
+    popularity: float
+    last_modified: int
+    out_of_date: bool
+
+
+def find_helper() -> Optional[str]:
+    """Return the first AUR helper found in PATH, None when there is none."""
+    for helper in AUR_HELPERS:
+        if shutil.which(helper):
+            return helper
+    return None
+
+
+def _record(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an RPC search result to a snapshot entry."""
+    return AurKernel(
+        name=result["Name"],
+        version=result.get("Version") or "",
+        description=result.get("Description") or "",
+        votes=int(result.get("NumVotes") or 0),
+        popularity=float(result.get("Popularity") or 0.0),
+        last_modified=int(result.get("LastModified") or 0),
+        out_of_date=bool(result.get("OutOfDate"))
+    )._asdict()
+
+
+def _read_source(path: str) -> List[Dict[str, Any]]:
+    """Read RPC results from a local stand-in file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get("results", []) if isinstance(data, dict) else data
+
+
+def _query_aur() -> List[Dict[str, Any]]:
+    """Run the RPC searches, results of all of them by package name."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for by, arg in AUR_SEARCHES:
+        url = AUR_RPC_URL.format(arg=urllib.parse.quote(arg), by=by)
+        with urllib.request.urlopen(url, timeout=REQUEST_TIMEOUT) as response:
+            data = json.load(response)
+        if data.get("type") == "error":
+            raise ValueError(f"AUR search by {by} '{arg}' failed: {data.get('error')}")
+        for result in data.get("results", []):
+            results.setdefault(result["Name"], result)
+    return list(results.values())
+
+
+def fetch_results(source: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get the AUR metadata the snapshot is built from.
+
+    Args:
+        source: Local stand-in file; $BIGLINUX_AUR_SOURCE or the AUR by default.
+
+    Returns:
+        RPC search results.
+
+    Raises:
+        OSError: If the AUR or the file cannot be read.
+        ValueError: If the answer is not valid.
+    """
+    source = source or os.environ.get(SOURCE_ENV)
+    if source:
+        return _read_source(source)
+    return _query_aur()
+
+
+def load() -> Optional[Dict[str, Any]]:
+    """
+    Read the stored snapshot.
+
+    The file is parsed again only when it was replaced since the last call.
+
+    Returns:
+        Dictionary with "checked_at", "revision" and "packages" (entries by
+        name), or None when the file is missing, corrupt or outdated.
+    """
+    global _loaded
+
+    try:
+        st = os.stat(SNAPSHOT_FILE)
+    except OSError:
+        return None
+    signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    with _lock:
+        if _loaded is not None and _loaded[0] == signature:
+            return _loaded[1]
+        try:
+            with open(SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable AUR kernel snapshot: {e}")
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT \
+                or not isinstance(snapshot.get("packages"), dict):
+            return None
+        _loaded = (signature, snapshot)
+        return snapshot
+
+
+def _store(snapshot: Dict[str, Any]) -> None:
+    """Write the snapshot atomically to the cache directory."""
+    temp_path = f"{SNAPSHOT_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(temp_path, SNAPSHOT_FILE)
+    except OSError as e:
+        logger.warning(f"Could not store AUR kernel snapshot: {e}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def merge(packages: Dict[str, Dict[str, Any]],
+          results: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Apply fresh RPC results to the stored packages.
+
+    Args:
+        packages: Stored entries by name.
+        results: RPC search results; the ones that are not kernels are skipped.
+
+    Returns:
+        Tuple of (entries by name, {"added", "updated", "removed": names}).
+    """
+    # Imported here: the module also runs standalone from the bash pages
+    from common.pacman_db import is_kernel_name
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    changes: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+    for result in results:
+        name = result.get("Name") or ""
+        if not is_kernel_name(name) or name in merged:
+            continue
+        entry = _record(result)
+        previous = packages.get(name)
+        if previous is None:
+            changes["added"].append(name)
+        elif previous.get("last_modified") != entry["last_modified"] \
+                or previous.get("version") != entry["version"]:
+            changes["updated"].append(name)
+        merged[name] = entry
+    changes["removed"] = [name for name in packages if name not in merged]
+    return merged, changes
+
+
+def update(source: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Refresh the snapshot from the AUR (or the stand-in file).
+
+    Votes and popularity are refreshed in place; the revision, which the
+    kernel list cache depends on, changes only when a package was added,
+    updated or removed.
+
+    Args:
+        source: Local stand-in file, see fetch_results().
+
+    Returns:
+        Names added, updated and removed.
+
+    Raises:
+        OSError: If the metadata cannot be read.
+        ValueError: If the answer is not valid.
+    """
+    results = fetch_results(source)
+    snapshot = load() or {"format": SNAPSHOT_FORMAT, "revision": 0, "packages": {}}
+    packages, changes = merge(snapshot["packages"], results)
+
+    revision = snapshot.get("revision", 0)
+    if any(changes.values()):
+        revision += 1
+        logger.info(f"AUR kernel snapshot: {len(changes['added'])} added, "
+                    f"{len(changes['updated'])} updated, {len(changes['removed'])} removed")
+    _store({
+        "format": SNAPSHOT_FORMAT,
+        "checked_at": time.time(),
+        "revision": revision,
+        "packages": packages
+    })
+    return changes
+
+
+def revision() -> Optional[int]:
+    """Revision of the stored snapshot, None when there is none."""
+    snapshot = load()
+    return snapshot.get("revision") if snapshot is not None else None
+
+
+def kernels() -> List[AurKernel]:
+    """
+    List the kernels of the stored snapshot, without any network access.
+
+    Returns:
+        Kernels sorted by votes, most voted first; empty before the first refresh.
+    """
+    snapshot = load()
+    if snapshot is None:
+        return []
+    entries = []
+    for entry in snapshot["packages"].values():
+        try:
+            entries.append(AurKernel(**entry))
+        except TypeError:
+            continue
+    return sorted(entries, key=lambda kernel: (-kernel.votes, kernel.name))
+
+
+async def _update_async() -> None:
+    """Run update() off the event loop, logging failures."""
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, update)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not refresh the AUR kernel snapshot: {e}")
+
+
+def refresh_in_background(max_age: float = MAX_AGE_SECONDS) -> Optional[Future]:
+    """
+    Start a refresh of the snapshot unless it is recent or one is running.
+
+    Args:
+        max_age: Seconds a snapshot is considered recent.
+
+    Returns:
+        Future of the refresh, or None when no refresh was started.
+    """
+    global _refresh
+
+    snapshot = load()
+    if snapshot is not None and time.time() - snapshot.get("checked_at", 0) < max_age:
+        return None
+
+    # Imported here: the module also runs standalone from the bash pages
+    from common.command_runner import get_command_runner
+
+    with _lock:
+        if _refresh is not None and not _refresh.done():
+            return None
+        _refresh = get_command_runner().submit(_update_async(), background=True)
+        return _refresh
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: refresh the snapshot or list its kernels."""
+    command = argv[1] if len(argv) > 1 else "list"
+
+    if command == "update":
+        try:
+            changes = update(argv[2] if len(argv) > 2 else None)
+        except (OSError, ValueError) as e:
+            print(f"Could not refresh the AUR kernel snapshot: {e}", file=sys.stderr)
+            return 1
+        json.dump(changes, sys.stdout, indent=2)
+        print()
+        return 0
+
+    if command == "list":
+        for kernel in kernels():
+            print(f"{kernel.name}\t{kernel.version}\t{kernel.votes}\t{kernel.description}")
+        return 0
+
+    print(f"Usage: {os.path.basename(argv[0])} [update [FILE]|list]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
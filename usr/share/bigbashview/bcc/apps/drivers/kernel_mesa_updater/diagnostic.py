@@ -7,8 +7,13 @@ Run this script to check kernel data and display results.
 
 import asyncio
 import logging
+import os
 import sys
 import json
+
+# Make the shared "common" package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from kernel_manager import KernelManager
 
 # Configure logging
@@ -102,6 +107,19 @@ async def run_diagnostic():
     except Exception as e:
         print(f"  ✗ Kernel JSON generation failed: {str(e)}")
     
+    # Test 6: Persisted kernel list shared with the other processes
+    print("\nTest 6: Persisted kernel list cache")
+    try:
+        cached_json, cache_fresh = manager.get_cached_kernels_json()
+        if cached_json is None:
+            print("  ⚠ No kernel list stored in the cache directory")
+        elif cache_fresh:
+            print("  ✓ Cached kernel list is up to date")
+        else:
+            print("  ⚠ Cached kernel list is outdated and will be rebuilt on next use")
+    except Exception as e:
+        print(f"  ✗ Kernel list cache check failed: {str(e)}")
+    
     # Summary
     print("\n=== Diagnostic Summary ===")
     print("If you're experiencing issues with kernel detection or display:")
@@ -0,0 +1,176 @@
+"""
+Kernel List Cache
+
+This module persists the kernels JSON built by KernelManager (official, AUR,
+installed and running kernels) in the cache directory, together with the
+mtimes of the pacman databases and the AUR snapshot revision it was built
+from. Every process (the GTK kernel view, the diagnostic, shell pages) can
+show the list at once from it and rebuild it only when a database changed:
+
+    python3 kernel_mesa_updater/kernel_cache.py show
+    python3 kernel_mesa_updater/kernel_cache.py invalidate
+
+Installing or rolling back a kernel removes the file, which invalidates the
+list in every process.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+if __name__ == "__main__":
+    # Allow running as a script from the bash pages
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.cache_paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the stored file changes
+CACHE_FORMAT = 1
+
+CACHE_FILE = os.path.join(CACHE_DIR, "kernels.json")
+
+_lock = threading.Lock()
+# (file signature, parsed entry) of the last file read by this process
+_loaded: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+
+
+def catalog_state() -> Dict[str, Any]:
+    """
+    Mtimes of the sync databases and of the local database, and the AUR
+    snapshot revision.
+
+    Returns:
+        {"sync": {repo: mtime}, "local": mtime, "aur": revision}; the cached
+        list is valid while this stays the same.
+    """
+    # Imported here: the module also runs standalone from the bash pages
+    from common.package_state import PACMAN_LOCAL_DB
+    from common.pacman_db import get_sync_database
+    from kernel_mesa_updater import aur_kernels
+
+    try:
+        local_mtime = os.stat(PACMAN_LOCAL_DB).st_mtime
+    except OSError:
+        local_mtime = None
+    return {
+        "sync": dict(sorted(get_sync_database().mtimes().items())),
+        "local": local_mtime,
+        "aur": aur_kernels.revision()
+    }
+
+
+def load() -> Optional[Dict[str, Any]]:
+    """
+    Read the stored list.
+
+    The file is parsed again only when it was replaced since the last call.
+
+    Returns:
+        Dictionary with "state", "written_at" and "data", or None when the
+        file is missing, corrupt or outdated.
+    """
+    global _loaded
+
+    try:
+        st = os.stat(CACHE_FILE)
+    except OSError:
+        return None
+    signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    with _lock:
+        if _loaded is not None and _loaded[0] == signature:
+            return _loaded[1]
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable kernel list cache: {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get("format") != CACHE_FORMAT \
+                or not isinstance(entry.get("data"), dict):
+            return None
+        _loaded = (signature, entry)
+        return entry
+
+
+def is_fresh(entry: Dict[str, Any], state: Dict[str, Any]) -> bool:
+    """
+    Check whether a stored list still describes the system.
+
+    Args:
+        entry: Entry returned by load().
+        state: Current catalog_state().
+
+    Returns:
+        True when the databases did not change and the same kernel is running.
+    """
+    return entry.get("state") == state and \
+        entry["data"].get("current_running_uname") == os.uname().release
+
+
+def store(state: Dict[str, Any], data: Dict[str, Any]) -> None:
+    """
+    Write the list atomically to the cache directory.
+
+    Args:
+        state: catalog_state() taken before the list was built.
+        data: The kernels JSON.
+    """
+    entry = {"format": CACHE_FORMAT, "written_at": time.time(), "state": state, "data": data}
+    temp_path = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, CACHE_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not store kernel list cache: {e}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def invalidate() -> None:
+    """Remove the stored list, for this and every other process."""
+    global _loaded
+
+    with _lock:
+        _loaded = None
+        try:
+            os.unlink(CACHE_FILE)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove kernel list cache: {e}")
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point: print the stored list while fresh, or remove it."""
+    command = argv[1] if len(argv) > 1 else "show"
+
+    if command == "show":
+        entry = load()
+        if entry is None or not is_fresh(entry, catalog_state()):
+            print("No up to date kernel list cached", file=sys.stderr)
+            return 1
+        json.dump(entry["data"], sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    if command == "invalidate":
+        invalidate()
+        return 0
+
+    print(f"Usage: {os.path.basename(argv[0])} [show|invalidate]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv))
@@ -5,7 +5,6 @@ import asyncio
 import os
 import json
 import logging
-import re
 import gi
 from typing import Dict, List, Any, Optional, Tuple, Callable
 
@@ -14,6 +13,13 @@ gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import GLib
 
+from common import package_prefetch
+from common.command_runner import get_command_runner
+from common.package_state import get_package_state
+from common.pacman_progress import CoalescedProgress, PacmanProgress
+from common.pacman_db import PACMAN_SYNC_DIR, get_sync_database, kernel_series
+from kernel_mesa_updater import aur_kernels, kernel_cache
+
 # Set up logger
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
@@ -34,22 +40,16 @@ class KernelManager:
         if not os.path.exists(self.kernel_history_file):
             with open(self.kernel_history_file, "w") as f:
                 json.dump([], f)
-        # Para o cache
+        # Última lista usada; a cópia persistente fica em kernel_cache, compartilhada entre processos
         self._kernels_json_cache: Optional[Dict[str, Any]] = None
-        self._cache_timestamp: float = 0.0
-        self.CACHE_EXPIRY_SECONDS = 300 # Cache por 5 minutos
 
     async def detect_current_kernel(self) -> str:
         """Detect the currently running kernel version string (from uname -r)."""
         if self.current_kernel_version_str: # Cache simples para uname -r
             return self.current_kernel_version_str
         try:
-            process = await asyncio.create_subprocess_exec(
-                "uname", "-r",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+            process = await get_command_runner().run(["uname", "-r"])
+            stdout, stderr = process.stdout, process.stderr
             if process.returncode != 0:
                 logger.error(f"Error detecting kernel: {stderr.decode().strip()}")
                 return "Unknown"
@@ -64,192 +64,54 @@ class KernelManager:
     async def get_available_kernels(self) -> List[Dict[str, str]]:
         """Get a list of all available kernels from the official repositories."""
         # Esta função busca kernels *disponíveis para instalação*, não os instalados.
-        kernels = []
         try:
-            process = await asyncio.create_subprocess_exec(
-                "pacman", "-Ss", "^linux[0-9._-]*$", "^linux-(?!headers|firmware|api|tools)[a-z-]+[0-9._-]*$", # Regex mais preciso
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                if "no packages found" in stderr.decode().strip().lower() or "nenhum pacote encontrado" in stderr.decode().strip().lower() :
-                    logger.info("No official kernels found matching specific patterns.")
-                    return []
-                logger.error(f"Error searching for kernels: {stderr.decode().strip()}")
-                return []
-            
-            output = stdout.decode().strip()
-            pattern = re.compile(
-                r"^(core|extra|community)/([a-zA-Z0-9._-]+(?:-lts|-zen|-hardened|-[a-zA-Z0-9]+)*) +([0-9][^\s]+)(?:\s+\(([^)]+)\))?"
-            )
-            
-            current_pkg_info = None
-            for line in output.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                match = pattern.match(line)
-                if match:
-                    repo, pkg_name, version, groups = match.groups()
-                    # Filtro adicional para garantir que são pacotes de kernel primários
-                    if any(x in pkg_name for x in ["firmware", "headers", "api", "tools", "docs"]):
-                        continue
-                    if not (pkg_name == "linux" or pkg_name.startswith("linux-") or \
-                            any(pkg_name.endswith(s) for s in ["-lts", "-zen", "-hardened"])): # Mais alguns filtros
-                        continue
-
-                    current_pkg_info = {
-                        "name": pkg_name,
-                        "version": version,
-                        "description": "", 
-                        "full_name": f"{repo}/{pkg_name}",
-                        "repo": repo,
-                        "source": "official"
-                    }
-                    kernels.append(current_pkg_info)
-                elif current_pkg_info and (line.startswith("    ") or line.startswith("\t")) and kernels and kernels[-1] is current_pkg_info:
-                    kernels[-1]["description"] = line.strip()
-                    # Adicionar filtro para descrição também, se for muito genérica pode não ser kernel
-                    if "linux kernel" not in kernels[-1]["description"].lower() and \
-                       "kernel and modules" not in kernels[-1]["description"].lower():
-                        logger.debug(f"Removing {kernels[-1]['name']} due to non-kernel description: {kernels[-1]['description']}")
-                        kernels.pop() # Remove o último adicionado se a descrição não bate
-                        current_pkg_info = None # Garante que não adicionemos mais descrições a ele
-                    else:
-                        current_pkg_info = None
-            
-            self.available_kernels = kernels # Atualiza o atributo da classe se necessário
-            logger.info(f"Found {len(kernels)} official kernels available for install: {[k['name'] for k in kernels]}")
-            return kernels
-            
+            # Lê os bancos sync diretamente (sem "pacman -Ss"), fora do loop de eventos
+            catalog = await asyncio.get_running_loop().run_in_executor(None, get_sync_database().kernels)
         except Exception as e:
             logger.exception(f"Exception getting available official kernels: {str(e)}")
             return []
+        
+        kernels = []
+        for kernel, headers in catalog:
+            kernels.append({
+                "name": kernel.name,
+                "version": kernel.version,
+                "description": kernel.description,
+                "full_name": f"{kernel.repo}/{kernel.name}",
+                "repo": kernel.repo,
+                "source": "official",
+                "headers": headers.name if headers else None,
+                "series": kernel_series(kernel.name)
+            })
+        
+        self.available_kernels = kernels # Atualiza o atributo da classe se necessário
+        logger.info(f"Found {len(kernels)} official kernels available for install: {[k['name'] for k in kernels]}")
+        return kernels
     
     async def get_aur_kernels(self) -> List[Dict[str, str]]:
-        """Get available kernels from AUR."""
-        aur_kernels = []
+        """Get available kernels from the local AUR snapshot."""
+        # A busca no AUR roda em segundo plano (aur_kernels); aqui só lemos o snapshot local
         try:
-            aur_helpers = ["yay", "paru"]
-            aur_helper = None
-            for helper in aur_helpers:
-                try:
-                    process_check = await asyncio.create_subprocess_exec(
-                        "which", helper,
-                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                    )
-                    await process_check.wait()
-                    if process_check.returncode == 0:
-                        aur_helper = helper
-                        break
-                except FileNotFoundError:
-                    logger.debug(f"AUR helper {helper} not found (FileNotFound).")
-                except Exception as e_which:
-                    logger.debug(f"Error checking for AUR helper {helper}: {e_which}")
-
-            if not aur_helper:
+            if not aur_kernels.find_helper():
                 logger.warning("No AUR helper (yay/paru) found or they are not executable.")
                 return []
-            
-            logger.info(f"Using AUR helper: {aur_helper} to search for AUR kernels")
-            # Voltar para uma busca mais abrangente para encontrar todos os kernels
-            # Combinar uma busca ampla com filtros inteligentes
-            
-            # Primeira abordagem: busca ampla para encontrar a maioria dos kernels
-            process = await asyncio.create_subprocess_exec(
-                aur_helper, "-Ss", "linux",
-                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0 and not stdout:
-                logger.warning(f"AUR kernel search failed: {stderr.decode().strip()}")
-                return []
-            
-            output = stdout.decode().strip()
-            if not output:
-                logger.warning("Empty output from AUR search")
-                return []
-            
-            aur_pattern = re.compile(
-                r"^aur/([a-zA-Z0-9._-]+) +([0-9][^\s]+)"
-            )
-            
-            aur_kernels = []
-            current_pkg_info = None
-            
-            for line in output.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                match = aur_pattern.match(line)
-                if match:
-                    pkg_name, version = match.groups()
-                    
-                    # Filtros básicos mas não tão restritivos:
-                    # 1. Deve começar com "linux"
-                    # 2. Não deve ser apenas headers, firmware, etc.
-                    if not pkg_name.startswith("linux"):
-                        continue
-                        
-                    # Excluir pacotes que claramente não são kernels
-                    if any(x in pkg_name for x in [
-                        "-firmware", "-api-headers", "/firmware", 
-                        "-docs", "-manual", "-source", "-headers-"
-                    ]):
-                        continue
-                    
-                    # Se é um pacote de headers, deve também existir o kernel correspondente
-                    if "-headers" in pkg_name:
-                        # Verificamos depois se existe o kernel correspondente
-                        base_kernel_name = pkg_name.replace("-headers", "")
-                        if not any(k["name"] == base_kernel_name for k in aur_kernels):
-                            # Se não encontrou o kernel base, pular
-                            continue
-                    
-                    current_pkg_info = {
-                        "name": pkg_name,
-                        "version": version,
-                        "description": "",
-                        "full_name": f"aur/{pkg_name}",
-                        "repo": "aur",
-                        "source": "aur"
-                    }
-                    # Verificar se já existe
-                    if not any(k["name"] == pkg_name for k in aur_kernels):
-                        aur_kernels.append(current_pkg_info)
-                    else:
-                        current_pkg_info = None
-                elif current_pkg_info and (line.startswith("    ") or line.startswith("\t")):
-                    # Capturar a descrição, mas não filtrar com base nela para ser mais inclusivo
-                    current_pkg_info["description"] = line.strip()
-                    current_pkg_info = None
-            
-            # Filtro final para garantir que são kernels reais
-            # Este é um compromisso entre inclusividade e precisão
-            real_aur_kernels = []
-            for k in aur_kernels:
-                # Se for um nome de kernel conhecido sem headers/etc., adicionar
-                if k["name"] == "linux" or any(k["name"].endswith(suffix) for suffix in [
-                    "-lts", "-zen", "-hardened", "-rt", "-xanmod", "-cachyos", "-git", "-custom",
-                    "-ck", "-rc", "-clear", "-bore", "-amd", "-intel", "-bfq"
-                ]):
-                    real_aur_kernels.append(k)
-                # Se tiver "kernel" na descrição, adicionar
-                elif "kernel" in k.get("description", "").lower():
-                    real_aur_kernels.append(k)
-                # Se não for um pacote conhecido como não-kernel, adicionar
-                elif not any(non_kernel in k["name"] for non_kernel in [
-                    "-dkms", "-driver", "-module", "-utils", "-tools", "-config", "-header"
-                ]):
-                    real_aur_kernels.append(k)
-            
-            logger.info(f"Found {len(real_aur_kernels)} AUR kernels available for install: {[k['name'] for k in real_aur_kernels]}")
-            return real_aur_kernels
+
+            aur_kernels.refresh_in_background()
+            kernels = []
+            for kernel in aur_kernels.kernels():
+                kernels.append({
+                    "name": kernel.name,
+                    "version": kernel.version,
+                    "description": kernel.description,
+                    "full_name": f"aur/{kernel.name}",
+                    "repo": "aur",
+                    "source": "aur",
+                    "votes": kernel.votes,
+                    "last_modified": kernel.last_modified
+                })
+            
+            logger.info(f"Found {len(kernels)} AUR kernels available for install: {[k['name'] for k in kernels]}")
+            return kernels
                 
         except Exception as e:
             logger.exception(f"Exception getting AUR kernels: {str(e)}")
@@ -259,36 +121,15 @@ class KernelManager:
         """Get list of installed kernel packages and their versions."""
         installed = []
         try:
-            # Usar pacman -Q para listar pacotes instalados.
-            # Filtrar por aqueles que são kernels. Uma regex pode ser útil aqui.
-            # Ex: "linux", "linux-lts", "linux-zen", "linux-customname"
+            # Pacotes instalados vêm do cache compartilhado do banco local do pacman,
+            # evitando um "pacman -Q" completo a cada chamada.
+            # Filtramos em Python apenas os que são kernels (ex: "linux", "linux-lts", "linux-zen").
             # Não queremos "linux-headers", "linux-firmware".
-            # O comando `pacman -Q | grep -E "^linux[^-]|linux-[a-z]"` é um bom começo.
-            # Ou podemos listar tudo e filtrar em Python.
-
-            process_q = await asyncio.create_subprocess_exec(
-                "pacman", "-Q",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout_q, stderr_q = await process_q.communicate()
-
-            if process_q.returncode != 0:
-                logger.error(f"Error listing all installed packages: {stderr_q.decode().strip()}")
-                return []
+            installed_packages = get_package_state().installed_packages()
 
             current_uname_r = await self.detect_current_kernel() # String como '6.1.60-1-lts'
 
-            for line in stdout_q.decode().strip().split('\n'):
-                if not line:
-                    continue
-                
-                try:
-                    name, version = line.split(' ', 1)
-                except ValueError:
-                    logger.warning(f"Could not parse installed package line: {line}")
-                    continue
-
+            for name, version in sorted(installed_packages.items()):
                 # Critérios para ser um kernel instalado:
                 # 1. Começa com "linux"
                 # 2. Não é "linux-firmware", "linux-api-headers", "linux-headers" (a menos que seja o pacote de headers do kernel principal)
@@ -376,44 +217,8 @@ class KernelManager:
             # Log data counts for debugging
             logger.info(f"Kernel data summary - Official: {len(official_kernels_avail)}, AUR: {len(aur_kernels_avail)}, Installed: {len(installed_kernel_pkgs)}")
             
-            # If we have no kernels at all, try one more time with less filtering
             if len(official_kernels_avail) == 0 and len(aur_kernels_avail) == 0:
-                logger.warning("No kernels found with standard filters, trying broader search")
-                # Try a different approach with minimal filtering
-                try:
-                    # Simpler query for kernels
-                    process = await asyncio.create_subprocess_exec(
-                        "pacman", "-Ss", "linux",
-                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                    )
-                    stdout, stderr = await process.communicate()
-                    
-                    if process.returncode == 0 and stdout:
-                        output = stdout.decode().strip()
-                        pattern = re.compile(r"^(core|extra|community)/([a-zA-Z0-9._-]+) +([0-9][^\s]+)")
-                        
-                        for line in output.split('\n'):
-                            line = line.strip()
-                            if not line:
-                                continue
-                            
-                            match = pattern.match(line)
-                            if match and "linux" in line:
-                                repo, pkg_name, version = match.groups()
-                                # Very basic filter - must start with linux and not be headers/firmware
-                                if pkg_name.startswith("linux") and not any(x in pkg_name for x in ["headers", "firmware"]):
-                                    official_kernels_avail.append({
-                                        "name": pkg_name,
-                                        "version": version,
-                                        "description": "Linux kernel package",
-                                        "full_name": f"{repo}/{pkg_name}",
-                                        "repo": repo,
-                                        "source": "official"
-                                    })
-                        
-                        logger.info(f"Fallback search found {len(official_kernels_avail)} kernel packages")
-                except Exception as e:
-                    logger.exception("Error in fallback kernel search")
+                logger.warning(f"No kernels found in the sync databases ({PACMAN_SYNC_DIR}); run a database sync first")
             
             result = {
                 "official_available": official_kernels_avail,
@@ -447,13 +252,14 @@ class KernelManager:
         """
         Get all available and installed kernels in a structured JSON format.
         Returns a dictionary with official, AUR, installed kernels, and current running.
-        Uses a time-based cache.
+        The result is persisted on disk and reused, by any process, until a sync
+        database or the local database changes.
         """
-        current_time = asyncio.get_event_loop().time()
-        if use_cache and \
-           self._kernels_json_cache is not None and \
-           (current_time - self._cache_timestamp) < self.CACHE_EXPIRY_SECONDS:
+        cache_state = self._catalog_state()
+        cached = kernel_cache.load() if use_cache else None
+        if cached is not None and cached.get("state") == cache_state:
             logger.info("Returning cached kernels JSON data.")
+            self._kernels_json_cache = cached["data"]
             # Atualizar o estado is_running no cache rapidamente sem refazer tudo
             current_uname_r = await self.detect_current_kernel()
             self._kernels_json_cache["current_running_uname"] = current_uname_r
@@ -491,10 +297,32 @@ class KernelManager:
         result = await self._generate_kernels_json()
         if "error" not in result: # Só fazer cache se não houver erro
             self._kernels_json_cache = result
-            self._cache_timestamp = current_time
+            kernel_cache.store(cache_state, result)
             logger.info("Kernel JSON data cached.")
         return result
 
+    def get_cached_kernels_json(self) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Get the persisted kernels JSON without building it, to show it at once.
+
+        Returns:
+            Tuple of (data, is_fresh): data is None when nothing is stored, and
+            is_fresh is False when it should be revalidated with get_kernels_json().
+        """
+        cached = kernel_cache.load()
+        if cached is None:
+            return None, False
+        return cached["data"], kernel_cache.is_fresh(cached, self._catalog_state())
+
+    def invalidate_kernels_cache(self) -> None:
+        """Drop the kernels JSON here and in every other process."""
+        self._kernels_json_cache = None
+        kernel_cache.invalidate()
+
+    def _catalog_state(self) -> Dict[str, Any]:
+        """Mtimes of the sync databases and of the local database, the cache key."""
+        return kernel_cache.catalog_state()
+
     async def get_all_available_kernels(self) -> Dict[str, Any]: # Mantendo a assinatura, mas mudando o retorno
         """
         DEPRECATED in favor of get_kernels_json for richer data.
@@ -556,17 +384,9 @@ class KernelManager:
             if progress_callback: progress_callback(0.2, f"Installing {kernel_name} from {kernel_source}...")
 
             install_command: List[str] = []
+            pacman_start = 0.2
             if kernel_source == "aur":
-                aur_helpers = ["yay", "paru"]
-                chosen_aur_helper = None
-                for helper_cmd in aur_helpers:
-                    try:
-                        proc_which = await asyncio.create_subprocess_exec("which", helper_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-                        await proc_which.wait()
-                        if proc_which.returncode == 0:
-                            chosen_aur_helper = helper_cmd
-                            break
-                    except Exception: pass
+                chosen_aur_helper = aur_kernels.find_helper()
                 if not chosen_aur_helper:
                     logger.error("No AUR helper found for installing AUR kernel.")
                     if progress_callback: progress_callback(1.0, "Error: No AUR helper for installation.")
@@ -574,62 +394,68 @@ class KernelManager:
                 install_command = [chosen_aur_helper, "-S", "--noconfirm", kernel_name]
             else: # official
                 packages_to_install = [kernel_name]
-                # Adicionar headers se for um kernel padrão
-                if kernel_name == "linux" or kernel_name.startswith("linux-"):
-                     # verificar se o pacote de headers existe antes de tentar instalar
-                    header_pkg_name = f"{kernel_name}-headers"
-                    check_header_proc = await asyncio.create_subprocess_exec("pacman", "-Si", header_pkg_name, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-                    await check_header_proc.wait()
-                    if check_header_proc.returncode == 0:
-                        packages_to_install.append(header_pkg_name)
-                    else:
-                        logger.info(f"Header package {header_pkg_name} not found, installing only {kernel_name}.")
+                # Adicionar os headers pareados pelos metadados do banco sync (linux-lts-headers, linux61-headers...)
+                header_pkg_name = kernel_info.get("headers")
+                if header_pkg_name:
+                    packages_to_install.append(header_pkg_name)
+                else:
+                    logger.info(f"No headers package for {kernel_name} in the sync databases, installing only {kernel_name}.")
 
                 logger.info(f"Packages for official install: {packages_to_install}")
-                install_command = ["sudo", "pacman", "-S", "--noconfirm"] + packages_to_install
-            
-            process = await asyncio.create_subprocess_exec(
-                *install_command,
-                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            
-            idx = 0
-            # Ler stdout e stderr de forma assíncrona
-            async def log_stream(stream, log_prefix, cb, initial_progress):
-                nonlocal idx
-                max_progress_during_install = 0.8 # Deixar 0.2 para depois
-                while True:
-                    line_bytes = await stream.readline()
-                    if not line_bytes:
-                        break
-                    line_str = line_bytes.decode(errors='replace').strip()
+
+                # Baixar os pacotes em paralelo, sem privilégios, antes da transação;
+                # o pacman só verifica e instala os arquivos já presentes (0.2 a 0.4)
+                def on_download(done, count, name):
+                    if progress_callback:
+                        GLib.idle_add(progress_callback, 0.2 + 0.2 * done / max(count, 1), f"Downloading packages ({done}/{count}): {name}")
+                try:
+                    prefetched = await asyncio.get_running_loop().run_in_executor(
+                        None, package_prefetch.prefetch, packages_to_install, on_download
+                    )
+                    if not prefetched.complete:
+                        logger.warning(f"Prefetch incomplete, pacman will download: {list(prefetched.failed + prefetched.unresolved)}")
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not prefetch kernel packages: {e}")
+                pacman_start = 0.4
+                install_command = ["sudo", "pacman", "-S", "--noconfirm"] + package_prefetch.cachedir_args() + packages_to_install
+            
+            # Fases do pacman (download, instalação, hooks) viram a fração entre pacman_start e 0.95;
+            # a UI é atualizada numa taxa fixa, não a cada linha
+            pacman_progress = PacmanProgress()
+            coalesced = CoalescedProgress(progress_callback) if progress_callback else None
+            if coalesced: GLib.idle_add(coalesced.start)
+
+            # Ler stdout e stderr linha a linha
+            def log_line(log_prefix, track_progress):
+                def _on_line(line_str):
+                    line_str = line_str.strip()
                     if line_str:
                         logger.info(f"{log_prefix}: {line_str}")
-                        if cb:
-                            # Progresso um pouco arbitrário
-                            current_prog = initial_progress + (idx * 0.005) # Incremento menor para mais linhas
-                            GLib.idle_add(cb, min(current_prog, max_progress_during_install), f"Installing: {line_str[:70]}...")
-                        idx += 1
-            
-            # Criar tasks para consumir stdout e stderr
-            # Precisamos do GLib para o callback de progresso
-            # Isso assume que GLib está disponível no escopo que chama progress_callback
-            # Se não, o callback precisa ser mais genérico ou tratar isso.
-            # No nosso caso, KernelView passa um callback que usa GLib.idle_add.
-            stdout_task = asyncio.create_task(log_stream(process.stdout, "stdout", progress_callback, 0.2))
-            stderr_task = asyncio.create_task(log_stream(process.stderr, "stderr", None, 0.0)) # Sem progresso para stderr
-
-            await asyncio.gather(stdout_task, stderr_task)
-            await process.wait() # Esperar o processo terminar
-            
-            if process.returncode != 0:
-                # stderr já foi logado pela task
-                logger.error(f"Error installing kernel {kernel_name}, pacman/yay exited with {process.returncode}")
-                if progress_callback: GLib.idle_add(progress_callback, 1.0, f"Error: Installation failed (code {process.returncode})")
+                        if track_progress and pacman_progress.feed(line_str) and coalesced:
+                            coalesced.update(pacman_start + pacman_progress.fraction * (0.95 - pacman_start), f"Installing: {line_str[:70]}...")
+                return _on_line
+            
+            # O runner consome stdout e stderr; sem progresso para stderr
+            try:
+                returncode = await get_command_runner().stream(
+                    install_command,
+                    on_stdout=log_line("stdout", True),
+                    on_stderr=log_line("stderr", False),
+                    env=dict(os.environ, LC_ALL="C")
+                )
+            finally:
+                if coalesced: GLib.idle_add(coalesced.stop)
+            
+            if returncode != 0:
+                # stderr já foi logado pelo callback
+                logger.error(f"Error installing kernel {kernel_name}, pacman/yay exited with {returncode}")
+                if progress_callback: GLib.idle_add(progress_callback, 1.0, f"Error: Installation failed (code {returncode})")
                 return False
                 
+            if kernel_source != "aur":
+                package_prefetch.clean() # Arquivos já instalados pelo pacman
             await self._add_kernel_to_history(kernel_name) # Adiciona ao histórico json
-            self._kernels_json_cache = None # Invalidar cache após instalação
+            self.invalidate_kernels_cache() # Invalidar cache após instalação, em todos os processos
             
             if progress_callback: GLib.idle_add(progress_callback, 1.0, f"Kernel {kernel_name} installed. Reboot required.")
             logger.info(f"Successfully installed kernel {kernel_name}. Reboot required.")
@@ -660,7 +486,7 @@ class KernelManager:
             
             if success:
                  logger.info(f"Rollback to {previous_kernel_name} initiated successfully.")
-                 self._kernels_json_cache = None # Invalidar cache
+                 self.invalidate_kernels_cache() # Invalidar cache
             else:
                  logger.error(f"Rollback to {previous_kernel_name} failed during re-installation.")
             # O install_kernel já lida com a mensagem final de progresso
@@ -678,19 +504,13 @@ class KernelManager:
             paths_to_check = ["/", "/boot"] # Verificar / e /boot
             for path_checked in paths_to_check:
                 try:
-                    process_gb = await asyncio.create_subprocess_exec(
-                        "df", "-BG", "--output=avail", path_checked,
-                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                    )
-                    stdout_gb, stderr_gb = await process_gb.communicate()
+                    process_gb = await get_command_runner().run(["df", "-BG", "--output=avail", path_checked])
+                    stdout_gb, stderr_gb = process_gb.stdout, process_gb.stderr
 
                     if process_gb.returncode != 0:
                         logger.warning(f"Could not get disk space in GB for {path_checked}: {stderr_gb.decode().strip()}. Trying fallback.")
-                        process_kb = await asyncio.create_subprocess_exec(
-                            "df", "--output=avail", path_checked,
-                            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                        )
-                        stdout_kb, stderr_kb_fallback = await process_kb.communicate()
+                        process_kb = await get_command_runner().run(["df", "--output=avail", path_checked])
+                        stdout_kb, stderr_kb_fallback = process_kb.stdout, process_kb.stderr
                         if process_kb.returncode != 0:
                             logger.error(f"Fallback disk space check failed for {path_checked}: {stderr_kb_fallback.decode().strip()}")
                             return False 
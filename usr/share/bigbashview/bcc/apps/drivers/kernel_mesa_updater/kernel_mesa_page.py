@@ -7,7 +7,6 @@ import gi
 from typing import Dict, List, Any, Optional
 import logging
 import asyncio # Import asyncio
-import threading # Import threading
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
@@ -16,6 +15,8 @@ from gi.repository import Gtk, Adw, GLib
 # Corrigir importações usando caminho relativo
 from .kernel_manager import KernelManager
 from .mesa_manager import MesaManager
+from common.command_runner import get_command_runner
+from common.pacman_progress import CoalescedProgress, PacmanProgress
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -89,16 +90,8 @@ class KernelView(Gtk.Box):
         self._run_async_task(self._populate_kernel_data_async())
 
     def _run_async_task(self, coro):
-        """Run an asyncio coroutine in a background thread."""
-        def _run_in_thread():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(coro)
-            finally:
-                loop.close()
-        
-        threading.Thread(target=_run_in_thread, daemon=True).start()
+        """Run an asyncio coroutine on the shared command runner loop."""
+        return get_command_runner().submit(coro, background=True)
 
     def _update_progress(self, fraction: float, text: str) -> None:
         """Update the UI with progress information in ToolbarView style."""
@@ -119,6 +112,14 @@ class KernelView(Gtk.Box):
 
     async def _populate_kernel_data_async(self):
         """Populate current kernel and available kernels list asynchronously."""
+        # Mostra na hora a lista salva por qualquer processo; só revalida se estiver desatualizada
+        cached_data, cache_fresh = self.kernel_manager.get_cached_kernels_json()
+        if cached_data is not None:
+            GLib.idle_add(self._show_kernels_json, cached_data)
+            if cache_fresh:
+                logger.info("Kernel list shown from the persisted cache.")
+                return
+
         GLib.idle_add(self.progress_bar.set_visible, True)
         GLib.idle_add(self.status_label.set_visible, True)
         
@@ -129,22 +130,15 @@ class KernelView(Gtk.Box):
             current_kernel_version = await self.kernel_manager.detect_current_kernel()
             GLib.idle_add(self._update_progress, 0.1, "Fetching available kernels...") # Adjusted progress
 
-            # Fix: Clear all groups properly for AdwPreferencesGroup
-            def clear_groups():
-                for group in [self.installed_group, self.official_group, self.aur_group]:
-                    # In AdwPreferencesGroup we need to remove all rows directly
-                    rows = []
-                    # First collect all rows
-                    row = group.get_first_child()
-                    while row:
-                        rows.append(row)
-                        row = row.get_next_sibling()
-                    
-                    # Then remove each row
-                    for row in rows:
-                        group.remove(row)
-                    
-            GLib.idle_add(clear_groups)
+            # Lista montada dos bancos do pacman e persistida para os outros processos
+            kernels_data = await self.kernel_manager.get_kernels_json()
+            if "error" not in kernels_data and (kernels_data.get("installed_packages") or kernels_data.get("official_available")):
+                GLib.idle_add(self._show_kernels_json, kernels_data)
+                GLib.idle_add(self._update_progress, 1.0, "Kernel list populated.")
+                return
+
+            GLib.idle_add(self._update_progress, 0.3, "Trying mhwd-kernel...")
+            GLib.idle_add(self._clear_kernel_groups)
 
             populated_successfully = False
             try:
@@ -303,12 +297,8 @@ echo "$FINAL_JSON"
                 os.chmod(script_file.name, 0o755)  # Make executable
                 
                 # Execute the script and get JSON output
-                process = await asyncio.create_subprocess_exec(
-                    script_file.name,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
+                process = await get_command_runner().run([script_file.name], dedupe=False)
+                stdout, stderr = process.stdout, process.stderr
                 
                 # Remove temp script
                 os.unlink(script_file.name)
@@ -373,40 +363,42 @@ echo "$FINAL_JSON"
 
 
             if not populated_successfully:
-                # Fall back to pacman/AUR approach
-                try:
-                    # ...existing fallback code...
-                    kernels_data = await self.kernel_manager.get_all_available_kernels()
-                    if not kernels_data:
-                        GLib.idle_add(self._update_progress, 1.0, "No available kernels found or error fetching.")
-                        GLib.idle_add(self._add_error_row, "No kernels found or error.")
-                        GLib.idle_add(self._set_buttons_sensitive, True)
-                        return
-
-                    installed_kernels = kernels_data.get("installed_packages", [])
-                    official_kernels = kernels_data.get("official_available", [])
-                    aur_kernels = kernels_data.get("aur_available", [])
-
-                    # Add kernels to appropriate groups
-                    for kernel in installed_kernels:
-                        GLib.idle_add(self._add_kernel_to_group, kernel, self.installed_group, True)
-                    
-                    for kernel in official_kernels:
-                        if not kernel.get("is_installed", False):
-                            GLib.idle_add(self._add_kernel_to_group, kernel, self.official_group, False)
-                            
-                    for kernel in aur_kernels:
-                        if not kernel.get("is_installed", False):
-                            GLib.idle_add(self._add_kernel_to_group, kernel, self.aur_group, False)
-                    
-                    GLib.idle_add(self._update_progress, 1.0, "Kernel list populated (fallback).")
-                except Exception as e_fallback:
-                    logger.exception(f"Error with fallback kernel detection: {str(e_fallback)}")
-                    GLib.idle_add(self._update_progress, 1.0, f"Error loading kernels: {str(e_fallback)}")
-                    GLib.idle_add(self._add_error_row, "Error loading kernels.")
+                GLib.idle_add(self._update_progress, 1.0, "No available kernels found or error fetching.")
+                GLib.idle_add(self._add_error_row, "Error loading kernels.")
         finally:
             GLib.idle_add(self.progress_bar.set_visible, False)
 
+    def _clear_kernel_groups(self):
+        """Remove all kernel rows from the preference groups."""
+        for group in [self.installed_group, self.official_group, self.aur_group]:
+            # In AdwPreferencesGroup we need to remove all rows directly
+            rows = []
+            # First collect all rows
+            row = group.get_first_child()
+            while row:
+                rows.append(row)
+                row = row.get_next_sibling()
+            
+            # Then remove each row
+            for row in rows:
+                group.remove(row)
+
+    def _show_kernels_json(self, kernels_data):
+        """Fill the groups from the KernelManager kernels JSON."""
+        self._clear_kernel_groups()
+        for kernel in kernels_data.get("installed_packages", []):
+            self._add_kernel_to_group(kernel, self.installed_group, True)
+        
+        for kernel in kernels_data.get("official_available", []):
+            if not kernel.get("is_installed", False):
+                self._add_kernel_to_group(kernel, self.official_group, False)
+        
+        aur_kernels = [k for k in kernels_data.get("aur_available", []) if not k.get("is_installed", False)]
+        for kernel in aur_kernels:
+            self._add_kernel_to_group(kernel, self.aur_group, False)
+        self.aur_group.set_visible(bool(aur_kernels))
+        return False
+
     def _add_kernel_to_group(self, kernel_data, group, is_installed=False):
         """Add a kernel to a PreferencesGroup using Adw.ActionRow."""
         try:
@@ -511,40 +503,34 @@ echo "$FINAL_JSON"
 
         try:
             # Use mhwd-kernel to install the kernel
-            process = await asyncio.create_subprocess_exec(
-                "pkexec", "mhwd-kernel", "-i", kernel_name,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
             # Monitor the installation progress
-            current_progress = 0.1
-            GLib.idle_add(self._update_progress, current_progress, f"Installing {kernel_name}...")
+            GLib.idle_add(self._update_progress, 0.1, f"Installing {kernel_name}...")
+            
+            # mhwd-kernel runs pacman; its phases give the fraction, redrawn at a fixed rate
+            pacman_progress = PacmanProgress()
+            coalesced = CoalescedProgress(self._update_progress)
+            GLib.idle_add(coalesced.start)
+            
+            def on_output(line_text):
+                if pacman_progress.feed(line_text):
+                    coalesced.update(0.1 + pacman_progress.fraction * 0.85, pacman_progress.message)
             
             # Read output line by line for progress updates
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                    
-                line_text = line.decode().strip()
-                if line_text:
-                    # Update progress based on installation steps
-                    if "Downloading" in line_text:
-                        current_progress = 0.3
-                    elif "Installing" in line_text:
-                        current_progress = 0.6
-                    elif "Configuring" in line_text:
-                        current_progress = 0.8
-                    GLib.idle_add(self._update_progress, current_progress, line_text)
-            await process.wait()
-            success = process.returncode == 0
+            error_lines = []
+            try:
+                returncode = await get_command_runner().stream(
+                    ["pkexec", "env", "LC_ALL=C", "mhwd-kernel", "-i", kernel_name],
+                    on_stdout=on_output,
+                    on_stderr=error_lines.append
+                )
+            finally:
+                GLib.idle_add(coalesced.stop)
+            success = returncode == 0
             
             if success:
                 final_message = f"Kernel {kernel_name} installation succeeded. Please reboot to use the new kernel."
             else:
-                stderr_output = await process.stderr.read()
-                error_msg = stderr_output.decode().strip()
+                error_msg = "\n".join(error_lines).strip()
                 final_message = f"Kernel {kernel_name} installation failed: {error_msg}"
                 
         except Exception as e:
@@ -686,16 +672,8 @@ class MesaView(Gtk.Box):
         self._run_async_task(self._detect_mesa_version_async())
 
     def _run_async_task(self, coro):
-        """Run an asyncio coroutine in a background thread."""
-        def _run_in_thread():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(coro)
-            finally:
-                loop.close()
-        
-        threading.Thread(target=_run_in_thread, daemon=True).start()
+        """Run an asyncio coroutine on the shared command runner loop."""
+        return get_command_runner().submit(coro, background=True)
 
     def _update_progress(self, fraction: float, text: str) -> None:
         """Update the Mesa UI with progress information."""
@@ -4,13 +4,14 @@ Mesa Manager
 This module provides functionality for managing Mesa driver installations and updates.
 """
 import subprocess
-import asyncio
 import os
 import json
 import logging
 import re
 from typing import Dict, List, Any, Optional, Tuple, Callable
 
+from common.command_runner import get_command_runner
+
 # Set up logger
 logger = logging.getLogger(__name__)
 
@@ -37,12 +38,8 @@ class MesaManager:
         """Detect the currently installed Mesa version."""
         try:
             # Using glxinfo to get Mesa version
-            process = await asyncio.create_subprocess_exec(
-                "glxinfo", "-B",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+            process = await get_command_runner().run(["glxinfo", "-B"])
+            stdout, stderr = process.stdout, process.stderr
             
             if process.returncode != 0:
                 logger.error(f"Error detecting Mesa: {stderr.decode().strip()}")
@@ -68,22 +65,16 @@ class MesaManager:
     async def _check_disk_space(self, required_gb: float = 0.5) -> bool: # 500MB
         """Check if there's enough disk space for Mesa installation."""
         try:
-            process_gb = await asyncio.create_subprocess_exec(
-                "df", "-BG", "--output=avail", "/", # Só verificamos / para Mesa
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout_gb, stderr_gb = await process_gb.communicate()
+            process_gb = await get_command_runner().run([
+                "df", "-BG", "--output=avail", "/" # Só verificamos / para Mesa
+            ])
+            stdout_gb, stderr_gb = process_gb.stdout, process_gb.stderr
 
             if process_gb.returncode != 0:
                 logger.error(f"Error checking disk space (Mesa): {stderr_gb.decode().strip()}")
                 # Fallback se df -BG falhar (raro, mas possível)
-                process_kb = await asyncio.create_subprocess_exec(
-                    "df", "--output=avail", "/",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout_kb, stderr_kb_fallback = await process_kb.communicate()
+                process_kb = await get_command_runner().run(["df", "--output=avail", "/"])
+                stdout_kb, stderr_kb_fallback = process_kb.stdout, process_kb.stderr
                 if process_kb.returncode != 0:
                     logger.error(f"Fallback disk space check failed: {stderr_kb_fallback.decode().strip()}")
                     return False # Falha segura
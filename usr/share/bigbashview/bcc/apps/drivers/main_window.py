@@ -21,11 +21,16 @@ from driver_installer.driver_lister import (
     CATEGORY_LABELS,
     is_package_installed
 )
+from driver_installer import scan_cache
+from driver_installer.driver_record import DriverRecord, DriverStore
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Scan cache entry used by this window
+SCAN_CACHE_NAME = "driver-manager"
+
 class DriverInstallationRow(Adw.ActionRow):
     """A row displaying a driver with install/remove options."""
     
@@ -117,6 +122,9 @@ class DriverInstallationRow(Adw.ActionRow):
         """Update UI after installation/removal completes."""
         self.driver_info["installed"] = installed
         
+        # Cached scan no longer reflects the installed packages
+        scan_cache.invalidate(SCAN_CACHE_NAME)
+        
         if installed:
             self.action_button.set_label("Remove")
             self.action_button.remove_css_class("suggested-action")
@@ -288,25 +296,49 @@ class DriverManagerWindow(Adw.ApplicationWindow):
         threading.Thread(target=self._fetch_drivers, daemon=True).start()
     
     def _fetch_drivers(self):
-        """Fetch drivers in a background thread."""
+        """Fetch drivers in a background thread.
+        
+        A cached scan matching the hardware fingerprint is shown first and
+        then revalidated with a fresh listing.
+        """
         try:
-            self.all_drivers = list_all_drivers()
+            fingerprint = scan_cache.compute_fingerprint()
+            cached = scan_cache.load(SCAN_CACHE_NAME, fingerprint)
+            if cached is not None:
+                GLib.idle_add(self._set_drivers, *self._group_drivers(
+                    [DriverRecord.from_dict(driver) for driver in cached["drivers"]]
+                ))
             
-            # Group drivers by category
-            self.drivers_by_category = {"all": self.all_drivers}
+            drivers = list_all_drivers()
+            payload = [driver.to_dict() for driver in drivers]
+            scan_cache.store(SCAN_CACHE_NAME, fingerprint, {"drivers": payload})
             
-            for driver in self.all_drivers:
-                category = driver.get("category", "unknown")
-                if category not in self.drivers_by_category:
-                    self.drivers_by_category[category] = []
-                self.drivers_by_category[category].append(driver)
+            if cached is not None and cached["drivers"] == payload:
+                return
             
             # Update UI in main thread
-            GLib.idle_add(self._update_ui_after_loading)
+            GLib.idle_add(self._set_drivers, *self._group_drivers(drivers))
         except Exception as e:
             logger.error(f"Error loading drivers: {e}")
             GLib.idle_add(self._show_error, str(e))
     
+    def _group_drivers(self, drivers):
+        """Group a driver list by category; safe to call from a worker thread."""
+        store = DriverStore(drivers)
+        all_drivers = store.records()
+        
+        # Categories are views over the store, not copies of the records
+        drivers_by_category = {"all": all_drivers}
+        drivers_by_category.update(store.items())
+        return all_drivers, drivers_by_category
+    
+    def _set_drivers(self, all_drivers, drivers_by_category):
+        """Replace the driver lists and repaint; runs on the main loop."""
+        self.all_drivers = all_drivers
+        self.drivers_by_category = drivers_by_category
+        self._update_ui_after_loading()
+        return False
+    
     def _update_ui_after_loading(self):
         """Update UI after drivers are loaded."""
         # Update category count badges
@@ -314,10 +346,15 @@ class DriverManagerWindow(Adw.ApplicationWindow):
             category_id = getattr(row, "category_id", None)
             if category_id and category_id in self.drivers_by_category:
                 count = len(self.drivers_by_category[category_id])
-                badge = Gtk.Label(label=str(count))
-                badge.add_css_class("badge")
-                badge.add_css_class("numeric")
-                row.add_suffix(badge)
+                # Reuse the badge when repainting after a cached load
+                badge = getattr(row, "count_badge", None)
+                if badge is None:
+                    badge = Gtk.Label()
+                    badge.add_css_class("badge")
+                    badge.add_css_class("numeric")
+                    row.add_suffix(badge)
+                    row.count_badge = badge
+                badge.set_label(str(count))
         
         # Select the first row (All Drivers)
         self.category_list.select_row(self.category_list.get_row_at_index(0))